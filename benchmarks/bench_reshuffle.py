@@ -0,0 +1,87 @@
+"""
+盤面再配置（reshuffle）のベンチマーク
+
+盤面サイズごとに多数のシードで合法手のない盤面を再配置し、
+中央値・p99・最悪時間を表示する。最悪時間が1フレームの予算を超えたサイズがあれば
+警告を表示して終了コード 1 で終わる。
+
+    uv run python benchmarks/bench_reshuffle.py [--seeds 500]
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from board_engine import BLOCK_TYPES, Board  # noqa: E402
+
+# 1フレーム（60 FPS）の予算
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def dead_board(size: int, rng: random.Random) -> Board:
+    """4色を斜めにずらして並べた、マッチも合法手もない盤面を作成（色の割り当てはシードごとに変える）"""
+    board = Board(size)
+    board.initialize_grid()
+    palette = rng.sample(BLOCK_TYPES, 4)
+    for row, line in enumerate(board.grid):
+        for col, block in enumerate(line):
+            block.type = palette[(col - row) % 4]
+    board.mark_all_dirty()
+    if board.find_matches() or board.has_moves():
+        raise RuntimeError(f"not a dead board: size={size}")
+    return board
+
+
+def bench(size: int, seeds: int) -> list[float]:
+    """各シードで再配置にかかった時間（ミリ秒）のリストを返す"""
+    timings = []
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        board = dead_board(size, rng)
+        # 盤面の準備で出たゴミの回収を計測に含めない
+        gc.collect()
+
+        start = time.perf_counter()
+        ok = board.reshuffle(rng)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        if not ok or board.find_matches() or not board.has_moves():
+            raise RuntimeError(f"reshuffle failed: size={size} seed={seed}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=500, help="盤面サイズごとのシード数")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'median':>9} {'p99':>9} {'worst':>9}  (ms, budget {FRAME_BUDGET_MS:.1f})")
+    over_budget = []
+    for size in args.sizes:
+        timings = sorted(bench(size, args.seeds))
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        worst = timings[-1]
+        mark = "  OVER BUDGET" if worst > FRAME_BUDGET_MS else ""
+        print(
+            f"{size:>3}x{size:<3}{statistics.median(timings):>8.2f} {p99:>9.2f} {worst:>9.2f}{mark}"
+        )
+        if mark:
+            over_budget.append(size)
+
+    if over_budget:
+        sizes = ", ".join(f"{size}x{size}" for size in over_budget)
+        print(f"WARNING: worst case exceeds the {FRAME_BUDGET_MS:.1f} ms frame budget: {sizes}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+描画なしの高速シミュレーション
+
+Match3Game を描画せずに固定タイムステップで自動プレイさせ、
+実時間の何倍で進んだかとスコアを表示する。
+スコアは一時ディレクトリのハイスコアファイルに保存し、本来の記録には触れない。
+
+    uv run python benchmarks/bench_simulation.py [--seconds 60] [--runs 5] [--trace out.json]
+
+--trace を指定すると、処理区間を Chrome のトレースイベント形式で書き出す
+（chrome://tracing や Perfetto で開ける）。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ウィンドウを開かずに pygame を初期化する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from highscore_manager import HighScoreManager  # noqa: E402
+from match3_game import Match3Game  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60, help="1回あたりのゲーム内時間")
+    parser.add_argument("--runs", type=int, default=5, help="実行回数（シード 0..runs-1）")
+    parser.add_argument("--trace", type=Path, help="トレースファイルの出力先")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.TemporaryDirectory()
+    game = Match3Game(highscore_manager=HighScoreManager(Path(temp_dir.name) / "highscores.json"))
+    if args.trace:
+        game.start_trace(args.trace)
+
+    print(f"{'seed':>4} {'score':>7} {'steps':>7} {'wall':>8} {'speed':>8}")
+    for seed in range(args.runs):
+        # 時間切れでゲームオーバーにならないように、制限時間を実行時間より長くする
+        game.reset_game(int(args.seconds) + 1, seed=seed)
+        start = time.perf_counter()
+        steps = game.simulate(args.seconds, autoplay=True, seed=seed)
+        wall = time.perf_counter() - start
+        speed = args.seconds / wall
+        print(f"{seed:>4} {game.score:>7} {steps:>7} {wall:>7.2f}s {speed:>7.0f}x")
+
+    if args.trace:
+        game.stop_trace()
+        print(f"trace: {args.trace} ({game.tracer.events} events)")
+    temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
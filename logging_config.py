@@ -1,13 +1,544 @@
 """
 Amazon Q Match3 ログ設定
+
+既定ではログ呼び出しはキューに積むだけで、書式化と書き込みは
+バックグラウンドのリスナースレッドがまとめて行う（ゲームのフレームにディスク I/O を持ち込まない）。
 """
 
+import atexit
+import contextlib
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
+import threading
+import time
+import weakref
+from enum import Enum
 from pathlib import Path
 
+# キューに溜められるレコード数の上限
+DEFAULT_QUEUE_SIZE = 10000
+
+# ハンドラーの出力をディスク・コンソールに反映する間隔（秒）
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+# リスナーが一度に取り出して書き込むレコード数の上限
+DEFAULT_BATCH_SIZE = 512
+
+# ログファイルを切り替えるサイズ（バイト）
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# ログファイルを切り替えるまでの最長時間（秒）
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+# 現在のファイルと切り替え済みファイルの合計サイズの上限（バイト）
+DEFAULT_RETENTION_BYTES = 50 * 1024 * 1024
+
+# ログファイルの書き込みバッファのサイズ（バイト）
+DEFAULT_WRITE_BUFFER = 1024 * 1024
+
+# 毎フレームのログをメッセージごとに1秒あたりに出力する件数の上限
+DEFAULT_RATE_LIMIT = 1
+
+# 稼働中のリスナー（setup_logging を呼び直したときに停止する）
+_listener = None
+
+# 同期方式でルートロガーに付けたハンドラー（setup_logging を呼び直したときに閉じる）
+_sync_handlers = []
+
+# 作成済みの件数制限付きロガー（終了時に抑制件数を書き出す）
+_rate_limited_loggers = weakref.WeakSet()
+
+
+class OverflowPolicy(Enum):
+    """キューが一杯のときの扱い"""
+
+    DROP_NEW = "drop_new"  # 新しいレコードを捨てる（ゲームスレッドは待たない）
+    DROP_OLDEST = "drop_oldest"  # 最も古いレコードを捨てて新しいレコードを入れる
+    BLOCK = "block"  # 空きができるまで待つ（レコードは失われない）
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """上限付きキューにレコードを積むハンドラー（書式化はリスナー側で行う）"""
+
+    def __init__(self, log_queue, overflow: OverflowPolicy = OverflowPolicy.DROP_NEW):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        """書式化せずにそのまま積む（メッセージの組み立てはリスナースレッドで行う）"""
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow is OverflowPolicy.BLOCK:
+            self.queue.put(record)
+            return
+
+        if self.overflow is OverflowPolicy.DROP_OLDEST:
+            with contextlib.suppress(queue.Empty):
+                self.queue.get_nowait()
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        self.dropped += 1
+
+
+class DeferredFlushMixin:
+    """レコードごとに flush せず、リスナーがバッチの区切りでまとめて flush する"""
+
+    def flush(self):
+        """emit のたびの flush は行わない（flush_batch でまとめて行う）"""
+
+    def flush_batch(self):
+        """バッファに溜めた出力を反映"""
+        super().flush()
+
+
+class BatchStreamHandler(DeferredFlushMixin, logging.StreamHandler):
+    """flush をまとめて行うコンソール用ハンドラー"""
 
-def setup_logging(level=logging.INFO, log_to_file=True, log_to_console=True):
+
+class BatchFileHandler(DeferredFlushMixin, logging.FileHandler):
+    """flush をまとめて行うファイル用ハンドラー"""
+
+
+class ArchiveCompressor:
+    """切り替え済みのログファイルを gzip 圧縮し、保持容量を超えた古いファイルを消すスレッド"""
+
+    _SENTINEL = object()
+
+    def __init__(self, base_filename, retention_bytes=DEFAULT_RETENTION_BYTES, compress=True):
+        """
+        Args:
+            base_filename: 現在のログファイルのパス（切り替え済みファイルは base_filename.* ）
+            retention_bytes: 現在のファイルと切り替え済みファイルの合計サイズの上限
+            compress: 切り替え済みファイルを gzip 圧縮するか
+        """
+        self.base = Path(base_filename)
+        self.retention_bytes = retention_bytes
+        self.compress = compress
+        self.queue = queue.Queue()
+        self._thread = None
+
+        # 統計
+        self.compressed = 0
+        self.deleted = 0
+
+    def submit(self, path):
+        """切り替え済みのファイルを圧縮待ちに追加"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="LogCompressor", daemon=True)
+            self._thread.start()
+        self.queue.put(Path(path))
+
+    def stop(self, timeout: float | None = 30.0):
+        """待っているファイルを処理してから停止"""
+        if self._thread is None:
+            return
+        self.queue.put(self._SENTINEL)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def archives(self) -> list[Path]:
+        """切り替え済みファイルを古い順に返す"""
+        files = [path for path in self.base.parent.glob(self.base.name + ".*") if path.is_file()]
+        return sorted(files, key=lambda path: (path.stat().st_mtime, path.name))
+
+    def _run(self):
+        while True:
+            path = self.queue.get()
+            if path is self._SENTINEL:
+                return
+            try:
+                if self.compress and path.suffix != ".gz" and path.exists():
+                    self._compress(path)
+                self.enforce_retention()
+            except OSError as e:
+                sys.stderr.write(f"Log archive error for {path}: {e}\n")
+
+    def _compress(self, path):
+        target = path.with_name(path.name + ".gz")
+        with open(path, "rb") as source, gzip.open(target, "wb") as archive:
+            shutil.copyfileobj(source, archive, DEFAULT_WRITE_BUFFER)
+        # 圧縮後も元の時刻で並ぶようにする
+        stat = path.stat()
+        os.utime(target, (stat.st_atime, stat.st_mtime))
+        path.unlink()
+        self.compressed += 1
+
+    def enforce_retention(self):
+        """合計サイズが上限を超えている間、古い切り替え済みファイルから削除"""
+        if not self.retention_bytes:
+            return
+        archives = self.archives()
+        total = sum(path.stat().st_size for path in archives)
+        if self.base.exists():
+            total += self.base.stat().st_size
+        for path in archives:
+            if total <= self.retention_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink()
+            self.deleted += 1
+
+
+class RotatingCompressedFileHandler(DeferredFlushMixin, logging.handlers.BaseRotatingHandler):
+    """
+    サイズと経過時間でファイルを切り替えるログファイル用ハンドラー
+
+    リスナースレッドから使うときは flush をバッチの区切りでまとめて行う
+    （batch_flush=False ならレコードごとに flush する）。
+    切り替えたファイルは base.YYYYmmdd-HHMMSS に改名し、圧縮と古いファイルの削除は
+    ArchiveCompressor のスレッドで行う。
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_age=DEFAULT_MAX_AGE,
+        retention_bytes=DEFAULT_RETENTION_BYTES,
+        buffer_size=DEFAULT_WRITE_BUFFER,
+        compress=True,
+        encoding="utf-8",
+        clock=time.time,
+        batch_flush=True,
+    ):
+        """
+        Args:
+            filename: ログファイルのパス
+            max_bytes: 書き込んだバイト数がこのサイズを超えたら切り替える（0 なら無効）
+            max_age: ファイルを開いてからこの秒数が経ったら切り替える（0 なら無効）
+            retention_bytes: 現在のファイルと切り替え済みファイルの合計サイズの上限（0 なら無制限）
+            buffer_size: 書き込みバッファのサイズ
+            compress: 切り替え済みファイルを gzip 圧縮するか
+            encoding: ファイルのエンコーディング
+            clock: 秒単位の現在時刻を返す関数
+            batch_flush: flush を flush_batch でまとめて行うか（False ならレコードごと）
+        """
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.buffer_size = buffer_size
+        self.clock = clock
+        self.batch_flush = batch_flush
+        super().__init__(filename, "a", encoding=encoding)
+        self.compressor = ArchiveCompressor(self.baseFilename, retention_bytes, compress)
+        self.rollovers = 0
+
+        path = Path(self.baseFilename)
+        self._bytes = path.stat().st_size if path.exists() else 0
+        self._opened_at = clock()
+
+        # 前回の実行で圧縮されずに残った切り替え済みファイルを処理
+        for archive in self.compressor.archives():
+            if archive.suffix != ".gz":
+                self.compressor.submit(archive)
+
+    def _open(self):
+        """大きな書き込みバッファでファイルを開く"""
+        return open(
+            self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding
+        )
+
+    def shouldRollover(self, record):  # noqa: N802
+        if self._bytes == 0:
+            return False
+        if self.max_bytes and self._bytes >= self.max_bytes:
+            return True
+        return bool(self.max_age) and self.clock() - self._opened_at >= self.max_age
+
+    def doRollover(self):  # noqa: N802
+        """現在のファイルを改名して新しいファイルを開き、改名したファイルを圧縮待ちにする"""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        now = self.clock()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        target = Path(f"{self.baseFilename}.{stamp}")
+        suffix = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = Path(f"{self.baseFilename}.{stamp}-{suffix}")
+            suffix += 1
+        os.replace(self.baseFilename, target)
+
+        self.stream = self._open()
+        self._bytes = 0
+        self._opened_at = now
+        self.rollovers += 1
+        self.compressor.submit(target)
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self._bytes += len(msg.encode(self.encoding or "utf-8"))
+            if not self.batch_flush:
+                self.flush_batch()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        """ファイルを閉じ、圧縮待ちのファイルを処理し終えるまで待つ"""
+        super().close()
+        self.compressor.stop()
+
+
+class BatchingQueueListener:
+    """キューからレコードをまとめて取り出し、ハンドラーに書き込むバックグラウンドスレッド"""
+
+    _SENTINEL = object()
+
+    def __init__(
+        self,
+        log_queue,
+        handlers,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_handler: BoundedQueueHandler | None = None,
+    ):
+        """
+        Args:
+            log_queue: レコードを受け取るキュー
+            handlers: 実際に書き込むハンドラー
+            flush_interval: ハンドラーを flush する間隔（秒）
+            batch_size: 一度に取り出すレコード数の上限
+            queue_handler: 捨てたレコード数を報告するためのキューハンドラー
+        """
+        self.queue = log_queue
+        self.handlers = list(handlers)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue_handler = queue_handler
+        self._thread = None
+        self._reported_dropped = 0
+
+        # 統計
+        self.records = 0
+        self.batches = 0
+        self.flushes = 0
+
+    def start(self):
+        """リスナースレッドを開始"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="LogListener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0):
+        """残っているレコードを書き込んでから停止"""
+        if self._thread is None:
+            return
+        self.queue.put(self._SENTINEL)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        last_flush = time.monotonic()
+        unflushed = False
+
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+                batch = [first]
+            except queue.Empty:
+                batch = []
+
+            # 溜まっている分をまとめて取り出す
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._SENTINEL in batch
+            if stopping:
+                batch = [record for record in batch if record is not self._SENTINEL]
+
+            if batch:
+                for record in batch:
+                    self._handle(record)
+                self.records += len(batch)
+                self.batches += 1
+                unflushed = True
+            self._report_dropped()
+
+            now = time.monotonic()
+            idle = not batch
+            if stopping or (unflushed and (idle or now - last_flush >= self.flush_interval)):
+                self._flush()
+                last_flush = now
+                unflushed = False
+            if stopping:
+                return
+
+    def _handle(self, record):
+        """ハンドラーごとのレベルを確認して書き込む"""
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _report_dropped(self):
+        """キューがあふれて捨てたレコード数を警告として書き込む"""
+        if self.queue_handler is None:
+            return
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_dropped:
+            record = logging.LogRecord(
+                "logging_config",
+                logging.WARNING,
+                __file__,
+                0,
+                f"Log queue full: dropped {dropped - self._reported_dropped} records",
+                None,
+                None,
+            )
+            self._reported_dropped = dropped
+            self._handle(record)
+
+    def _flush(self):
+        for handler in self.handlers:
+            getattr(handler, "flush_batch", handler.flush)()
+        self.flushes += 1
+
+
+class _CallSiteState:
+    """呼び出し箇所（メッセージテンプレート）ごとの件数制限の状態"""
+
+    __slots__ = ("level", "calls", "window_start", "emitted", "suppressed")
+
+    def __init__(self, level, now):
+        self.level = level
+        self.calls = 0
+        self.window_start = now
+        self.emitted = 0
+        self.suppressed = 0
+
+
+class RateLimitedLogger:
+    """
+    毎フレーム呼ばれるログ用に、呼び出し箇所ごとに出力件数を制限するロガー
+
+    メッセージはテンプレート（%s 形式）と引数で渡す。テンプレートを呼び出し箇所のキーとして、
+    sample_every 回に1回だけ候補にし、さらに1秒あたり per_second 件までに制限する。
+    出力しなかった件数は、次に出力するレコードの末尾か flush() で書き出す。
+    レベルが無効なときや出力しないときは書式化を行わない。
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        per_second: int = DEFAULT_RATE_LIMIT,
+        sample_every: int = 1,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            logger: 出力先のロガー
+            per_second: メッセージごとに1秒あたりに出力する件数の上限
+            sample_every: 何回に1回を出力候補にするか（1 なら毎回）
+            clock: 秒単位の単調増加時刻を返す関数
+        """
+        self.logger = logger
+        self.per_second = per_second
+        self.sample_every = max(1, sample_every)
+        self.clock = clock
+        self._states = {}
+
+        # 統計
+        self.emitted = 0
+        self.suppressed = 0
+
+    def debug(self, msg, *args):
+        self._log(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self._log(logging.INFO, msg, args)
+
+    def warning(self, msg, *args):
+        self._log(logging.WARNING, msg, args)
+
+    def log(self, level, msg, *args):
+        self._log(level, msg, args)
+
+    def _log(self, level, msg, args):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        state = self._states.get(msg)
+        if state is None:
+            state = self._states[msg] = _CallSiteState(level, self.clock())
+        state.calls += 1
+
+        # サンプリング（sample_every 回に1回だけ候補にする）
+        if (state.calls - 1) % self.sample_every:
+            state.suppressed += 1
+            self.suppressed += 1
+            return
+
+        # 1秒ごとの窓で件数を制限
+        now = self.clock()
+        if now - state.window_start >= 1.0:
+            state.window_start = now
+            state.emitted = 0
+        if state.emitted >= self.per_second:
+            state.suppressed += 1
+            self.suppressed += 1
+            return
+        state.emitted += 1
+        self.emitted += 1
+
+        if state.suppressed:
+            msg = f"{msg} (%d similar records suppressed)"
+            args = (*args, state.suppressed)
+            state.suppressed = 0
+        # stacklevel で呼び出し元の行をレコードに残す
+        self.logger.log(level, msg, *args, stacklevel=3)
+
+    def flush(self):
+        """抑制したまま出力していない件数をメッセージごとに書き出す"""
+        for msg, state in self._states.items():
+            if state.suppressed:
+                self.logger.log(state.level, "Suppressed %d records: %s", state.suppressed, msg)
+                state.suppressed = 0
+
+
+def get_rate_limited_logger(name="Match3Game", per_second=DEFAULT_RATE_LIMIT, sample_every=1):
+    """毎フレームのログ用に件数を制限したロガーを取得"""
+    limited = RateLimitedLogger(logging.getLogger(name), per_second, sample_every)
+    _rate_limited_loggers.add(limited)
+    return limited
+
+
+def setup_logging(
+    level=logging.INFO,
+    log_to_file=True,
+    log_to_console=True,
+    use_queue=True,
+    queue_size=DEFAULT_QUEUE_SIZE,
+    flush_interval=DEFAULT_FLUSH_INTERVAL,
+    overflow=OverflowPolicy.DROP_NEW,
+    log_file=None,
+    max_bytes=DEFAULT_MAX_BYTES,
+    max_age=DEFAULT_MAX_AGE,
+    retention_bytes=DEFAULT_RETENTION_BYTES,
+):
     """
     ログシステムを設定
 
@@ -15,7 +546,16 @@ def setup_logging(level=logging.INFO, log_to_file=True, log_to_console=True):
         level: ログレベル (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_to_file: ファイルにログを出力するか
         log_to_console: コンソールにログを出力するか
+        use_queue: キューとバックグラウンドスレッドで書き込むか（False なら呼び出し元で同期書き込み）
+        queue_size: キューに溜められるレコード数の上限
+        flush_interval: ハンドラーを flush する間隔（秒）
+        overflow: キューが一杯のときの扱い（OverflowPolicy）
+        log_file: ログファイルのパス（省略時はこのファイルと同じディレクトリの amazon_q_match3.log）
+        max_bytes: ログファイルを切り替えるサイズ（バイト）
+        max_age: ログファイルを切り替えるまでの最長時間（秒）
+        retention_bytes: 切り替え済みファイルを含めた合計サイズの上限
     """
+    global _listener
 
     # ログフォーマット
     formatter = logging.Formatter(
@@ -26,7 +566,8 @@ def setup_logging(level=logging.INFO, log_to_file=True, log_to_console=True):
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
-    # 既存のハンドラーをクリア
+    # 既存のハンドラーとリスナーを片付ける
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
@@ -34,19 +575,37 @@ def setup_logging(level=logging.INFO, log_to_file=True, log_to_console=True):
 
     # ファイルハンドラー
     if log_to_file:
-        log_file = Path(__file__).parent / "amazon_q_match3.log"
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        if log_file is None:
+            log_file = Path(__file__).parent / "amazon_q_match3.log"
+        # 切り替えはファイルに書き込むスレッドで、圧縮は圧縮スレッドで行う
+        # （同期方式ではリスナーがいないのでレコードごとに flush する）
+        file_handler = RotatingCompressedFileHandler(
+            log_file, max_bytes, max_age, retention_bytes, batch_flush=use_queue
+        )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(level)
         handlers.append(file_handler)
 
     # コンソールハンドラー
     if log_to_console:
-        console_handler = logging.StreamHandler(sys.stdout)
+        handler_class = BatchStreamHandler if use_queue else logging.StreamHandler
+        console_handler = handler_class(sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(level)
         handlers.append(console_handler)
 
+    if use_queue and handlers:
+        # ゲームスレッドはキューに積むだけにして、書き込みはリスナースレッドで行う
+        log_queue = queue.Queue(maxsize=queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, overflow)
+        _listener = BatchingQueueListener(
+            log_queue, handlers, flush_interval, queue_handler=queue_handler
+        )
+        _listener.start()
+        handlers = [queue_handler]
+    else:
+        _sync_handlers.extend(handlers)
+
     # ハンドラーを追加
     for handler in handlers:
         root_logger.addHandler(handler)
@@ -54,11 +613,52 @@ def setup_logging(level=logging.INFO, log_to_file=True, log_to_console=True):
     return root_logger
 
 
+def shutdown_logging():
+    """リスナースレッドを停止し、残っているレコードを書き込んでハンドラーを閉じる"""
+    global _listener
+
+    # 抑制したままの件数をリスナーが止まる前に書き出す
+    for limited in list(_rate_limited_loggers):
+        limited.flush()
+
+    # 同期方式のハンドラーを外して閉じる（圧縮待ちのファイルも処理される）
+    root_logger = logging.getLogger()
+    while _sync_handlers:
+        handler = _sync_handlers.pop()
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def get_logging_stats() -> dict:
+    """キュー方式のログの統計（キュー方式でなければ空）"""
+    if _listener is None:
+        return {}
+    queue_handler = _listener.queue_handler
+    return {
+        "records": _listener.records,
+        "batches": _listener.batches,
+        "flushes": _listener.flushes,
+        "queued": _listener.queue.qsize(),
+        "dropped": queue_handler.dropped if queue_handler is not None else 0,
+    }
+
+
 def get_game_logger(name="Match3Game"):
     """ゲーム用ロガーを取得"""
     return logging.getLogger(name)
 
 
+# 終了時にキューに残っているログを書き込む
+atexit.register(shutdown_logging)
+
+
 # デフォルト設定
 if __name__ == "__main__":
     # テスト用
@@ -0,0 +1,86 @@
+"""
+Amazon Q Match3 配列グリッド
+
+盤面を int8 のタイプコード配列（空セルは -1）で表現し、
+マッチ検出を配列のシフトと比較でベクトル化する。
+末尾2軸を (row, col) として扱うため、複数盤面をまとめた3次元配列にも使える。
+落下（列の詰め直し）も同様に全列をまとめて処理する。
+"""
+
+import numpy as np
+from board_engine import BLOCK_TYPES
+
+# 空セルを表すコード
+EMPTY = -1
+
+
+def grid_to_array(grid) -> np.ndarray:
+    """ブロックのグリッド（list of list）を int8 のタイプコード配列に変換"""
+    return np.array(
+        [[EMPTY if block is None else block.type.value for block in line] for line in grid],
+        dtype=np.int8,
+    )
+
+
+def array_to_types(codes: np.ndarray) -> list[list]:
+    """タイプコード配列を BlockType（空セルは None）のグリッドに変換"""
+    return [
+        [None if code == EMPTY else BLOCK_TYPES[code] for code in line] for line in codes.tolist()
+    ]
+
+
+def match_mask(codes: np.ndarray) -> np.ndarray:
+    """横・縦に3つ以上並んだセルを True とするマスクを返す"""
+    mask = np.zeros(codes.shape, dtype=bool)
+
+    # 横方向: 連続する3セルが同じタイプなら3セルすべてをマーク
+    left, mid, right = codes[..., :, :-2], codes[..., :, 1:-1], codes[..., :, 2:]
+    run = (left == mid) & (mid == right) & (left != EMPTY)
+    mask[..., :, :-2] |= run
+    mask[..., :, 1:-1] |= run
+    mask[..., :, 2:] |= run
+
+    # 縦方向
+    top, mid, bottom = codes[..., :-2, :], codes[..., 1:-1, :], codes[..., 2:, :]
+    run = (top == mid) & (mid == bottom) & (top != EMPTY)
+    mask[..., :-2, :] |= run
+    mask[..., 1:-1, :] |= run
+    mask[..., 2:, :] |= run
+
+    return mask
+
+
+def _column_order(codes: np.ndarray) -> np.ndarray:
+    """列ごとに、空セルを先頭・ブロックを末尾に並べ替える行インデックスを返す"""
+    size = codes.shape[-2]
+    # 行番号を加えた一意なキーでソートする
+    # （キーが重複しないので安定ソートを使わなくても元の順序が保たれる）
+    rows = np.arange(size, dtype=np.int16)[:, None]
+    key = (codes != EMPTY).astype(np.int16) * size + rows
+    return np.argsort(key, axis=-2)
+
+
+def compact_columns(codes: np.ndarray) -> np.ndarray:
+    """各列の空でないセルを順序を保ったまま下に詰める（列ごとの安定な分割）"""
+    return np.take_along_axis(codes, _column_order(codes), axis=-2)
+
+
+def gravity(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    全列をまとめて下に詰め、セルごとの落下距離を返す
+
+    Returns:
+        tuple: (詰めた後のタイプコード配列, 詰めた後の各セルのブロックが落ちた行数)
+            落下距離は空セルと移動しなかったブロックでは 0。
+            描画側は target_y - 落下距離 * CELL_SIZE から FALL アニメーションを始められる。
+    """
+    order = _column_order(codes)
+    compacted = np.take_along_axis(codes, order, axis=-2)
+    rows = np.arange(codes.shape[-2], dtype=order.dtype)[:, None]
+    fall = np.where(compacted != EMPTY, rows - order, 0).astype(np.int16)
+    return compacted, fall
+
+
+def find_matches(codes: np.ndarray) -> set[tuple[int, int]]:
+    """Board.find_matches と同じ (row, col) の集合を返す（2次元配列用）"""
+    return {(row, col) for row, col in np.argwhere(match_mask(codes)).tolist()}
@@ -0,0 +1,75 @@
+"""
+Amazon Q Match3 バッチ連鎖シミュレータ
+
+N枚の盤面を (N, size, size) の int8 配列（array_grid と同じタイプコード、空セルは -1）として
+まとめて受け取り、マッチ検出・削除・列の詰め直し・補充をベクトル演算で一括処理する。
+難易度調整のために大量の盤面を評価する用途向け。
+"""
+
+import numpy as np
+from array_grid import EMPTY, compact_columns, match_mask
+from board_engine import BLOCK_TYPES, GRID_SIZE, MAX_CASCADE_ITERATIONS
+
+
+def score_for_counts(counts: np.ndarray) -> np.ndarray:
+    """盤面ごとのマッチ数からスコアを計算（board_engine.calculate_score のベクトル版）"""
+    scores = 100 * counts
+    scores = np.where(counts == 3, 100, scores)
+    scores = np.where(counts == 4, 200, scores)
+    return np.where(counts == 5, 500, scores)
+
+
+def random_boards(count: int, size: int = GRID_SIZE, seed=None) -> np.ndarray:
+    """一様ランダムな盤面を count 枚生成"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, len(BLOCK_TYPES), size=(count, size, size), dtype=np.int8)
+
+
+def simulate_cascades(
+    boards: np.ndarray, seed=None, max_iterations: int = MAX_CASCADE_ITERATIONS
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    複数の盤面の連鎖をまとめて解決
+
+    Args:
+        boards: (N, size, size) の int8 タイプコード配列（変更しない）
+        seed: 補充に使う乱数のシード（同じシードなら同じ結果になる）
+        max_iterations: 盤面ごとの最大連鎖数
+
+    Returns:
+        tuple: (盤面ごとのスコア, 盤面ごとの連鎖の深さ, 最終盤面)
+    """
+    rng = np.random.default_rng(seed)
+    boards = np.array(boards, dtype=np.int8, copy=True)
+    count = boards.shape[0]
+    scores = np.zeros(count, dtype=np.int64)
+    depths = np.zeros(count, dtype=np.int32)
+
+    # まだ連鎖が続いている盤面のインデックス
+    active = np.arange(count)
+
+    for _ in range(max_iterations):
+        current = boards[active]
+        mask = match_mask(current)
+        counts = mask.sum(axis=(1, 2))
+        has_match = counts > 0
+        if not has_match.any():
+            break
+
+        # マッチのない盤面は以降の処理から外す
+        active = active[has_match]
+        current = current[has_match]
+        mask = mask[has_match]
+        counts = counts[has_match]
+
+        scores[active] += score_for_counts(counts)
+        depths[active] += 1
+
+        # 削除 → 列の詰め直し → 補充
+        current[mask] = EMPTY
+        current = compact_columns(current)
+        empty = current == EMPTY
+        current[empty] = rng.integers(0, len(BLOCK_TYPES), size=int(empty.sum()), dtype=np.int8)
+        boards[active] = current
+
+    return scores, depths, boards
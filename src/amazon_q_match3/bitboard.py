@@ -0,0 +1,288 @@
+"""
+Amazon Q Match3 ビットボードエンジン
+
+色ごとに1つの整数マスクで盤面を表現する（セル (row, col) はビット row * size + col）。
+GRID_SIZE = 8 なら各色が64ビットに収まり、マッチ検出・削除・落下・合法手生成を
+シフトとANDの組み合わせで行える。ソルバーやボットなど1手あたりのコストが
+効く用途向けで、board_engine.create_board(backend="bitboard") で選択する。
+
+ブロックオブジェクトを持たないので Board と完全に置き換えられるわけではない。
+block_factory は受け取らず、drop_blocks は移動の有無（bool）、fill_empty_spaces は
+補充した数（int）を返す（Board はそれぞれ移動・補充したセルのリストを返す）。
+"""
+
+import logging
+
+from block_stream import BlockStream
+from board_engine import BLOCK_TYPES, GRID_SIZE, MAX_CASCADE_ITERATIONS, calculate_score
+
+
+def _iter_bits(bits: int):
+    """立っているビットのインデックスを下位から順に返す"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitBoard:
+    """色ごとのビットマスクで表現した盤面"""
+
+    def __init__(self, size: int = GRID_SIZE, seed=None):
+        self.logger = logging.getLogger("BitBoardEngine")
+        self.size = size
+        self.score = 0
+        self.rng = BlockStream(BLOCK_TYPES, seed)
+        self.seed = self.rng.seed
+        self.masks = [0] * len(BLOCK_TYPES)
+
+        self.full_mask = (1 << (size * size)) - 1
+        # 横3連の開始位置になれる列（0..size-3）のマスク
+        run_start = (1 << max(size - 2, 0)) - 1
+        self.h_start_mask = sum(run_start << (row * size) for row in range(size))
+        # 左右の隣接交換で左側になれる列（0..size-2）のマスク
+        pair_start = (1 << max(size - 1, 0)) - 1
+        self.h_pair_mask = sum(pair_start << (row * size) for row in range(size))
+        # 左に1つ / 2つ以上 / 左右に1つずつ隣接セルがある列のマスク
+        self.col_ge1_mask = self.h_pair_mask << 1
+        self.col_ge2_mask = self.h_start_mask << 2
+        self.col_mid_mask = self.h_start_mask << 1
+
+    # --- 変換 ---
+
+    @classmethod
+    def from_grid(cls, grid):
+        """ブロックのグリッド（.type を持つオブジェクトまたは None）から作成"""
+        board = cls(len(grid))
+        for row, line in enumerate(grid):
+            for col, block in enumerate(line):
+                if block is not None:
+                    board.masks[block.type.value] |= 1 << (row * board.size + col)
+        return board
+
+    def get_type(self, row: int, col: int):
+        """セルの BlockType（空セルは None）を取得"""
+        bit = 1 << (row * self.size + col)
+        for code, mask in enumerate(self.masks):
+            if mask & bit:
+                return BLOCK_TYPES[code]
+        return None
+
+    def set_type(self, row: int, col: int, block_type):
+        """セルの BlockType を設定（None で空セル）"""
+        bit = 1 << (row * self.size + col)
+        self.masks = [mask & ~bit for mask in self.masks]
+        if block_type is not None:
+            self.masks[block_type.value] |= bit
+
+    def to_types(self) -> list[list]:
+        """BlockType（空セルは None）のグリッドに変換"""
+        return [[self.get_type(row, col) for col in range(self.size)] for row in range(self.size)]
+
+    @property
+    def occupied(self) -> int:
+        """ブロックが存在するセルのマスク"""
+        occupied = 0
+        for mask in self.masks:
+            occupied |= mask
+        return occupied
+
+    # --- マッチ検出 ---
+
+    def _color_match_bits(self, mask: int) -> int:
+        """1色のマスクから3つ以上並んだセルのマスクを返す"""
+        size = self.size
+        # 横方向（行をまたがないように開始列を制限）
+        h = mask & (mask >> 1) & (mask >> 2) & self.h_start_mask
+        # 縦方向（盤面外は0がシフトインするので制限不要）
+        v = mask & (mask >> size) & (mask >> (2 * size))
+        return h | (h << 1) | (h << 2) | v | (v << size) | (v << (2 * size))
+
+    def match_bits(self) -> int:
+        """全色のマッチしたセルのマスク"""
+        matched = 0
+        for mask in self.masks:
+            if mask:
+                matched |= self._color_match_bits(mask)
+        return matched
+
+    def find_matches(self) -> set[tuple[int, int]]:
+        """Board.find_matches と同じ (row, col) の集合を返す"""
+        return {divmod(index, self.size) for index in _iter_bits(self.match_bits())}
+
+    # ビットボードは毎回全体を走査しても十分に速いので同じ実装を使う
+    find_matches_incremental = find_matches
+
+    # --- 盤面操作 ---
+
+    def swap_blocks(self, pos1, pos2) -> bool:
+        """2つのセルを交換（どちらかが空なら何もしない）"""
+        bit1 = 1 << (pos1[0] * self.size + pos1[1])
+        bit2 = 1 << (pos2[0] * self.size + pos2[1])
+        occupied = self.occupied
+        if not (occupied & bit1 and occupied & bit2):
+            return False
+
+        both = bit1 | bit2
+        masks = self.masks
+        for code, mask in enumerate(masks):
+            # 片方だけに立っている色は両ビットを反転すれば交換になる
+            if mask & both and (mask & both) != both:
+                masks[code] = mask ^ both
+        return True
+
+    def remove_bits(self, bits: int) -> int:
+        """マスクで指定したセルを削除し、削除したセル数を返す"""
+        removed = 0
+        keep = ~bits
+        for code, mask in enumerate(self.masks):
+            removed += (mask & bits).bit_count()
+            self.masks[code] = mask & keep
+        return removed
+
+    def remove_matches(self, matches) -> int:
+        """マッチしたセルを削除してスコアを加算し、獲得スコアを返す"""
+        if not matches:
+            return 0
+        bits = 0
+        for row, col in matches:
+            bits |= 1 << (row * self.size + col)
+        self.remove_bits(bits)
+        score_gained = calculate_score(len(matches))
+        self.score += score_gained
+        return score_gained
+
+    def drop_blocks(self) -> bool:
+        """
+        ブロックを落下させ、移動があったかを返す（Board.drop_blocks と異なり移動のリストは返さない）
+
+        下のセルが空いているブロックを全列同時に1段ずつ下げ、動かなくなるまで繰り返す。
+        """
+        size = self.size
+        full = self.full_mask
+        moved = False
+
+        while True:
+            occupied = self.occupied
+            empty = ~occupied & full
+            # 真下（+size ビット）が空いているブロック
+            falling = occupied & (empty >> size)
+            if not falling:
+                return moved
+            moved = True
+            keep = ~falling
+            self.masks = [(mask & keep) | ((mask & falling) << size) for mask in self.masks]
+
+    def fill_empty_spaces(self) -> int:
+        """空いたセルにランダムなブロックを生成し、生成した数を返す（Board は位置のリストを返す）"""
+        empty = ~self.occupied & self.full_mask
+        count = empty.bit_count()
+        masks = self.masks
+        for index, block_type in zip(_iter_bits(empty), self.rng.take(count), strict=True):
+            masks[block_type.value] |= 1 << index
+        return count
+
+    def initialize_grid(self):
+        """盤面をマッチのない状態で初期化"""
+        self.masks = [0] * len(BLOCK_TYPES)
+        size = self.size
+        for row in range(size):
+            for col in range(size):
+                valid_types = list(BLOCK_TYPES)
+                if col >= 2:
+                    left = self.get_type(row, col - 1)
+                    if left is not None and left == self.get_type(row, col - 2):
+                        valid_types.remove(left)
+                if row >= 2:
+                    up = self.get_type(row - 1, col)
+                    if up is not None and up == self.get_type(row - 2, col) and up in valid_types:
+                        valid_types.remove(up)
+                self.masks[self.rng.choice(valid_types).value] |= 1 << (row * size + col)
+
+    def resolve_cascades(self, max_iterations: int = MAX_CASCADE_ITERATIONS) -> tuple[int, int]:
+        """
+        マッチがなくなるまで 削除→落下→補充 を繰り返す
+
+        Returns:
+            tuple: (獲得スコア, 連鎖の深さ)
+        """
+        total_score = 0
+        depth = 0
+
+        while True:
+            matched = self.match_bits()
+            if not matched:
+                break
+
+            # 無限ループ防止
+            if depth >= max_iterations:
+                self.logger.warning(f"Cascade resolution stopped after {depth} iterations")
+                break
+
+            depth += 1
+            score_gained = calculate_score(self.remove_bits(matched))
+            self.score += score_gained
+            total_score += score_gained
+            self.drop_blocks()
+            self.fill_empty_spaces()
+
+        return total_score, depth
+
+    # --- 合法手 ---
+
+    def legal_move_bits(self) -> tuple[int, int]:
+        """
+        マッチが発生する隣接交換をマスクで返す
+
+        各色について「そのセルに隣から同色が移動してくると3連になる」セルを
+        シフトとANDで求める（移動元のセル自身は並びに含めない）。
+
+        Returns:
+            tuple: (右隣と交換できる左側セルのマスク, 下隣と交換できる上側セルのマスク)
+        """
+        size = self.size
+        full = self.full_mask
+        occupied = self.occupied
+        horizontal = 0
+        vertical = 0
+
+        for mask in self.masks:
+            if not mask:
+                continue
+            # セル p を基準にした同色の並び
+            left2 = (mask << 1) & (mask << 2) & self.col_ge2_mask
+            right2 = (mask >> 1) & (mask >> 2) & self.h_start_mask
+            h_mid = (mask << 1) & (mask >> 1) & self.col_mid_mask
+            up2 = (mask << size) & (mask << (2 * size)) & full
+            down2 = (mask >> size) & (mask >> (2 * size))
+            v_mid = (mask << size) & (mask >> size) & full
+
+            # 移動先は別の色のブロックがあるセルに限る
+            target = occupied & ~mask
+            from_right = (left2 | up2 | down2 | v_mid) & (mask >> 1) & self.h_pair_mask
+            from_left = (right2 | up2 | down2 | v_mid) & (mask << 1) & self.col_ge1_mask
+            from_below = (left2 | right2 | h_mid | up2) & (mask >> size)
+            from_above = (left2 | right2 | h_mid | down2) & (mask << size) & full
+
+            horizontal |= (from_right & target) | ((from_left & target) >> 1)
+            vertical |= (from_below & target) | ((from_above & target) >> size)
+
+        return horizontal, vertical
+
+    def legal_moves(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """マッチが発生する隣接交換 ((row1, col1), (row2, col2)) のリスト"""
+        size = self.size
+        horizontal, vertical = self.legal_move_bits()
+        moves = []
+        for index in _iter_bits(horizontal):
+            row, col = divmod(index, size)
+            moves.append(((row, col), (row, col + 1)))
+        for index in _iter_bits(vertical):
+            row, col = divmod(index, size)
+            moves.append(((row, col), (row + 1, col)))
+        return moves
+
+    def has_moves(self) -> bool:
+        """合法手が1つ以上あるか"""
+        horizontal, vertical = self.legal_move_bits()
+        return bool(horizontal | vertical)
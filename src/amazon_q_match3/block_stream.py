@@ -0,0 +1,68 @@
+"""
+Amazon Q Match3 ブロック乱数ストリーム
+
+盤面ごとに持つシード付きの乱数生成器。
+ブロックタイプはチャンク単位でまとめて生成してバッファに溜めておき、
+補充1回分をリストのスライス1つで取り出せるようにする。
+同じシードからは同じブロック列が得られるため、ゲームをシードから再現できる。
+"""
+
+import random
+
+# 1回の補充でまとめて生成するブロック数
+DEFAULT_CHUNK_SIZE = 256
+
+
+class BlockStream:
+    """ブロックタイプを一括生成するシード付き乱数ストリーム"""
+
+    def __init__(self, types, seed=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            types: 生成するブロックタイプの並び（BLOCK_TYPES など）
+            seed: 乱数シード（省略時はグローバルな random から派生するので random.seed で再現できる）
+            chunk_size: 1回の補充で生成するブロック数
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.types = tuple(types)
+        self.chunk_size = chunk_size
+        self._random = random.Random(seed)
+        self._buffer = []
+        self._pos = 0
+
+        # reshuffle などスカラー値が必要な処理向け（random モジュールと同じインターフェース）
+        self.random = self._random.random
+        self.randrange = self._random.randrange
+
+    def _refill(self, count: int):
+        """未使用分を残したまま、count 個以上取り出せるようにチャンク単位で補充"""
+        chunks = -(-(count - (len(self._buffer) - self._pos)) // self.chunk_size)
+        self._buffer = self._buffer[self._pos :] + self._random.choices(
+            self.types, k=chunks * self.chunk_size
+        )
+        self._pos = 0
+
+    def take(self, count: int) -> list:
+        """ブロックタイプを count 個まとめて取り出す"""
+        if self._pos + count > len(self._buffer):
+            self._refill(count)
+        start = self._pos
+        self._pos = start + count
+        return self._buffer[start : self._pos]
+
+    def next(self):
+        """ブロックタイプを1つ取り出す"""
+        if self._pos >= len(self._buffer):
+            self._refill(1)
+        block_type = self._buffer[self._pos]
+        self._pos += 1
+        return block_type
+
+    def choice(self, options):
+        """options の中から一様に1つ選ぶ（ストリームから options 外のタイプを読み飛ばす）"""
+        while True:
+            block_type = self.next()
+            if block_type in options:
+                return block_type
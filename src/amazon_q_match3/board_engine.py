@@ -0,0 +1,529 @@
+"""
+Amazon Q Match3 盤面エンジン
+
+pygameに依存しないヘッドレスな盤面ロジック。
+グリッド管理・マッチ検出・削除・落下・補充・連鎖処理・スコア計算を提供し、
+Match3Gameはこのエンジンを描画用にラップする。
+"""
+
+import logging
+from enum import Enum
+
+from block_stream import BlockStream
+from reshuffle import plan_reshuffle
+
+# 定数
+GRID_SIZE = 8
+MAX_CASCADE_ITERATIONS = 10
+MIN_MATCH_LENGTH = 3
+
+
+class BlockType(Enum):
+    RED = 0
+    BLUE = 1
+    GREEN = 2
+    YELLOW = 3
+    PURPLE = 4
+    ORANGE = 5
+
+
+# 毎回 list(BlockType) を作らないようにキャッシュ
+BLOCK_TYPES = tuple(BlockType)
+
+
+class Tile:
+    """ヘッドレス用の軽量ブロック（描画情報を持たない）"""
+
+    __slots__ = ("type", "grid_x", "grid_y")
+
+    def __init__(self, block_type, x, y):
+        self.type = block_type
+        self.grid_x = x
+        self.grid_y = y
+
+
+def calculate_score(match_count: int) -> int:
+    """マッチしたブロック数からスコアを計算"""
+    if match_count == 3:
+        return 100
+    if match_count == 4:
+        return 200
+    if match_count == 5:
+        return 500
+    return 100 * match_count
+
+
+class Board:
+    """ヘッドレスな盤面（pygame非依存）"""
+
+    def __init__(self, size: int = GRID_SIZE, block_factory=Tile, seed=None):
+        """
+        Args:
+            size: グリッドの一辺のセル数
+            block_factory: block_factory(block_type, x, y) でブロックを生成する呼び出し可能オブジェクト
+            seed: 盤面の乱数シード（同じシードと同じ操作列なら同じ盤面になる）
+        """
+        self.logger = logging.getLogger("BoardEngine")
+        self.size = size
+        self.block_factory = block_factory
+        self.score = 0
+
+        # 盤面専用の乱数ストリーム（初期配置・補充・再配置に使う）
+        self.rng = BlockStream(BLOCK_TYPES, seed)
+        self.seed = self.rng.seed
+
+        # 変更のあった行・列（インクリメンタルなマッチ検出用）
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+        self.dirty_all = True
+        self._grid = [[None for _ in range(size)] for _ in range(size)]
+
+        # 合法手インデックス（マッチが発生する隣接交換の集合）
+        self._legal_moves = set()
+        self._move_dirty_cells = set()
+        self._move_index_stale = True
+
+    @property
+    def grid(self):
+        """ブロックのグリッド（grid[row][col]）"""
+        return self._grid
+
+    @grid.setter
+    def grid(self, value):
+        # グリッドごと差し替えられた場合は次回の検出で全体を走査する
+        self._grid = value
+        self.mark_all_dirty()
+
+    def mark_dirty(self, row: int, col: int):
+        """セルの変更を記録（その行と列を再走査対象にする）"""
+        self.dirty_rows.add(row)
+        self.dirty_cols.add(col)
+        self._move_dirty_cells.add((row, col))
+
+    def mark_all_dirty(self):
+        """盤面全体を再走査対象にする"""
+        self.dirty_all = True
+        self._move_index_stale = True
+
+    def initialize_grid(self, rng=None):
+        """グリッドを初期化（マッチしないように配置）"""
+        rng = rng or self.rng
+        size = self.size
+        grid = self.grid
+        for row in range(size):
+            for col in range(size):
+                # 初期配置でマッチしないようにブロックタイプを選択
+                valid_types = list(BLOCK_TYPES)
+
+                # 左に2つ同じ色がある場合は除外
+                if col >= 2:
+                    left1, left2 = grid[row][col - 1], grid[row][col - 2]
+                    if left1 and left2 and left1.type == left2.type:
+                        valid_types.remove(left1.type)
+
+                # 上に2つ同じ色がある場合は除外
+                if row >= 2:
+                    up1, up2 = grid[row - 1][col], grid[row - 2][col]
+                    if up1 and up2 and up1.type == up2.type and up1.type in valid_types:
+                        valid_types.remove(up1.type)
+
+                grid[row][col] = self.block_factory(rng.choice(valid_types), col, row)
+
+        self.mark_all_dirty()
+        self.refresh_move_index()
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        """座標が盤面内かチェック"""
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def swap_blocks(self, pos1, pos2) -> bool:
+        """2つのブロックを交換（どちらかが空なら何もしない）"""
+        row1, col1 = pos1
+        row2, col2 = pos2
+        grid = self.grid
+
+        block1 = grid[row1][col1]
+        block2 = grid[row2][col2]
+        if not block1 or not block2:
+            return False
+
+        grid[row1][col1], grid[row2][col2] = block2, block1
+        block1.grid_x, block1.grid_y = col2, row2
+        block2.grid_x, block2.grid_y = col1, row1
+        self.mark_dirty(row1, col1)
+        self.mark_dirty(row2, col2)
+        self.refresh_move_index()
+        return True
+
+    def _scan_row(self, row: int, matches: set) -> bool:
+        """1行を走査してマッチを matches に追加し、マッチがあったかを返す"""
+        line = self._grid[row]
+        size = self.size
+        found = False
+        start = 0
+        while start < size:
+            block = line[start]
+            end = start + 1
+            if block is not None:
+                block_type = block.type
+                while end < size and line[end] is not None and line[end].type == block_type:
+                    end += 1
+                if end - start >= MIN_MATCH_LENGTH:
+                    matches.update((row, c) for c in range(start, end))
+                    found = True
+            start = end
+        return found
+
+    def _scan_col(self, col: int, matches: set) -> bool:
+        """1列を走査してマッチを matches に追加し、マッチがあったかを返す"""
+        grid = self._grid
+        size = self.size
+        found = False
+        start = 0
+        while start < size:
+            block = grid[start][col]
+            end = start + 1
+            if block is not None:
+                block_type = block.type
+                while (
+                    end < size and grid[end][col] is not None and grid[end][col].type == block_type
+                ):
+                    end += 1
+                if end - start >= MIN_MATCH_LENGTH:
+                    matches.update((r, col) for r in range(start, end))
+                    found = True
+            start = end
+        return found
+
+    def find_matches(self) -> set[tuple[int, int]]:
+        """横・縦に3つ以上並んだブロックの位置 (row, col) を検出（全体走査）"""
+        matches = set()
+        for row in range(self.size):
+            self._scan_row(row, matches)
+        for col in range(self.size):
+            self._scan_col(col, matches)
+        return matches
+
+    def find_matches_incremental(self) -> set[tuple[int, int]]:
+        """
+        変更のあった行・列だけを走査してマッチを検出
+
+        マッチが見つからなかった行・列は記録から外し、マッチが残っている行・列は
+        削除されるまで記録したままにする。盤面の変更がすべて Board 経由で
+        行われていれば find_matches と同じ結果になる。
+        """
+        if self.dirty_all:
+            rows = range(self.size)
+            cols = range(self.size)
+            self.dirty_all = False
+        else:
+            rows = self.dirty_rows
+            cols = self.dirty_cols
+
+        matches = set()
+        self.dirty_rows = {row for row in rows if self._scan_row(row, matches)}
+        self.dirty_cols = {col for col in cols if self._scan_col(col, matches)}
+        return matches
+
+    def score_matches(self, matches) -> int:
+        """マッチのスコアを加算し、獲得スコアを返す"""
+        score_gained = calculate_score(len(matches))
+        self.score += score_gained
+        return score_gained
+
+    def clear_cells(self, positions) -> list[tuple[int, int, object]]:
+        """指定位置のブロックを削除し、削除した (row, col, block) のリストを返す"""
+        removed = []
+        grid = self.grid
+        for row, col in positions:
+            if self.in_bounds(row, col) and grid[row][col] is not None:
+                removed.append((row, col, grid[row][col]))
+                grid[row][col] = None
+                self.mark_dirty(row, col)
+        return removed
+
+    def remove_matches(self, matches) -> int:
+        """マッチしたブロックを削除してスコアを加算し、獲得スコアを返す"""
+        if not matches:
+            return 0
+        score_gained = self.score_matches(matches)
+        self.clear_cells(matches)
+        return score_gained
+
+    def drop_blocks(self) -> list[tuple[object, int, int, int]]:
+        """
+        ブロックを落下させる
+
+        Returns:
+            list: 移動したブロックの (block, from_row, to_row, col) のリスト
+        """
+        moves = []
+        grid = self.grid
+        size = self.size
+
+        for col in range(size):
+            # 下から上に向かってチェック
+            write_pos = size - 1
+            for read_pos in range(size - 1, -1, -1):
+                block = grid[read_pos][col]
+                if block is not None:
+                    if write_pos != read_pos:
+                        grid[write_pos][col] = block
+                        grid[read_pos][col] = None
+                        block.grid_y = write_pos
+                        moves.append((block, read_pos, write_pos, col))
+                        self.mark_dirty(read_pos, col)
+                        self.mark_dirty(write_pos, col)
+                    write_pos -= 1
+
+        self.refresh_move_index()
+        return moves
+
+    def fill_empty_spaces(self, block_factory=None) -> list[tuple[int, int]]:
+        """
+        空いたスペースに新しいブロックを生成
+
+        Args:
+            block_factory: このフィルだけで使うファクトリ（省略時は盤面のファクトリ）
+
+        Returns:
+            list: 補充した位置 (row, col) のリスト
+        """
+        factory = block_factory or self.block_factory
+        grid = self.grid
+        size = self.size
+
+        filled = [
+            (row, col) for col in range(size) for row in range(size) if grid[row][col] is None
+        ]
+        # 補充分のブロックタイプをストリームからまとめて取り出す
+        for (row, col), block_type in zip(filled, self.rng.take(len(filled)), strict=True):
+            grid[row][col] = factory(block_type, col, row)
+            self.mark_dirty(row, col)
+
+        self.refresh_move_index()
+        return filled
+
+    # --- 合法手インデックス ---
+
+    def _has_run_at(self, row: int, col: int) -> bool:
+        """セル (row, col) を含む3つ以上の並びがあるか"""
+        grid = self._grid
+        block = grid[row][col]
+        if block is None:
+            return False
+        block_type = block.type
+        size = self.size
+
+        # 横方向
+        left = col
+        while (
+            left > 0 and grid[row][left - 1] is not None and grid[row][left - 1].type == block_type
+        ):
+            left -= 1
+        right = col
+        while (
+            right < size - 1
+            and grid[row][right + 1] is not None
+            and grid[row][right + 1].type == block_type
+        ):
+            right += 1
+        if right - left + 1 >= MIN_MATCH_LENGTH:
+            return True
+
+        # 縦方向
+        top = row
+        while top > 0 and grid[top - 1][col] is not None and grid[top - 1][col].type == block_type:
+            top -= 1
+        bottom = row
+        while (
+            bottom < size - 1
+            and grid[bottom + 1][col] is not None
+            and grid[bottom + 1][col].type == block_type
+        ):
+            bottom += 1
+        return bottom - top + 1 >= MIN_MATCH_LENGTH
+
+    def _swap_makes_match(self, pos1, pos2) -> bool:
+        """2つのセルを交換するとマッチが発生するか（盤面は変更しない）"""
+        row1, col1 = pos1
+        row2, col2 = pos2
+        grid = self._grid
+        block1 = grid[row1][col1]
+        block2 = grid[row2][col2]
+        if block1 is None or block2 is None or block1.type == block2.type:
+            return False
+
+        # 参照だけを一時的に入れ替えて交換後の並びを調べる
+        grid[row1][col1], grid[row2][col2] = block2, block1
+        try:
+            return self._has_run_at(row1, col1) or self._has_run_at(row2, col2)
+        finally:
+            grid[row1][col1], grid[row2][col2] = block1, block2
+
+    def _update_move(self, pos1, pos2):
+        """1つの隣接交換について合法手インデックスを更新"""
+        if self._swap_makes_match(pos1, pos2):
+            self._legal_moves.add((pos1, pos2))
+        else:
+            self._legal_moves.discard((pos1, pos2))
+
+    def rebuild_move_index(self):
+        """合法手インデックスを盤面全体から作り直す"""
+        size = self.size
+        self._legal_moves = set()
+        for row in range(size):
+            for col in range(size):
+                if col + 1 < size:
+                    self._update_move((row, col), (row, col + 1))
+                if row + 1 < size:
+                    self._update_move((row, col), (row + 1, col))
+        self._move_dirty_cells.clear()
+        self._move_index_stale = False
+
+    def refresh_move_index(self):
+        """変更のあったセルの近傍にある隣接交換だけを再評価"""
+        if self._move_index_stale:
+            self.rebuild_move_index()
+            return
+        if not self._move_dirty_cells:
+            return
+
+        size = self.size
+        horizontal = set()
+        vertical = set()
+        for row, col in self._move_dirty_cells:
+            # 右隣との交換 (r, c)-(r, c+1) は 行 r の c-2..c+3 と 列 c, c+1 の r-2..r+2 に依存する
+            horizontal.update((row, c) for c in range(col - 3, col + 3))
+            for r in range(row - 2, row + 3):
+                horizontal.add((r, col - 1))
+                horizontal.add((r, col))
+            # 下隣との交換 (r, c)-(r+1, c) は 列 c の r-2..r+3 と 行 r, r+1 の c-2..c+2 に依存する
+            vertical.update((r, col) for r in range(row - 3, row + 3))
+            for c in range(col - 2, col + 3):
+                vertical.add((row - 1, c))
+                vertical.add((row, c))
+
+        for row, col in horizontal:
+            if 0 <= row < size and 0 <= col < size - 1:
+                self._update_move((row, col), (row, col + 1))
+        for row, col in vertical:
+            if 0 <= row < size - 1 and 0 <= col < size:
+                self._update_move((row, col), (row + 1, col))
+
+        self._move_dirty_cells.clear()
+
+    def has_moves(self) -> bool:
+        """合法手が1つ以上あるか"""
+        self.refresh_move_index()
+        return bool(self._legal_moves)
+
+    def legal_moves(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """マッチが発生する隣接交換 ((row1, col1), (row2, col2)) のリスト"""
+        self.refresh_move_index()
+        return list(self._legal_moves)
+
+    def reshuffle(self, rng=None) -> bool:
+        """
+        既存のブロックを並べ替えて、マッチがなく合法手が1つ以上ある配置にする
+
+        Returns:
+            bool: 再配置できたか（空セルがある場合や色の組み合わせ上不可能な場合は False）
+        """
+        grid = self._grid
+        size = self.size
+
+        # 色コードごとにブロックを集める（Enum の value プロパティは遅いので _value_ を直接読む）
+        codes = []
+        buckets = [[] for _ in BLOCK_TYPES]
+        for line in grid:
+            for block in line:
+                if block is None:
+                    return False
+                code = block.type._value_
+                codes.append(code)
+                buckets[code].append(block)
+
+        plan = plan_reshuffle(codes, size, rng or self.rng)
+        if plan is None:
+            return False
+
+        # 色ごとに既存のブロックを割り当て直す
+        take = [bucket.pop for bucket in buckets]
+        index = 0
+        for row, line in enumerate(grid):
+            for col in range(size):
+                block = take[plan[index]]()
+                index += 1
+                line[col] = block
+                block.grid_x = col
+                block.grid_y = row
+
+        # 合法手インデックスは次に参照されたときに作り直す
+        self.mark_all_dirty()
+        return True
+
+    def resolve_cascades(self, max_iterations: int = MAX_CASCADE_ITERATIONS) -> tuple[int, int]:
+        """
+        マッチがなくなるまで 削除→落下→補充 を繰り返す
+
+        Returns:
+            tuple: (獲得スコア, 連鎖の深さ)
+        """
+        total_score = 0
+        depth = 0
+
+        while True:
+            matches = self.find_matches_incremental()
+            if not matches:
+                break
+
+            # 無限ループ防止
+            if depth >= max_iterations:
+                self.logger.warning(f"Cascade resolution stopped after {depth} iterations")
+                break
+
+            depth += 1
+            total_score += self.remove_matches(matches)
+            self.drop_blocks()
+            self.fill_empty_spaces()
+
+        return total_score, depth
+
+
+# 選択可能なエンジンバックエンド
+BACKENDS = ("list", "bitboard")
+
+
+def create_board(backend: str = "list", size: int = GRID_SIZE, **kwargs):
+    """
+    指定したバックエンドの盤面を作成
+
+    2つのバックエンドで共通なのはシード付きの生成と、スコア・盤面の変化だけを使う操作
+    （initialize_grid / swap_blocks / find_matches / find_matches_incremental /
+    remove_matches / resolve_cascades / legal_moves / has_moves）に限られる。
+    "bitboard" はブロックオブジェクトを持たないため、次の点で "list" と異なる。
+
+    - block_factory を受け取らない（grid ではなく to_types() で盤面を参照する）
+    - drop_blocks は移動したブロックのリストではなく、移動があったかを bool で返す
+    - fill_empty_spaces は補充した位置のリストではなく、補充した数を返す
+
+    描画用の Match3Game は "list" を使う。"bitboard" はソルバーや大量評価向け。
+
+    Args:
+        backend: "list"（ブロックオブジェクトのグリッド）または "bitboard"（色ごとのビットマスク）
+        size: グリッドの一辺のセル数
+        **kwargs: バックエンド固有の引数（"list" の block_factory、両方の seed）
+    """
+    if backend == "list":
+        return Board(size, **kwargs)
+    if backend == "bitboard":
+        if "block_factory" in kwargs:
+            raise TypeError(
+                "The bitboard backend has no block objects; block_factory is not supported"
+            )
+        # bitboard は本モジュールを参照するため遅延インポート
+        from bitboard import BitBoard
+
+        return BitBoard(size, **kwargs)
+    raise ValueError(f"Unknown board backend: {backend!r} (expected one of {BACKENDS})")
@@ -0,0 +1,167 @@
+"""
+Amazon Q Match3 盤面プール
+
+開始用の盤面（マッチがなく、合法手が1つ以上ある状態）を事前に生成しておき、
+ゲーム開始・リプレイ時にすぐ渡せるようにする。
+生成はバックグラウンドスレッドで行い、補充のタイミングは RefillPolicy で選ぶ。
+"""
+
+import logging
+import random
+import threading
+from collections import deque
+from enum import Enum
+
+from board_engine import GRID_SIZE, Board, Tile
+
+# デフォルトで保持する盤面数
+DEFAULT_CAPACITY = 3
+
+# 開始用盤面を生成し直す回数の上限
+MAX_GENERATION_ATTEMPTS = 100
+
+
+class RefillPolicy(Enum):
+    """盤面プールの補充ポリシー"""
+
+    IDLE = "idle"  # メニュー表示中など、アイドル状態の間だけバックグラウンドで補充
+    ALWAYS = "always"  # 不足していれば常にバックグラウンドで補充
+    ON_DEMAND = "on_demand"  # スレッドを使わず、fill() 呼び出し時と取り出し時にだけ生成
+
+
+def make_starting_board(size: int = GRID_SIZE, block_factory=Tile, seed=None) -> Board:
+    """マッチがなく合法手が1つ以上ある開始用の盤面を生成"""
+    board = Board(size, block_factory=block_factory, seed=seed)
+    for _ in range(MAX_GENERATION_ATTEMPTS):
+        board.initialize_grid()
+        # 再配置できない色の組み合わせなら、盤面の乱数ストリームの続きで生成し直す
+        if board.has_moves() or board.reshuffle():
+            # 合法手インデックスも生成側で作っておく
+            board.refresh_move_index()
+            return board
+    raise RuntimeError(
+        f"Could not generate a starting board with legal moves "
+        f"(size={size}, seed={board.seed}, attempts={MAX_GENERATION_ATTEMPTS})"
+    )
+
+
+class BoardPool:
+    """開始用盤面の事前生成プール"""
+
+    def __init__(
+        self,
+        size: int = GRID_SIZE,
+        block_factory=Tile,
+        capacity: int = DEFAULT_CAPACITY,
+        policy: RefillPolicy = RefillPolicy.IDLE,
+        seed=None,
+    ):
+        """
+        Args:
+            size: 盤面の一辺のセル数
+            block_factory: block_factory(block_type, x, y) でブロックを生成する呼び出し可能オブジェクト
+            capacity: 保持する盤面数の上限
+            policy: 補充ポリシー
+            seed: 各盤面のシードを決める乱数のシード（グローバルな random とは独立）
+        """
+        self.logger = logging.getLogger("BoardPool")
+        self.size = size
+        self.block_factory = block_factory
+        self.capacity = capacity
+        self.policy = policy
+        self._seed_source = random.Random(seed)
+
+        self._boards = deque()
+        self._condition = threading.Condition()
+        self._idle = False
+        self._running = False
+        self._thread = None
+
+        # 統計（プールから渡せた回数 / その場で生成した回数）
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._condition:
+            return len(self._boards)
+
+    def _generate(self) -> Board:
+        """盤面ごとのシードを決めて1枚生成"""
+        seed = self._seed_source.getrandbits(63)
+        return make_starting_board(self.size, self.block_factory, seed)
+
+    def _needs_refill(self) -> bool:
+        """バックグラウンドで補充すべきか（ロックを保持した状態で呼ぶ）"""
+        if not self._running or len(self._boards) >= self.capacity:
+            return False
+        return self.policy == RefillPolicy.ALWAYS or self._idle
+
+    def _worker(self):
+        """不足分の盤面をバックグラウンドで生成"""
+        self.logger.debug("Board pool worker started")
+        while True:
+            with self._condition:
+                while self._running and not self._needs_refill():
+                    self._condition.wait()
+                if not self._running:
+                    break
+
+            # 生成中はロックを持たない（take() を待たせない）
+            board = self._generate()
+
+            with self._condition:
+                if len(self._boards) < self.capacity:
+                    self._boards.append(board)
+        self.logger.debug("Board pool worker stopped")
+
+    def start(self):
+        """バックグラウンド補充を開始（ON_DEMAND では何もしない）"""
+        if self.policy == RefillPolicy.ON_DEMAND or self._thread is not None:
+            return
+        with self._condition:
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="BoardPool", daemon=True)
+        self._thread.start()
+        self.logger.info(
+            f"Board pool started (size={self.size}, capacity={self.capacity}, "
+            f"policy={self.policy.value})"
+        )
+
+    def stop(self, timeout: float = 1.0):
+        """バックグラウンド補充を停止"""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def set_idle(self, idle: bool):
+        """アイドル状態（メニュー表示中など）かどうかを設定"""
+        if idle == self._idle:
+            return
+        with self._condition:
+            self._idle = idle
+            self._condition.notify_all()
+
+    def fill(self):
+        """呼び出したスレッドで容量いっぱいまで補充"""
+        while len(self) < self.capacity:
+            board = self._generate()
+            with self._condition:
+                self._boards.append(board)
+
+    def take(self) -> Board:
+        """盤面を1つ取り出す（空ならその場で生成）"""
+        with self._condition:
+            board = self._boards.popleft() if self._boards else None
+            self._condition.notify_all()
+
+        if board is None:
+            self.misses += 1
+            self.logger.debug("Board pool empty, generating board synchronously")
+            return self._generate()
+
+        self.hits += 1
+        return board
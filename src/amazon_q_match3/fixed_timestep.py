@@ -0,0 +1,61 @@
+"""
+Amazon Q Match3 固定タイムステップ
+
+描画のフレーム間隔（可変）を累積し、シミュレーションを一定の刻み幅で進める。
+1フレームで進めきれなかった端数は次のフレームに持ち越し、
+描画ではその割合（alpha）を使って直前と現在のシミュレーション状態を補間する。
+"""
+
+import logging
+
+# シミュレーションの刻み幅（秒）
+SIMULATION_STEP = 1 / 60
+
+# 1フレームで進める時間の上限（これを超えた分は捨てて、処理落ち時の連鎖的な遅延を防ぐ）
+MAX_FRAME_TIME = 0.25
+
+
+class FixedTimestep:
+    """経過時間を累積して、固定刻みのステップ数に変換する"""
+
+    def __init__(self, step: float = SIMULATION_STEP, max_frame_time: float = MAX_FRAME_TIME):
+        """
+        Args:
+            step: シミュレーションの刻み幅（秒）
+            max_frame_time: 1フレームで進める時間の上限（秒）
+        """
+        self.logger = logging.getLogger("FixedTimestep")
+        self.step = step
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+        # 統計
+        self.steps = 0
+        self.dropped_seconds = 0.0
+
+    def advance(self, dt: float) -> int:
+        """
+        経過時間を加え、このフレームで進めるステップ数を返す
+
+        Args:
+            dt: 前のフレームからの経過秒数
+        """
+        if dt > self.max_frame_time:
+            self.logger.debug(f"Frame time {dt:.3f}s clamped to {self.max_frame_time:.3f}s")
+            self.dropped_seconds += dt - self.max_frame_time
+            dt = self.max_frame_time
+
+        self.accumulator += dt
+        count = int(self.accumulator / self.step)
+        self.accumulator -= count * self.step
+        self.steps += count
+        return count
+
+    @property
+    def alpha(self) -> float:
+        """直前のステップから次のステップまでの進み具合（描画の補間に使う 0〜1）"""
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        """持ち越した端数を捨てる"""
+        self.accumulator = 0.0
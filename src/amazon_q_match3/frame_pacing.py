@@ -0,0 +1,143 @@
+"""
+Amazon Q Match3 フレームペーシング
+
+アニメーションやエフェクトがない間は毎秒 FPS 回描画せず、
+pygame.event.wait にタイムアウトを付けて入力を待つことで CPU を休ませる。
+入力が来ればすぐに戻り、アニメーションが始まれば通常のフレームレートに戻る。
+"""
+
+import logging
+import time
+from enum import Enum
+
+import pygame
+
+# 通常時のフレームレート
+ACTIVE_FPS = 60
+
+# 残り時間の表示だけが変わる状態のフレームレート（カウントダウンや点滅に十分な頻度）
+TIMER_FPS = 10
+
+# 入力以外で画面が変わらない状態（メニューなど）で入力を待つ最大時間（ミリ秒）
+IDLE_TIMEOUT_MS = 500
+
+
+class PaceMode(Enum):
+    """フレームの進め方"""
+
+    ACTIVE = "active"  # アニメーション中: 通常のフレームレート
+    TIMER = "timer"  # タイマーだけが動いている: 低いフレームレートで入力を待つ
+    IDLE = "idle"  # 入力があるまで変化しない: 長めのタイムアウトで入力を待つ
+
+
+class FramePacer:
+    """状態に応じてフレームの待ち方を切り替え、モードごとの CPU 使用率を計測する"""
+
+    def __init__(
+        self,
+        clock,
+        fps: int = ACTIVE_FPS,
+        timer_fps: int = TIMER_FPS,
+        idle_timeout_ms: int = IDLE_TIMEOUT_MS,
+        adaptive: bool = True,
+    ):
+        """
+        Args:
+            clock: pygame.time.Clock
+            fps: 通常時のフレームレート
+            timer_fps: タイマーだけが動いている状態のフレームレート
+            idle_timeout_ms: 入力以外で変化しない状態で入力を待つ最大時間
+            adaptive: False なら常に fps で進める（従来の動作）
+        """
+        self.logger = logging.getLogger("FramePacer")
+        self.clock = clock
+        self.fps = fps
+        self.timer_fps = timer_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.adaptive = adaptive
+
+        # モードごとのフレーム数・経過時間・CPU 時間
+        self.frames = dict.fromkeys(PaceMode, 0)
+        self.wall_seconds = dict.fromkeys(PaceMode, 0.0)
+        self.cpu_seconds = dict.fromkeys(PaceMode, 0.0)
+        self._mode = None
+        self._wall_mark = None
+        self._cpu_mark = None
+
+    def next_frame(self, mode: PaceMode) -> tuple[float, list]:
+        """
+        次のフレームまで待つ
+
+        Args:
+            mode: 直前のフレームを終えた時点の状態
+
+        Returns:
+            tuple: (前のフレームからの経過秒数, 処理するイベントのリスト)
+        """
+        if not self.adaptive:
+            mode = PaceMode.ACTIVE
+        self._record(mode)
+
+        if mode is PaceMode.ACTIVE:
+            elapsed_ms = self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            timeout = 1000 // self.timer_fps if mode is PaceMode.TIMER else self.idle_timeout_ms
+            event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+            # 待った時間も含めて前回からの経過時間を測る（ここでは待たない）
+            elapsed_ms = self.clock.tick()
+
+        return elapsed_ms / 1000.0, events
+
+    def _record(self, mode: PaceMode):
+        """前回の呼び出しからの経過時間と CPU 時間を、そのときのモードに加算"""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if self._mode is not None:
+            self.wall_seconds[self._mode] += wall - self._wall_mark
+            self.cpu_seconds[self._mode] += cpu - self._cpu_mark
+        self.frames[mode] += 1
+        self._mode = mode
+        self._wall_mark = wall
+        self._cpu_mark = cpu
+
+    def cpu_usage(self, mode: PaceMode) -> float | None:
+        """モードごとの CPU 使用率（CPU 時間 / 経過時間、計測がなければ None）"""
+        wall = self.wall_seconds[mode]
+        return self.cpu_seconds[mode] / wall if wall > 0 else None
+
+    def stats(self) -> dict:
+        """
+        計測結果を返す
+
+        idle_cpu_seconds_saved は、待機状態で省略したフレーム数に
+        待機状態の1フレームあたりの CPU 時間を掛けた推定値。
+        """
+        idle_modes = (PaceMode.TIMER, PaceMode.IDLE)
+        idle_wall = sum(self.wall_seconds[mode] for mode in idle_modes)
+        idle_cpu = sum(self.cpu_seconds[mode] for mode in idle_modes)
+        idle_frames = sum(self.frames[mode] for mode in idle_modes)
+        skipped = max(0, int(idle_wall * self.fps) - idle_frames)
+        saved = idle_cpu / idle_frames * skipped if idle_frames else 0.0
+        return {
+            "frames": {mode.value: count for mode, count in self.frames.items()},
+            "cpu_usage": {mode.value: self.cpu_usage(mode) for mode in PaceMode},
+            "idle_seconds": idle_wall,
+            "idle_frames_skipped": skipped,
+            "idle_cpu_seconds_saved": saved,
+        }
+
+    def summary(self) -> str:
+        """ログ用の1行の要約"""
+        stats = self.stats()
+        usage = ", ".join(
+            f"{mode} {value:.0%}" for mode, value in stats["cpu_usage"].items() if value is not None
+        )
+        return (
+            f"frames {stats['frames']}, CPU usage [{usage}], "
+            f"idle {stats['idle_seconds']:.1f}s, "
+            f"frames skipped {stats['idle_frames_skipped']}, "
+            f"CPU saved {stats['idle_cpu_seconds_saved']:.2f}s"
+        )
@@ -0,0 +1,216 @@
+"""
+Amazon Q Match3 フレームプロファイラ
+
+ゲームループの各フェーズ（入力待ち・イベント処理・更新・描画・画面反映）にかかった時間を
+perf_counter_ns で計測し、直近 N フレーム分を事前に確保したリングバッファに記録する。
+無効な間は phase() が共有の何もしないコンテキストを返すだけなので、計測のコストはほぼかからない。
+"""
+
+import contextlib
+import time
+
+import numpy as np
+import pygame
+
+# 記録するフレーム数
+DEFAULT_CAPACITY = 600
+
+# 計測するフェーズ（インデントは内側のフェーズ。外側の時間に含まれる）
+PHASES = ("wait", "events", "update", "animations", "particles", "render", "flip")
+NESTED_PHASES = frozenset({"animations", "particles", "flip"})
+
+# 表示するパーセンタイル
+PERCENTILES = (50, 95, 99)
+
+# オーバーレイの表示内容を更新する間隔（秒）
+OVERLAY_REFRESH_INTERVAL = 0.25
+
+OVERLAY_BACKGROUND = (0, 0, 0)
+OVERLAY_TEXT_COLOR = (200, 255, 200)
+OVERLAY_PADDING = 6
+
+# 無効時に返す何もしないコンテキスト
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class _PhaseTimer:
+    """1つのフェーズの時間を現在のフレームに加算するコンテキスト"""
+
+    __slots__ = ("current", "index", "start")
+
+    def __init__(self, current: list, index: int):
+        self.current = current
+        self.index = index
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        self.current[self.index] += time.perf_counter_ns() - self.start
+
+
+class FrameProfiler:
+    """フェーズごとのフレーム時間をリングバッファに記録する"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fps: int = 60, phases=PHASES):
+        """
+        Args:
+            capacity: 記録するフレーム数
+            fps: 目標フレームレート（1フレームの処理がこの予算を超えたら落ちたフレームとして数える）
+            phases: 計測するフェーズ名
+        """
+        self.enabled = False
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self.budget_ns = 1_000_000_000 // fps
+
+        # リングバッファ（フェーズごとの時間・入力待ちを除いた処理時間・パーティクル数・ポップアップ数）
+        self.samples = np.zeros((capacity, len(self.phases)), dtype=np.int64)
+        self.totals = np.zeros(capacity, dtype=np.int64)
+        self.particle_counts = np.zeros(capacity, dtype=np.int32)
+        self.popup_counts = np.zeros(capacity, dtype=np.int32)
+        self.position = 0
+        self.filled = 0
+
+        # 統計
+        self.frames = 0
+        self.dropped = 0
+
+        # 現在のフレームのフェーズごとの時間（タイマーはこのリストを直接更新する）
+        self._current = [0] * len(self.phases)
+        self._frame_start = 0
+        self._wait_index = self.phases.index("wait") if "wait" in self.phases else None
+        self._timers = {
+            name: _PhaseTimer(self._current, index) for index, name in enumerate(self.phases)
+        }
+
+    def toggle(self) -> bool:
+        """計測の有効・無効を切り替え、切り替え後の状態を返す（有効にするときは記録を消す）"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        self._frame_start = 0
+        return self.enabled
+
+    def reset(self):
+        """記録を消去"""
+        self.position = 0
+        self.filled = 0
+        self.frames = 0
+        self.dropped = 0
+
+    def phase(self, name: str):
+        """フェーズの時間を計測するコンテキストを返す（無効時は何もしない）"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timers[name]
+
+    def begin_frame(self):
+        """フレームの計測を開始"""
+        if not self.enabled:
+            return
+        current = self._current
+        for index in range(len(current)):
+            current[index] = 0
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self, particles: int = 0, popups: int = 0):
+        """フレームの計測を終えてリングバッファに書き込む"""
+        if not self.enabled or not self._frame_start:
+            return
+        total = time.perf_counter_ns() - self._frame_start
+        if self._wait_index is not None:
+            total -= self._current[self._wait_index]
+
+        position = self.position
+        self.samples[position] = self._current
+        self.totals[position] = total
+        self.particle_counts[position] = particles
+        self.popup_counts[position] = popups
+        self.position = (position + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+        self.frames += 1
+        if total > self.budget_ns:
+            self.dropped += 1
+        self._frame_start = 0
+
+    def percentiles(self) -> dict[str, tuple[float, ...]]:
+        """フェーズごと（と処理時間の合計 "total"）のパーセンタイル（ミリ秒）"""
+        if not self.filled:
+            return {}
+        count = self.filled
+        values = np.percentile(self.samples[:count], PERCENTILES, axis=0) / 1e6
+        result = {name: tuple(values[:, index]) for index, name in enumerate(self.phases)}
+        result["total"] = tuple(np.percentile(self.totals[:count], PERCENTILES) / 1e6)
+        return result
+
+    def report_lines(self) -> list[str]:
+        """オーバーレイに表示する行"""
+        header = "".join(f"{f'p{p}':>7}" for p in PERCENTILES)
+        lines = [f"Frame profile ({self.filled} frames)", f"{'ms':<12}{header}"]
+        for name, values in self.percentiles().items():
+            label = f"  {name}" if name in NESTED_PHASES else name
+            lines.append(f"{label:<12}" + "".join(f"{value:7.2f}" for value in values))
+
+        latest = (self.position - 1) % self.capacity
+        particles = int(self.particle_counts[latest]) if self.filled else 0
+        popups = int(self.popup_counts[latest]) if self.filled else 0
+        lines.append(f"Particles: {particles}  Popups: {popups}")
+        lines.append(f"Dropped: {self.dropped}/{self.frames} (>{self.budget_ns / 1e6:.1f} ms)")
+        return lines
+
+    def summary(self) -> str:
+        """ログ用の1行の要約"""
+        stats = self.percentiles()
+        if not stats:
+            return "no frames recorded"
+        parts = [f"{name} p95={values[1]:.2f}ms" for name, values in stats.items()]
+        return f"{', '.join(parts)}, dropped {self.dropped}/{self.frames}"
+
+
+class ProfilerOverlay:
+    """プロファイラの集計を画面の隅に表示するパネル"""
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        font,
+        position=(10, 10),
+        refresh_interval: float = OVERLAY_REFRESH_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.profiler = profiler
+        self.font = font
+        self.position = position
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.panel = None
+        self._refreshed_at = 0.0
+
+    def _compose(self):
+        """集計をパネルに描画（パーセンタイルの計算は refresh_interval ごとに行う）"""
+        rendered = [
+            self.font.render(line, True, OVERLAY_TEXT_COLOR)
+            for line in self.profiler.report_lines()
+        ]
+        line_height = self.font.get_linesize()
+        width = max(surface.get_width() for surface in rendered) + OVERLAY_PADDING * 2
+        height = line_height * len(rendered) + OVERLAY_PADDING * 2
+        if self.panel is not None:
+            # 差分描画で前のパネルの端が残らないように、パネルは縮めない
+            width = max(width, self.panel.get_width())
+            height = max(height, self.panel.get_height())
+        panel = pygame.Surface((width, height))
+        panel.fill(OVERLAY_BACKGROUND)
+        for index, surface in enumerate(rendered):
+            panel.blit(surface, (OVERLAY_PADDING, OVERLAY_PADDING + index * line_height))
+        self.panel = panel
+
+    def draw(self, screen) -> pygame.Rect:
+        """パネルを描画し、描画した領域を返す"""
+        now = self.clock()
+        if self.panel is None or now - self._refreshed_at >= self.refresh_interval:
+            self._compose()
+            self._refreshed_at = now
+        return screen.blit(self.panel, self.position)
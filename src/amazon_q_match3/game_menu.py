@@ -1,11 +1,15 @@
 """
 Amazon Q Match3 ゲームメニューシステム
+
+各メニュー画面は、状態やハイスコアデータが変わったときだけ1枚のサーフェスに描画しておき、
+毎フレームはそのサーフェスと、マウスが乗っている・押されているボタンだけを描画する。
 """
 
 import logging
 from enum import Enum
 
 import pygame
+from text_cache import shared_cache
 
 # Color definitions
 COLORS = {
@@ -37,6 +41,32 @@ class MenuState(Enum):
     PLAYING = "playing"
 
 
+# 画面ごとのボタン（名前, ラベル, 色の名前）
+SCREEN_BUTTONS = {
+    MenuState.MAIN_MENU: [
+        ("start", "Start Game", "DARK_GREEN"),
+        ("highscore", "High Score", "DARK_BLUE"),
+        ("quit", "Quit", "DARK_RED"),
+    ],
+    MenuState.TIME_SELECT: [
+        ("time_30", "30s", "DARK_RED"),
+        ("time_60", "1min", "ORANGE"),
+        ("time_180", "3min", "DARK_GREEN"),
+        ("back", "Back", "DARK_GRAY"),
+    ],
+    MenuState.HIGHSCORE: [("back", "Back", "DARK_GRAY")],
+    MenuState.GAME_OVER: [
+        ("play_again", "Play Again", "DARK_GREEN"),
+        ("main_menu", "Menu", "DARK_BLUE"),
+        ("quit_game", "Quit", "DARK_RED"),
+    ],
+}
+
+# マウスが乗っている・押されているボタンの色の変化（白・黒と混ぜる割合）
+HOVER_BLEND = 0.25
+PRESSED_BLEND = 0.25
+
+
 class GameMenu:
     """ゲームメニュー管理クラス"""
 
@@ -75,6 +105,16 @@ class GameMenu:
         self.buttons = {}
         self._setup_buttons()
 
+        # 画面ごとに描画済みのサーフェス（状態・ハイスコアデータが変わったら作り直す）
+        self._composed = None
+        self._composed_key = None
+        self.compositions = 0
+
+        # マウスの位置とボタンの押下状態（イベントから更新）
+        self.mouse_pos = None
+        self.mouse_pressed = False
+        self._drawn_button = None
+
         self.logger.info("Game menu initialized")
 
     def _setup_buttons(self):
@@ -111,8 +151,16 @@ class GameMenu:
         Returns:
             str: アクション ('start_game', 'quit', 'main_menu', etc.)
         """
+        if event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.mouse_pos = event.pos
+            self.mouse_pressed = False
+
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = event.pos
+            self.mouse_pos = mouse_pos
+            self.mouse_pressed = True
 
             if self.state == MenuState.MAIN_MENU:
                 return self._handle_main_menu_click(mouse_pos)
@@ -172,35 +220,118 @@ class GameMenu:
             return "quit"
         return None
 
-    def draw(self):
-        """メニューを描画"""
+    def draw(self, full: bool = True) -> list:
+        """
+        メニューを描画
+
+        Args:
+            full: False なら、画面に前回のメニューが残っている前提で変化した部分だけ描画する
+
+        Returns:
+            list: 描画し直した矩形のリスト（変化がなければ空）
+        """
+        if self.state not in SCREEN_BUTTONS:
+            return []
+
+        key = self._compose_key()
+        if key != self._composed_key:
+            self._composed = self._compose()
+            self._composed_key = key
+            self.compositions += 1
+            full = True
+
+        button = self._active_button()
+        if full:
+            self.screen.blit(self._composed, (0, 0))
+            if button is not None:
+                self._draw_button(self.screen, *button)
+            self._drawn_button = button
+            return [self.screen.get_rect()]
+
+        if button == self._drawn_button:
+            return []
+
+        # 前回強調したボタンを元に戻し、新しいボタンを強調する
+        rects = []
+        if self._drawn_button is not None:
+            rect = self.buttons[self._drawn_button[0]]
+            self.screen.blit(self._composed, rect, rect)
+            rects.append(rect)
+        if button is not None:
+            self._draw_button(self.screen, *button)
+            rects.append(self.buttons[button[0]])
+        self._drawn_button = button
+        return rects
+
+    def _sync_mouse(self):
+        """
+        マウスの位置と押下状態を実際の状態に合わせる
+
+        ゲーム中のマウスイベントはメニューに届かないので、ゲームから画面が切り替わったときに
+        古い位置・押下状態のままボタンを強調しないようにする（ディスプレイがなければ消去）。
+        """
+        if pygame.display.get_surface() is not None:
+            self.mouse_pos = pygame.mouse.get_pos()
+            self.mouse_pressed = pygame.mouse.get_pressed()[0]
+        else:
+            self.mouse_pos = None
+            self.mouse_pressed = False
+
+    def _compose_key(self):
+        """描画済みサーフェスの作り直しが必要かを判定するキー"""
+        return (
+            self.state,
+            self.highscore_manager.version,
+            self.final_score,
+            self.selected_time,
+            self.is_new_highscore,
+            self.screen.get_size(),
+            self.mouse_pressed,
+        )
+
+    def _compose(self):
+        """現在の画面の静的な部分（ボタンを含む）を1枚のサーフェスに描画"""
+        surface = pygame.Surface(self.screen.get_size())
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
         if self.state == MenuState.MAIN_MENU:
-            self._draw_main_menu()
+            self._draw_main_menu(surface)
         elif self.state == MenuState.TIME_SELECT:
-            self._draw_time_select()
+            self._draw_time_select(surface)
         elif self.state == MenuState.HIGHSCORE:
-            self._draw_highscore()
+            self._draw_highscore(surface)
         elif self.state == MenuState.GAME_OVER:
-            self._draw_game_over()
+            self._draw_game_over(surface)
+
+        for name, text, color in SCREEN_BUTTONS[self.state]:
+            self._draw_button(surface, name, text, COLORS[color])
+
+        self.logger.debug(f"Composed menu screen for state {self.state.value}")
+        return surface
+
+    def _active_button(self):
+        """マウスが乗っているボタンを (名前, ラベル, 色, 状態) で返す（なければ None）"""
+        if self.mouse_pos is None:
+            return None
+        for name, text, color in SCREEN_BUTTONS[self.state]:
+            if self.buttons[name].collidepoint(self.mouse_pos):
+                return (name, text, COLORS[color], "pressed" if self.mouse_pressed else "hover")
+        return None
 
-    def _draw_main_menu(self):
+    def _draw_main_menu(self, surface):
         """Draw main menu"""
-        self.screen.fill(COLORS["BLACK"])
+        surface.fill(COLORS["BLACK"])
 
         # Title
-        title_text = self.title_font.render("Amazon Q Match3", True, COLORS["WHITE"])
-        title_rect = title_text.get_rect(center=(self.screen.get_width() // 2, 150))
-        self.screen.blit(title_text, title_rect)
+        title_text = shared_cache.render(self.title_font, "Amazon Q Match3", COLORS["WHITE"])
+        title_rect = title_text.get_rect(center=(surface.get_width() // 2, 150))
+        surface.blit(title_text, title_rect)
 
         # Subtitle
-        subtitle_text = self.text_font.render("Puzzle Game", True, COLORS["LIGHT_GRAY"])
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen.get_width() // 2, 200))
-        self.screen.blit(subtitle_text, subtitle_rect)
-
-        # Buttons with better color contrast
-        self._draw_button("start", "Start Game", COLORS["DARK_GREEN"])
-        self._draw_button("highscore", "High Score", COLORS["DARK_BLUE"])
-        self._draw_button("quit", "Quit", COLORS["DARK_RED"])
+        subtitle_text = shared_cache.render(self.text_font, "Puzzle Game", COLORS["LIGHT_GRAY"])
+        subtitle_rect = subtitle_text.get_rect(center=(surface.get_width() // 2, 200))
+        surface.blit(subtitle_text, subtitle_rect)
 
         # Best score display
         best_score, best_mode = self.highscore_manager.get_all_time_best()
@@ -208,49 +339,41 @@ class GameMenu:
             # 時間モードを適切なラベルに変換（文字列を整数に変換）
             time_limit = int(best_mode)
             mode_label = self._get_time_label(time_limit)
-            best_text = self.small_font.render(
-                f"Best Score: {best_score} ({mode_label})", True, COLORS["YELLOW"]
+            best_text = shared_cache.render(
+                self.small_font, f"Best Score: {best_score} ({mode_label})", COLORS["YELLOW"]
             )
-            best_rect = best_text.get_rect(center=(self.screen.get_width() // 2, 550))
-            self.screen.blit(best_text, best_rect)
+            best_rect = best_text.get_rect(center=(surface.get_width() // 2, 550))
+            surface.blit(best_text, best_rect)
 
-    def _draw_time_select(self):
+    def _draw_time_select(self, surface):
         """Draw time selection screen"""
-        self.screen.fill(COLORS["BLACK"])
+        surface.fill(COLORS["BLACK"])
 
         # Title
-        title_text = self.menu_font.render("Select Time Limit", True, COLORS["WHITE"])
-        title_rect = title_text.get_rect(center=(self.screen.get_width() // 2, 200))
-        self.screen.blit(title_text, title_rect)
-
-        # Time selection buttons with better color contrast
-        self._draw_button("time_30", "30s", COLORS["DARK_RED"])
-        self._draw_button("time_60", "1min", COLORS["ORANGE"])
-        self._draw_button("time_180", "3min", COLORS["DARK_GREEN"])
+        title_text = shared_cache.render(self.menu_font, "Select Time Limit", COLORS["WHITE"])
+        title_rect = title_text.get_rect(center=(surface.get_width() // 2, 200))
+        surface.blit(title_text, title_rect)
 
         # Best scores for each mode
         y_pos = 380
         for time_limit, label in [(30, "30s"), (60, "1min"), (180, "3min")]:
             best_score = self.highscore_manager.get_best_score(time_limit)
             if best_score > 0:
-                score_text = self.small_font.render(
-                    f"{label} Best: {best_score}", True, COLORS["LIGHT_GRAY"]
+                score_text = shared_cache.render(
+                    self.small_font, f"{label} Best: {best_score}", COLORS["LIGHT_GRAY"]
                 )
-                score_rect = score_text.get_rect(center=(self.screen.get_width() // 2, y_pos))
-                self.screen.blit(score_text, score_rect)
+                score_rect = score_text.get_rect(center=(surface.get_width() // 2, y_pos))
+                surface.blit(score_text, score_rect)
                 y_pos += 25
 
-        # Back button with better contrast
-        self._draw_button("back", "Back", COLORS["DARK_GRAY"])
-
-    def _draw_highscore(self):
+    def _draw_highscore(self, surface):
         """Draw high score screen"""
-        self.screen.fill(COLORS["BLACK"])
+        surface.fill(COLORS["BLACK"])
 
         # Title
-        title_text = self.menu_font.render("High Scores", True, COLORS["WHITE"])
-        title_rect = title_text.get_rect(center=(self.screen.get_width() // 2, 50))
-        self.screen.blit(title_text, title_rect)
+        title_text = shared_cache.render(self.menu_font, "High Scores", COLORS["WHITE"])
+        title_rect = title_text.get_rect(center=(surface.get_width() // 2, 50))
+        surface.blit(title_text, title_rect)
 
         # High scores for each mode
         y_start = 120
@@ -260,104 +383,113 @@ class GameMenu:
             x_offset = i * 250 + 50
 
             # Mode name
-            mode_text = self.text_font.render(mode_name, True, COLORS["YELLOW"])
-            self.screen.blit(mode_text, (x_offset, y_start))
+            mode_text = shared_cache.render(self.text_font, mode_name, COLORS["YELLOW"])
+            surface.blit(mode_text, (x_offset, y_start))
 
             # Score list
             scores = self.highscore_manager.get_highscores(time_limit, 5)
             for j, score_data in enumerate(scores):
                 rank_text = f"{j + 1}. {score_data['score']}"
-                score_text = self.small_font.render(rank_text, True, COLORS["WHITE"])
-                self.screen.blit(score_text, (x_offset, y_start + 40 + j * 25))
+                score_text = shared_cache.render(self.small_font, rank_text, COLORS["WHITE"])
+                surface.blit(score_text, (x_offset, y_start + 40 + j * 25))
 
             if not scores:
-                no_score_text = self.small_font.render("No Records", True, COLORS["GRAY"])
-                self.screen.blit(no_score_text, (x_offset, y_start + 40))
+                no_score_text = shared_cache.render(self.small_font, "No Records", COLORS["GRAY"])
+                surface.blit(no_score_text, (x_offset, y_start + 40))
 
-        # Back button with better contrast
-        self._draw_button("back", "Back", COLORS["DARK_GRAY"])
-
-    def _draw_game_over(self):
+    def _draw_game_over(self, surface):
         """Draw game over screen"""
-        self.screen.fill(COLORS["BLACK"])
+        surface.fill(COLORS["BLACK"])
+        center_x = surface.get_width() // 2
 
         # Game over title
-        title_text = self.title_font.render("GAME OVER", True, COLORS["RED"])
-        title_rect = title_text.get_rect(center=(self.screen.get_width() // 2, 150))
-        self.screen.blit(title_text, title_rect)
+        title_text = shared_cache.render(self.title_font, "GAME OVER", COLORS["RED"])
+        surface.blit(title_text, title_text.get_rect(center=(center_x, 150)))
 
         # Score display
-        score_text = self.menu_font.render(f"Score: {self.final_score}", True, COLORS["WHITE"])
-        score_rect = score_text.get_rect(center=(self.screen.get_width() // 2, 220))
-        self.screen.blit(score_text, score_rect)
+        score_text = shared_cache.render(
+            self.menu_font, f"Score: {self.final_score}", COLORS["WHITE"]
+        )
+        surface.blit(score_text, score_text.get_rect(center=(center_x, 220)))
 
         # Time limit display
         time_label = self._get_time_label(self.selected_time)
-        time_text = self.text_font.render(f"Mode: {time_label}", True, COLORS["LIGHT_GRAY"])
-        time_rect = time_text.get_rect(center=(self.screen.get_width() // 2, 260))
-        self.screen.blit(time_text, time_rect)
+        time_text = shared_cache.render(self.text_font, f"Mode: {time_label}", COLORS["LIGHT_GRAY"])
+        surface.blit(time_text, time_text.get_rect(center=(center_x, 260)))
 
         # High score display
         if self.is_new_highscore:
-            highscore_text = self.text_font.render("New Record!", True, COLORS["YELLOW"])
-            highscore_rect = highscore_text.get_rect(center=(self.screen.get_width() // 2, 300))
-            self.screen.blit(highscore_text, highscore_rect)
+            highscore_text = shared_cache.render(self.text_font, "New Record!", COLORS["YELLOW"])
+            surface.blit(highscore_text, highscore_text.get_rect(center=(center_x, 300)))
         else:
             rank = self.highscore_manager.get_rank(self.selected_time, self.final_score)
             if rank <= 10:
-                rank_text = self.text_font.render(f"Rank: #{rank}", True, COLORS["LIGHT_BLUE"])
-                rank_rect = rank_text.get_rect(center=(self.screen.get_width() // 2, 300))
-                self.screen.blit(rank_text, rank_rect)
+                rank_text = shared_cache.render(
+                    self.text_font, f"Rank: #{rank}", COLORS["LIGHT_BLUE"]
+                )
+                surface.blit(rank_text, rank_text.get_rect(center=(center_x, 300)))
 
         # Best score display
         best_score = self.highscore_manager.get_best_score(self.selected_time)
         if best_score > 0:
-            time_label = self._get_time_label(self.selected_time)
-            best_text = self.small_font.render(
-                f"{time_label} Best: {best_score}", True, COLORS["LIGHT_GRAY"]
+            best_text = shared_cache.render(
+                self.small_font, f"{time_label} Best: {best_score}", COLORS["LIGHT_GRAY"]
             )
-            best_rect = best_text.get_rect(center=(self.screen.get_width() // 2, 340))
-            self.screen.blit(best_text, best_rect)
-
-        # Buttons with better color contrast
-        self._draw_button("play_again", "Play Again", COLORS["DARK_GREEN"])
-        self._draw_button("main_menu", "Menu", COLORS["DARK_BLUE"])
-        self._draw_button("quit_game", "Quit", COLORS["DARK_RED"])
+            surface.blit(best_text, best_text.get_rect(center=(center_x, 340)))
+
+    def _draw_button(
+        self,
+        surface,
+        button_name: str,
+        text: str,
+        color: tuple[int, int, int],
+        highlight: str | None = None,
+    ):
+        """
+        Draw button with proper text sizing and contrast
 
-    def _draw_button(self, button_name: str, text: str, color: tuple[int, int, int]):
-        """Draw button with proper text sizing and contrast"""
+        Args:
+            highlight: "hover"（マウスが乗っている）または "pressed"（押されている）
+        """
         if button_name not in self.buttons:
             return
 
         button_rect = self.buttons[button_name]
 
-        # Button background
-        pygame.draw.rect(self.screen, color, button_rect)
-        pygame.draw.rect(self.screen, COLORS["WHITE"], button_rect, 2)
-
         # Determine text color based on background brightness
         # Calculate brightness using standard formula
         brightness = color[0] * 0.299 + color[1] * 0.587 + color[2] * 0.114
         text_color = COLORS["WHITE"] if brightness < 128 else COLORS["BLACK"]
 
+        # マウスが乗っていれば明るく、押されていれば暗くする（文字色は元の色で決める）
+        if highlight == "hover":
+            color = tuple(int(c + (255 - c) * HOVER_BLEND) for c in color)
+        elif highlight == "pressed":
+            color = tuple(int(c * (1 - PRESSED_BLEND)) for c in color)
+
+        # Button background
+        pygame.draw.rect(surface, color, button_rect)
+        pygame.draw.rect(surface, COLORS["WHITE"], button_rect, 2)
+
         # Button text with appropriate font size
         font = self.button_font  # Use consistent button font for all buttons
 
         # Check if text fits, if not use smaller font
-        text_surface = font.render(text, True, text_color)
+        text_surface = shared_cache.render(font, text, text_color)
         if text_surface.get_width() > button_rect.width - 20:  # 20px padding
             font = self.small_font
-            text_surface = font.render(text, True, text_color)
+            text_surface = shared_cache.render(font, text, text_color)
 
         text_rect = text_surface.get_rect(center=button_rect.center)
-        self.screen.blit(text_surface, text_rect)
+        surface.blit(text_surface, text_rect)
 
-    def set_game_over(self, score: int, time_limit: int):
-        """ゲームオーバー状態を設定"""
+    def set_game_over(self, score: int, time_limit: int, record: bool = True):
+        """ゲームオーバー状態を設定（record=False ならスコアを記録しない）"""
         self.final_score = score
         self.selected_time = time_limit
-        self.is_new_highscore = self.highscore_manager.add_score(time_limit, score)
+        self.is_new_highscore = record and self.highscore_manager.add_score(time_limit, score)
         self.state = MenuState.GAME_OVER
+        self._sync_mouse()
 
         self.logger.info(
             f"Game over: Score={score}, Time={time_limit}s, New highscore={self.is_new_highscore}"
@@ -370,4 +502,5 @@ class GameMenu:
     def set_state(self, state: MenuState):
         """メニュー状態を設定"""
         self.state = state
+        self._sync_mouse()
         self.logger.debug(f"Menu state changed to {state.value}")
@@ -15,6 +15,8 @@ class HighScoreManager:
         self.logger = logging.getLogger("HighScoreManager")
         self.data_file = Path(data_file)
         self.highscores = self._load_highscores()
+        # データが変わるたびに増える版番号（メニュー画面のキャッシュ判定用）
+        self.version = 0
 
     def _load_highscores(self) -> dict[str, list[dict]]:
         """ハイスコアデータを読み込み"""
@@ -78,6 +80,7 @@ class HighScoreManager:
 
         # 上位10位まで保持
         self.highscores[time_key] = self.highscores[time_key][:10]
+        self.version += 1
 
         # ハイスコアかどうかチェック
         is_highscore = any(
@@ -161,6 +164,7 @@ class HighScoreManager:
                 self.highscores[time_key] = []
                 self.logger.info(f"Cleared highscores for {time_limit}s mode")
 
+        self.version += 1
         self._save_highscores()
 
 
@@ -0,0 +1,79 @@
+"""
+Amazon Q Match3 HUD ウィジェット
+
+スコア・残り時間などのテキストを保持型（retained mode）のウィジェットとして扱う。
+各ウィジェットは前回の表示値と描画済みサーフェスを覚えておき、
+表示値・色・フォントのいずれかが変わったときだけ再描画する。
+"""
+
+import logging
+
+from text_cache import shared_cache
+
+
+class TextWidget:
+    """表示値が変わったときだけ再描画するテキスト"""
+
+    def __init__(self, template: str, position):
+        """
+        Args:
+            template: str.format 形式のテンプレート（例: "Score: {}"）
+            position: 描画位置（左上）
+        """
+        self.template = template
+        self.position = position
+        self.surface = None
+        self._key = None
+
+    def render(self, font, color, values) -> bool:
+        """
+        表示値が前回と違えば再描画する
+
+        Returns:
+            bool: 再描画した場合 True
+        """
+        key = (font, color, values)
+        if key == self._key:
+            return False
+        self.surface = shared_cache.render(font, self.template.format(*values), color)
+        self._key = key
+        return True
+
+
+class HudLayer:
+    """名前付きテキストウィジェットの集まり"""
+
+    def __init__(self):
+        self.logger = logging.getLogger("HudLayer")
+        self.widgets = {}
+
+        # 統計（再描画した回数と、表示値が同じで再描画を省略した回数）
+        self.renders = 0
+        self.skipped = 0
+
+    def add(self, name: str, template: str, position) -> TextWidget:
+        """ウィジェットを登録"""
+        widget = TextWidget(template, position)
+        self.widgets[name] = widget
+        return widget
+
+    def render(self, name: str, font, color, *values):
+        """ウィジェットを最新の表示値にして、描画済みサーフェスを返す"""
+        widget = self.widgets[name]
+        if widget.render(font, color, values):
+            self.renders += 1
+        else:
+            self.skipped += 1
+        return widget.surface
+
+    def draw(self, screen, name: str, font, color, *values):
+        """ウィジェットを最新の表示値にして、登録した位置に描画"""
+        surface = self.render(name, font, color, *values)
+        screen.blit(surface, self.widgets[name].position)
+        return surface
+
+    def invalidate(self):
+        """全ウィジェットを次回の描画で再描画させる"""
+        for widget in self.widgets.values():
+            widget.surface = None
+            widget._key = None
@@ -1,18 +1,25 @@
-import contextlib
 import logging
 import math
 import random
 import sys
 import time
 from enum import Enum
+from functools import partial
 from pathlib import Path
 
 import pygame
+from board_engine import BlockType
+from board_pool import BoardPool, RefillPolicy, make_starting_board
+from fixed_timestep import FixedTimestep
+from frame_pacing import FramePacer, PaceMode
+from frame_profiler import FrameProfiler, ProfilerOverlay
 from game_menu import GameMenu, MenuState
 from highscore_manager import HighScoreManager
-
-# 初期化
-pygame.init()
+from hud import HudLayer
+from particle_system import ParticleSystem
+from sprite_cache import BlockSpriteCache, quantize_alpha
+from text_cache import shared_cache
+from trace_events import Tracer, traced
 
 # 定数
 WINDOW_WIDTH = 800
@@ -26,7 +33,7 @@ FPS = 60
 # ログ設定をインポート
 sys.path.append(str(Path(__file__).parent.parent.parent))
 try:
-    from logging_config import get_game_logger, setup_logging
+    from logging_config import get_game_logger, get_rate_limited_logger, setup_logging
 
     # ログシステムを初期化（INFO レベル、ファイルとコンソール両方に出力）
     setup_logging(level=logging.INFO, log_to_file=True, log_to_console=False)
@@ -39,17 +46,45 @@ except ImportError:
         handlers=[logging.FileHandler("amazon_q_match3.log"), logging.StreamHandler(sys.stdout)],
     )
     logger = logging.getLogger("Match3Game")
+
+    def get_rate_limited_logger(name="Match3Game", **_kwargs):
+        """logging_config がない場合は件数を制限せずに出力"""
+        return logging.getLogger(name)
+
+
 GRID_SIZE = 8
 CELL_SIZE = 60
 GRID_OFFSET_X = 50
 GRID_OFFSET_Y = 50
 FPS = 60
 
+# 毎フレーム出力するログのメッセージごとの1秒あたりの件数上限
+FRAME_LOG_RATE = 1
+
 # アニメーション定数
 SWAP_ANIMATION_SPEED = 8.0
 FALL_ANIMATION_SPEED = 12.0
 FADE_ANIMATION_SPEED = 5.0
 PARTICLE_COUNT = 8
+PARTICLE_CAPACITY = 2048  # 同時に存在できるパーティクル数の上限
+
+# アニメーションがない間は入力を待ってフレームレートを下げる
+ADAPTIVE_FRAME_PACING = True
+
+# 差分描画（変化した領域だけを再描画して display.update に渡す）
+DIRTY_RECT_RENDERING = True
+
+# フレームプロファイラのオーバーレイを切り替えるキー
+PROFILER_KEY = pygame.K_F3
+PROFILER_FONT = "consolas,dejavusansmono,couriernew,monospace"
+
+# トレース（Chrome のトレースイベント形式）の記録を切り替えるキーと出力先ディレクトリ
+TRACE_KEY = pygame.K_F4
+TRACE_DIR = Path("traces")
+
+# 開始用盤面プール（メニュー表示中に事前生成する盤面数と補充ポリシー）
+BOARD_POOL_CAPACITY = 3
+BOARD_POOL_POLICY = RefillPolicy.IDLE
 
 # 色定義（グラデーション用）
 COLORS = {
@@ -65,6 +100,16 @@ COLORS = {
     "LIGHT_GRAY": (192, 192, 192),
 }
 
+# ブロックタイプごとのグラデーション色
+BLOCK_COLORS = {
+    BlockType.RED: COLORS["RED"],
+    BlockType.BLUE: COLORS["BLUE"],
+    BlockType.GREEN: COLORS["GREEN"],
+    BlockType.YELLOW: COLORS["YELLOW"],
+    BlockType.PURPLE: COLORS["PURPLE"],
+    BlockType.ORANGE: COLORS["ORANGE"],
+}
+
 # 単色版（UI用）
 UI_COLORS = {
     "RED": (255, 100, 100),
@@ -80,15 +125,6 @@ UI_COLORS = {
 }
 
 
-class BlockType(Enum):
-    RED = 0
-    BLUE = 1
-    GREEN = 2
-    YELLOW = 3
-    PURPLE = 4
-    ORANGE = 5
-
-
 class AnimationType(Enum):
     NONE = 0
     SWAP = 1
@@ -117,137 +153,25 @@ class ScorePopup:
 
         return self.life > 0
 
+    def get_rect(self):
+        """描画範囲（影を含む）"""
+        width, height = shared_cache.get_font(None, self.font_size).size(f"+{self.score}")
+        return pygame.Rect(int(self.x) - 1, int(self.y) - 1, width + 4, height + 4)
+
     def draw(self, screen, font):
-        """ポップアップの描画"""
+        """ポップアップの描画（テキストはキャッシュし、フェードは透明度の変更だけで行う）"""
         if self.life > 0:
             # フェードアウト効果（残りライフに応じて透明度を調整）
             alpha = min(255, int(255 * (self.life / 2.0)))  # 2秒でフェードアウト
+            shadow_alpha = 255 if alpha >= 255 else alpha // 2  # 影は半透明
 
-            # 色にアルファ値を適用
-            fade_color = (*self.color[:3], alpha) if len(self.color) == 4 else (*self.color, alpha)
-            shadow_color = (0, 0, 0, alpha // 2)  # 影は半透明
-
-            # より大きなフォントでスコアテキストを作成
-            large_font = pygame.font.Font(None, self.font_size)
-            score_text = large_font.render(f"+{self.score}", True, fade_color[:3])
-            shadow_text = large_font.render(f"+{self.score}", True, shadow_color[:3])
-
-            # 透明度を適用するためのサーフェスを作成
-            if alpha < 255:
-                # 透明度付きサーフェスを作成
-                text_surface = pygame.Surface(score_text.get_size(), pygame.SRCALPHA)
-                shadow_surface = pygame.Surface(shadow_text.get_size(), pygame.SRCALPHA)
-
-                text_surface.blit(score_text, (0, 0))
-                shadow_surface.blit(shadow_text, (0, 0))
-
-                text_surface.set_alpha(alpha)
-                shadow_surface.set_alpha(alpha // 2)
-
-                screen.blit(shadow_surface, (self.x + 2, self.y + 2))
-                screen.blit(text_surface, (self.x, self.y))
-            else:
-                # 通常の描画
-                screen.blit(shadow_text, (self.x + 2, self.y + 2))
-                screen.blit(score_text, (self.x, self.y))
-
-
-class Particle:
-    """パーティクル効果用のクラス（強化版）"""
-
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.start_x = x
-        self.start_y = y
-        self.color = color
-
-        # より派手な動きのパラメータ
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(50, 150)  # 速度を上げる
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed - random.uniform(20, 60)  # 上向きの初速度
-
-        # 重力と減衰
-        self.gravity = 200  # 重力を強化
-        self.friction = 0.98
-
-        # 見た目の強化
-        self.life = random.uniform(1.0, 2.0)  # 寿命を延長
-        self.max_life = self.life
-        self.size = random.uniform(3, 8)  # サイズをランダム化
-        self.rotation = 0
-        self.rotation_speed = random.uniform(-360, 360)  # 回転速度
-
-    def update(self, dt):
-        """パーティクルの更新（強化版）"""
-        # 物理演算
-        self.vx *= self.friction
-        self.vy += self.gravity * dt
-
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-
-        # 回転
-        self.rotation += self.rotation_speed * dt
-
-        # 寿命の減少
-        self.life -= dt
-
-        return self.life > 0
-
-    def draw(self, screen):
-        """パーティクルの描画（強化版）"""
-        try:
-            if self.life > 0:
-                # フェードアウト効果
-                alpha_ratio = self.life / self.max_life
-
-                # 色の計算（フェードアウト）
-                if isinstance(self.color, list | tuple) and len(self.color) >= 3:
-                    r, g, b = self.color[:3]
-                else:
-                    r, g, b = 255, 255, 255
-
-                fade_color = (int(r * alpha_ratio), int(g * alpha_ratio), int(b * alpha_ratio))
-
-                # サイズの変化（最初大きく、徐々に小さく）
-                current_size = self.size * (0.5 + 0.5 * alpha_ratio)
-
-                # 星形パーティクルを描画
-                self._draw_star(screen, int(self.x), int(self.y), int(current_size), fade_color)
-        except Exception:
-            # エラー時は何もしない
-            pass
-
-    def _draw_star(self, screen, x, y, size, color):
-        """星形パーティクルを描画"""
-        try:
-            # 簡単な星形（4つの線）
-            points = []
-            for i in range(8):
-                angle = (i * math.pi / 4) + math.radians(self.rotation)
-                if i % 2 == 0:
-                    # 外側の点
-                    px = x + math.cos(angle) * size
-                    py = y + math.sin(angle) * size
-                else:
-                    # 内側の点
-                    px = x + math.cos(angle) * size * 0.5
-                    py = y + math.sin(angle) * size * 0.5
-                points.append((px, py))
-
-            # 星形を描画
-            if len(points) >= 3:
-                pygame.draw.polygon(screen, color, points)
-            else:
-                # フォールバック：円
-                pygame.draw.circle(screen, color, (x, y), max(1, int(size)))
-
-        except Exception:
-            # エラー時のフォールバック：円
-            with contextlib.suppress(Exception):
-                pygame.draw.circle(screen, color, (x, y), max(1, int(size)))
+            # より大きなフォントでスコアテキストを描画
+            large_font = shared_cache.get_font(None, self.font_size)
+            text = f"+{self.score}"
+            shadow_text = shared_cache.render(large_font, text, (0, 0, 0), shadow_alpha)
+            screen.blit(shadow_text, (self.x + 2, self.y + 2))
+            score_text = shared_cache.render(large_font, text, self.color, alpha)
+            screen.blit(score_text, (self.x, self.y))
 
 
 class Block:
@@ -259,6 +183,9 @@ class Block:
         # 描画位置（アニメーション用）
         self.draw_x = x * CELL_SIZE
         self.draw_y = y * CELL_SIZE
+        # 直前のシミュレーションステップ開始時の描画位置（描画時の補間用）
+        self.prev_x = self.draw_x
+        self.prev_y = self.draw_y
 
         # アニメーション関連
         if animate_spawn:
@@ -280,15 +207,19 @@ class Block:
 
     def get_colors(self):
         """グラデーション用の色を取得"""
-        color_map = {
-            BlockType.RED: COLORS["RED"],
-            BlockType.BLUE: COLORS["BLUE"],
-            BlockType.GREEN: COLORS["GREEN"],
-            BlockType.YELLOW: COLORS["YELLOW"],
-            BlockType.PURPLE: COLORS["PURPLE"],
-            BlockType.ORANGE: COLORS["ORANGE"],
-        }
-        return color_map[self.type]
+        return BLOCK_COLORS[self.type]
+
+    def save_position(self):
+        """ステップを進める前の描画位置を記録"""
+        self.prev_x = self.draw_x
+        self.prev_y = self.draw_y
+
+    def render_position(self, alpha: float = 1.0) -> tuple[float, float]:
+        """直前のステップと現在の描画位置を alpha で補間した位置"""
+        return (
+            self.prev_x + (self.draw_x - self.prev_x) * alpha,
+            self.prev_y + (self.draw_y - self.prev_y) * alpha,
+        )
 
     def start_animation(self, anim_type, target_x=None, target_y=None):
         """アニメーションを開始"""
@@ -343,48 +274,19 @@ class Block:
 
         return False
 
-    def draw_gradient_circle(self, screen, x, y, radius, colors, alpha=255):
-        """グラデーション円を描画"""
-        # メインの円
-        main_color = colors[0]
-        if alpha < 255:
-            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*main_color, alpha), (radius, radius), radius)
-            screen.blit(surf, (x - radius, y - radius))
-        else:
-            pygame.draw.circle(screen, main_color, (int(x), int(y)), radius)
-
-        # 内側のハイライト
-        highlight_radius = int(radius * 0.7)
-        highlight_color = [min(255, c + 50) for c in main_color]
-        if alpha < 255:
-            surf = pygame.Surface((highlight_radius * 2, highlight_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(
-                surf,
-                (*highlight_color, alpha // 2),
-                (highlight_radius, highlight_radius),
-                highlight_radius,
-            )
-            screen.blit(surf, (x - highlight_radius, y - highlight_radius))
-        else:
-            pygame.draw.circle(screen, highlight_color, (int(x), int(y)), highlight_radius)
-
-        # 光沢効果
-        gloss_radius = int(radius * 0.3)
-        gloss_x = x - radius * 0.3
-        gloss_y = y - radius * 0.3
-        gloss_alpha = alpha // 3 if alpha < 255 else 80
-        if gloss_alpha > 0:
-            surf = pygame.Surface((gloss_radius * 2, gloss_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(
-                surf, (255, 255, 255, gloss_alpha), (gloss_radius, gloss_radius), gloss_radius
-            )
-            screen.blit(surf, (int(gloss_x - gloss_radius), int(gloss_y - gloss_radius)))
-
 
 class Match3Game:
-    def __init__(self, time_limit: int = 180):
+    def __init__(self, time_limit: int = 180, highscore_manager: HighScoreManager | None = None):
+        """
+        Args:
+            time_limit: 制限時間（秒）
+            highscore_manager: スコアの保存先（省略時は highscores.json）
+        """
         self.logger = logging.getLogger("Match3Game")
+        # 描画・ゲームループで毎フレーム呼ばれるログ用（件数を制限し、書式化は出力時のみ）
+        self.frame_logger = get_rate_limited_logger("Match3Game", per_second=FRAME_LOG_RATE)
+        # 処理区間のトレース（TRACE_KEY または start_trace で記録を開始）
+        self.tracer = Tracer()
         self.logger.info("=== Amazon Q Match3 Game Starting ===")
         self.logger.info(f"Pygame version: {pygame.version.ver}")
 
@@ -393,17 +295,50 @@ class Match3Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Amazon Q Match3 - Enhanced Edition")
         self.clock = pygame.time.Clock()
+        self.frame_pacer = FramePacer(self.clock, FPS, adaptive=ADAPTIVE_FRAME_PACING)
+
+        # フェーズごとのフレーム時間の計測（PROFILER_KEY でオーバーレイと一緒に切り替え）
+        self.profiler = FrameProfiler(fps=FPS)
+        self.profiler_overlay = None
+
+        # シミュレーションは固定刻みで進め、描画は直前と現在の状態を補間する
+        self.timestep = FixedTimestep()
+        self.render_alpha = 1.0
 
         # ハイスコア管理とメニューシステム
-        self.highscore_manager = HighScoreManager()
+        self.highscore_manager = highscore_manager or HighScoreManager()
         self.menu = GameMenu(self.screen, self.highscore_manager)
+        # 時間切れのときにスコアを記録するか（simulate の実行中は既定で記録しない）
+        self.record_highscore = True
+
+        # ブロックの事前描画スプライト
+        self.sprite_cache = BlockSpriteCache(BLOCK_COLORS)
+
+        # 背景（塗りつぶしとグリッド線）のキャッシュ
+        self._background = None
+        self._background_key = None
+
+        # HUD のテキスト（表示値が変わったときだけ再描画）
+        self.hud = self._create_hud()
+
+        # 差分描画: 前フレームで描画した要素の状態と範囲（None なら次は全体を描画）
+        self.dirty_rect_rendering = DIRTY_RECT_RENDERING
+        self._drawn_elements = None
+        self.last_dirty_rects = []
+        # 画面に前フレームのメニューが残っているか（残っていればメニューの変化分だけ描画する）
+        self._menu_on_screen = False
+
+        # 開始用盤面プール（バックグラウンド補充は run() で開始）
+        self.board_pool = BoardPool(
+            GRID_SIZE, block_factory=Block, capacity=BOARD_POOL_CAPACITY, policy=BOARD_POOL_POLICY
+        )
 
         # ゲーム状態
         self.reset_game(time_limit)
 
         # アニメーション関連
         self.animating = False
-        self.particles = []
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
         self.score_popups = []  # スコアポップアップリスト
         self.dt = 0
 
@@ -434,10 +369,36 @@ class Match3Game:
 
         self.logger.info("Game initialization completed successfully")
 
-    def reset_game(self, time_limit: int = 180):
-        """ゲームをリセット"""
-        self.grid = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.score = 0
+    @property
+    def grid(self):
+        """盤面エンジンのグリッド"""
+        return self.board.grid
+
+    @grid.setter
+    def grid(self, value):
+        self.board.grid = value
+
+    @property
+    def score(self):
+        """盤面エンジンのスコア"""
+        return self.board.score
+
+    @score.setter
+    def score(self, value):
+        self.board.score = value
+
+    def reset_game(self, time_limit: int = 180, seed=None):
+        """
+        ゲームをリセット（盤面はプールから取り出す）
+
+        Args:
+            time_limit: 制限時間（秒）
+            seed: 盤面の乱数シード（指定するとそのシードのゲームを再現する）
+        """
+        if seed is None:
+            self.board = self.board_pool.take()
+        else:
+            self.board = make_starting_board(GRID_SIZE, block_factory=Block, seed=seed)
         self.time_limit = time_limit
         self.time_left = time_limit
         self.selected_block = None
@@ -445,54 +406,45 @@ class Match3Game:
         self.game_started = False
         self.pending_match_check = None
 
-        # グリッドを初期化（ゲーム開始時のみ）
-        if hasattr(self, "grid"):
-            self.initialize_grid()
-
-        self.logger.info(f"Game reset with {time_limit}s time limit")
+        self.logger.info(f"Game reset with {time_limit}s time limit (seed={self.board.seed})")
 
     def initialize_grid(self):
-        """グリッドを初期化（マッチしないように配置）"""
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                # 初期配置でマッチしないようにブロックタイプを選択
-                valid_types = list(BlockType)
-
-                # 左に2つ同じ色がある場合は除外
-                if col >= 2 and (
-                    self.grid[row][col - 1]
-                    and self.grid[row][col - 2]
-                    and self.grid[row][col - 1].type == self.grid[row][col - 2].type
-                ):
-                    valid_types.remove(self.grid[row][col - 1].type)
-
-                # 上に2つ同じ色がある場合は除外
-                if (
-                    row >= 2
-                    and (
-                        self.grid[row - 1][col]
-                        and self.grid[row - 2][col]
-                        and self.grid[row - 1][col].type == self.grid[row - 2][col].type
-                    )
-                    and self.grid[row - 1][col].type in valid_types
-                ):
-                    valid_types.remove(self.grid[row - 1][col].type)
-
-                block_type = random.choice(valid_types)
-                self.grid[row][col] = Block(block_type, col, row)
+        """グリッドを初期化（マッチしないように配置し、合法手がなければ再配置）"""
+        self.board.initialize_grid()
+        if not self.board.has_moves() and not self.board.reshuffle():
+            self.logger.warning("Initial grid has no legal moves and could not be reshuffled")
+
+    def get_background(self):
+        """背景（塗りつぶしとグリッドの枠）のキャッシュを取得（レイアウトが変わったら作り直す）"""
+        size = self.screen.get_size()
+        key = self._layout_key()
+        if self._background is None or key != self._background_key:
+            background = pygame.Surface(size)
+            background.fill(UI_COLORS["BLACK"])
+            for row in range(GRID_SIZE):
+                for col in range(GRID_SIZE):
+                    x = GRID_OFFSET_X + col * CELL_SIZE
+                    y = GRID_OFFSET_Y + row * CELL_SIZE
+                    pygame.draw.rect(background, UI_COLORS["GRAY"], (x, y, CELL_SIZE, CELL_SIZE), 2)
+
+            # 画面と同じピクセル形式に変換（ディスプレイ未初期化時はそのまま）
+            if pygame.display.get_surface() is not None:
+                background = background.convert()
+            self._background = background
+            self._background_key = key
+            self.logger.debug(f"Background layer rebuilt for layout {key}")
+        return self._background
+
+    def draw_background(self):
+        """キャッシュした背景を1回の blit で描画"""
+        self.screen.blit(self.get_background(), (0, 0))
 
     def draw_grid_only(self):
         """グリッドとブロックのみを描画（エフェクトは除く）"""
         self.logger.debug("Drawing grid only")
 
-        # グリッドの背景を描画
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                x = GRID_OFFSET_X + col * CELL_SIZE
-                y = GRID_OFFSET_Y + row * CELL_SIZE
-
-                # グリッドの枠を描画
-                pygame.draw.rect(self.screen, UI_COLORS["GRAY"], (x, y, CELL_SIZE, CELL_SIZE), 2)
+        # 背景とグリッドの枠を描画
+        self.draw_background()
 
         # ブロックを描画
         for row in range(GRID_SIZE):
@@ -537,8 +489,7 @@ class Match3Game:
         self.logger.debug("Drawing effects")
 
         # パーティクルを描画
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.particles.draw(self.screen, self.render_alpha)
 
         # スコアポップアップを描画
         for popup in self.score_popups:
@@ -546,76 +497,22 @@ class Match3Game:
             font_to_use = getattr(self, "score_font", self.small_font)
             popup.draw(self.screen, font_to_use)
 
+    @traced()
     def draw_grid(self):
         """グリッドとブロックを描画（アニメーション対応）"""
         self.logger.debug("Drawing grid")
 
-        # グリッドの背景を描画
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                x = GRID_OFFSET_X + col * CELL_SIZE
-                y = GRID_OFFSET_Y + row * CELL_SIZE
-
-                # グリッドの枠を描画
-                pygame.draw.rect(self.screen, UI_COLORS["GRAY"], (x, y, CELL_SIZE, CELL_SIZE), 2)
+        # 背景とグリッドの枠を描画（画面全体の塗りつぶしを兼ねる）
+        self.draw_background()
 
         # ブロックを描画（アニメーション位置で）
         for row in range(GRID_SIZE):
             for col in range(GRID_SIZE):
                 if self.grid[row][col]:
-                    block = self.grid[row][col]
-
-                    # アニメーション位置を計算
-                    draw_x = GRID_OFFSET_X + block.draw_x + CELL_SIZE // 2
-                    draw_y = GRID_OFFSET_Y + block.draw_y + CELL_SIZE // 2
-
-                    # 選択されたブロックをハイライト
-                    if self.selected_block == (row, col):
-                        highlight_radius = CELL_SIZE // 2 + 4
-                        pygame.draw.circle(
-                            self.screen,
-                            UI_COLORS["WHITE"],
-                            (int(draw_x), int(draw_y)),
-                            highlight_radius,
-                            3,
-                        )
-
-                    # 連鎖ハイライト（点滅効果）
-                    if self.is_highlighting and (row, col) in self.highlighted_matches:
-                        # 点滅効果
-                        flash_intensity = abs(math.sin(self.match_highlight_timer * 20)) * 0.5 + 0.5
-                        highlight_color = (255, 255, 0)  # 黄色
-                        highlight_radius = CELL_SIZE // 2 + 6
-
-                        # 外側のリング
-                        pygame.draw.circle(
-                            self.screen,
-                            highlight_color,
-                            (int(draw_x), int(draw_y)),
-                            highlight_radius,
-                            int(4 * flash_intensity),
-                        )
-
-                        # 内側の光る効果
-                        inner_radius = int(highlight_radius * 0.8 * flash_intensity)
-                        if inner_radius > 0:
-                            pygame.draw.circle(
-                                self.screen,
-                                (*highlight_color, int(100 * flash_intensity)),
-                                (int(draw_x), int(draw_y)),
-                                inner_radius,
-                            )
-
-                    # グラデーション円を描画
-                    colors = block.get_colors()
-                    radius = CELL_SIZE // 2 - 4
-                    block.draw_gradient_circle(
-                        self.screen, draw_x, draw_y, radius, colors, block.alpha
-                    )
+                    self._draw_block(row, col, self.grid[row][col])
 
         # パーティクルを描画
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.particles.draw(self.screen, self.render_alpha)
 
         # スコアポップアップを描画
         for popup in self.score_popups:
@@ -623,13 +520,76 @@ class Match3Game:
             font_to_use = getattr(self, "score_font", self.small_font)
             popup.draw(self.screen, font_to_use)
 
+    def _draw_block(self, row, col, block):
+        """ブロック1つを選択・連鎖ハイライト付きで描画"""
+        # アニメーション位置を計算（シミュレーションステップ間を補間）
+        block_x, block_y = block.render_position(self.render_alpha)
+        draw_x = GRID_OFFSET_X + block_x + CELL_SIZE // 2
+        draw_y = GRID_OFFSET_Y + block_y + CELL_SIZE // 2
+
+        # 選択されたブロックをハイライト
+        if self.selected_block == (row, col):
+            highlight_radius = CELL_SIZE // 2 + 4
+            pygame.draw.circle(
+                self.screen,
+                UI_COLORS["WHITE"],
+                (int(draw_x), int(draw_y)),
+                highlight_radius,
+                3,
+            )
+
+        # 連鎖ハイライト（点滅効果）
+        if self.is_highlighting and (row, col) in self.highlighted_matches:
+            # 点滅効果
+            flash_intensity = abs(math.sin(self.match_highlight_timer * 20)) * 0.5 + 0.5
+            highlight_color = (255, 255, 0)  # 黄色
+            highlight_radius = CELL_SIZE // 2 + 6
+
+            # 外側のリング
+            pygame.draw.circle(
+                self.screen,
+                highlight_color,
+                (int(draw_x), int(draw_y)),
+                highlight_radius,
+                int(4 * flash_intensity),
+            )
+
+            # 内側の光る効果
+            inner_radius = int(highlight_radius * 0.8 * flash_intensity)
+            if inner_radius > 0:
+                pygame.draw.circle(
+                    self.screen,
+                    (*highlight_color, int(100 * flash_intensity)),
+                    (int(draw_x), int(draw_y)),
+                    inner_radius,
+                )
+
+        # 事前描画したスプライトを描画
+        self.sprite_cache.draw(self.screen, block.type, block.alpha, CELL_SIZE, (draw_x, draw_y))
+
+    @staticmethod
+    def _create_hud():
+        """HUD のテキストウィジェットを配置"""
+        hud = HudLayer()
+        hud.add("score", "Score: {}", (WINDOW_WIDTH - 200, 20))
+        hud.add("time", "Time: {:02d}:{:02d}", (WINDOW_WIDTH - 200, 60))
+        hud.add("mode", "Mode: {}", (WINDOW_WIDTH - 200, 100))
+        hud.add("best", "Best ({}): {}", (WINDOW_WIDTH - 200, 120))
+        hud.add("help", "Click blocks to swap", (20, WINDOW_HEIGHT - 60))
+        hud.add("menu_hint", "ESC: Menu", (20, WINDOW_HEIGHT - 40))
+        return hud
+
+    @traced()
     def draw_ui(self):
         """Draw UI elements (Enhanced version with better time display)"""
-        self.logger.info(f"Drawing UI elements - Score: {self.score}, Time: {self.time_left:.1f}")
+        self.frame_logger.info(
+            "Drawing UI elements - Score: %s, Time: %.1f", self.score, self.time_left
+        )
+
+        hud = self.hud
 
         # Score display
-        score_text = self.font.render(f"Score: {self.score}", True, UI_COLORS["WHITE"])
-        self.screen.blit(score_text, (WINDOW_WIDTH - 200, 20))
+        hud.draw(self.screen, "score", self.font, UI_COLORS["WHITE"], self.score)
 
         # Time remaining display (enhanced with better visibility)
         # ゲームオーバー時は時間を0に固定
@@ -652,36 +612,30 @@ class Match3Game:
                 time_color = UI_COLORS["WHITE"]
 
         # Create time text with background for better visibility
-        time_text = f"Time: {minutes:02d}:{seconds:02d}"
-        time_surface = self.font.render(time_text, True, time_color)
-
-        self.logger.debug(f"Drawing time: {time_text} with color {time_color}")
+        time_surface = hud.render("time", self.font, time_color, minutes, seconds)
 
         # Draw background for critical time
         if time_bg_color and not self.game_over:  # No background when game over
             time_rect = time_surface.get_rect()
-            time_rect.topleft = (WINDOW_WIDTH - 200, 60)
+            time_rect.topleft = hud.widgets["time"].position
             # Expand background slightly
             bg_rect = time_rect.inflate(10, 4)
             pygame.draw.rect(self.screen, time_bg_color, bg_rect)
             pygame.draw.rect(self.screen, time_color, bg_rect, 2)  # Border
 
-        self.screen.blit(time_surface, (WINDOW_WIDTH - 200, 60))
+        self.screen.blit(time_surface, hud.widgets["time"].position)
 
         # Time limit mode display
         time_label = self._get_time_label(self.time_limit)
-        mode_text = self.small_font.render(f"Mode: {time_label}", True, UI_COLORS["LIGHT_GRAY"])
-        self.screen.blit(mode_text, (WINDOW_WIDTH - 200, 100))
+        hud.draw(self.screen, "mode", self.small_font, UI_COLORS["LIGHT_GRAY"], time_label)
 
         # Current best score display
         best_score = self.highscore_manager.get_best_score(self.time_limit)
         if best_score > 0:
             # 時間制限に応じた単位表示
-            time_label = self._get_time_label(self.time_limit)
-            best_text = self.small_font.render(
-                f"Best ({time_label}): {best_score}", True, UI_COLORS["YELLOW"]
+            hud.draw(
+                self.screen, "best", self.small_font, UI_COLORS["YELLOW"], time_label, best_score
             )
-            self.screen.blit(best_text, (WINDOW_WIDTH - 200, 120))
 
         # Progress bar for time remaining (visual indicator)
         progress_width = 180
@@ -715,12 +669,10 @@ class Match3Game:
             )
 
         # Instructions
-        help_text = self.small_font.render("Click blocks to swap", True, UI_COLORS["WHITE"])
-        self.screen.blit(help_text, (20, WINDOW_HEIGHT - 60))
+        hud.draw(self.screen, "help", self.small_font, UI_COLORS["WHITE"])
 
         # Menu hint
-        menu_hint = self.small_font.render("ESC: Menu", True, UI_COLORS["LIGHT_GRAY"])
-        self.screen.blit(menu_hint, (20, WINDOW_HEIGHT - 40))
+        hud.draw(self.screen, "menu_hint", self.small_font, UI_COLORS["LIGHT_GRAY"])
 
     def get_grid_position(self, mouse_pos):
         """マウス座標をグリッド座標に変換"""
@@ -738,6 +690,14 @@ class Match3Game:
         row2, col2 = pos2
         return abs(row1 - row2) + abs(col1 - col2) == 1
 
+    def has_moves(self):
+        """マッチが発生する交換が残っているか（盤面エンジンの合法手インデックスを参照）"""
+        return self.board.has_moves()
+
+    def legal_moves(self):
+        """マッチが発生する隣接交換のリスト（ヒント表示用）"""
+        return self.board.legal_moves()
+
     def swap_blocks(self, pos1, pos2, animate=True):
         """ブロックを交換（アニメーション対応版）"""
         row1, col1 = pos1
@@ -746,16 +706,10 @@ class Match3Game:
         block1 = self.grid[row1][col1]
         block2 = self.grid[row2][col2]
 
-        if not block1 or not block2:
+        # ブロックを交換（グリッド座標は盤面エンジンが更新）
+        if not self.board.swap_blocks(pos1, pos2):
             return
 
-        # ブロックを交換
-        self.grid[row1][col1], self.grid[row2][col2] = block2, block1
-
-        # グリッド座標を更新
-        block1.grid_x, block1.grid_y = col2, row2
-        block2.grid_x, block2.grid_y = col1, row1
-
         if animate:
             # アニメーションを開始
             block1.start_animation(AnimationType.SWAP, col2, row2)
@@ -768,101 +722,14 @@ class Match3Game:
             block2.draw_x = col1 * CELL_SIZE
             block2.draw_y = row1 * CELL_SIZE
 
+    @traced()
     def find_matches(self):
-        """マッチするブロックを検出（ログ対応版）"""
-        matches = set()
-        horizontal_matches = 0
-        vertical_matches = 0
-
-        self.logger.debug("Starting match detection")
-
-        # 横方向のマッチをチェック
-        for row in range(GRID_SIZE):
-            count = 1
-            current_type = None
-            start_col = 0
-
-            for col in range(GRID_SIZE):
-                if self.grid[row][col] and self.grid[row][col].type == current_type:
-                    count += 1
-                else:
-                    if count >= 3 and current_type is not None:
-                        # マッチを記録
-                        match_positions = []
-                        for c in range(start_col, col):
-                            matches.add((row, c))
-                            match_positions.append((row, c))
-                        self.logger.debug(
-                            f"Horizontal match found: {current_type.name} at {match_positions}"
-                        )
-                        horizontal_matches += 1
-
-                    if self.grid[row][col]:
-                        current_type = self.grid[row][col].type
-                        start_col = col
-                        count = 1
-                    else:
-                        current_type = None
-                        count = 0
-
-            # 行の最後でマッチチェック
-            if count >= 3 and current_type is not None:
-                match_positions = []
-                for c in range(start_col, GRID_SIZE):
-                    matches.add((row, c))
-                    match_positions.append((row, c))
-                self.logger.debug(
-                    f"Horizontal match found (end of row): {current_type.name} at {match_positions}"
-                )
-                horizontal_matches += 1
-
-        # 縦方向のマッチをチェック
-        for col in range(GRID_SIZE):
-            count = 1
-            current_type = None
-            start_row = 0
-
-            for row in range(GRID_SIZE):
-                if self.grid[row][col] and self.grid[row][col].type == current_type:
-                    count += 1
-                else:
-                    if count >= 3 and current_type is not None:
-                        # マッチを記録
-                        match_positions = []
-                        for r in range(start_row, row):
-                            matches.add((r, col))
-                            match_positions.append((r, col))
-                        self.logger.debug(
-                            f"Vertical match found: {current_type.name} at {match_positions}"
-                        )
-                        vertical_matches += 1
-
-                    if self.grid[row][col]:
-                        current_type = self.grid[row][col].type
-                        start_row = row
-                        count = 1
-                    else:
-                        current_type = None
-                        count = 0
-
-            # 列の最後でマッチチェック
-            if count >= 3 and current_type is not None:
-                match_positions = []
-                for r in range(start_row, GRID_SIZE):
-                    matches.add((r, col))
-                    match_positions.append((r, col))
-                self.logger.debug(
-                    f"Vertical match found (end of column): {current_type.name} at {match_positions}"
-                )
-                vertical_matches += 1
-
-        self.logger.debug(
-            f"Match detection completed: {len(matches)} total matches "
-            f"({horizontal_matches} horizontal, {vertical_matches} vertical)"
-        )
-
+        """マッチするブロックを検出（変更のあった行・列のみ走査）"""
+        matches = self.board.find_matches_incremental()
+        self.logger.debug(f"Match detection completed: {len(matches)} total matches")
         return matches
 
+    @traced()
     def remove_matches(self, matches):
         """マッチしたブロックを削除してスコアを加算（強化版）"""
         if not matches:
@@ -872,20 +739,8 @@ class Match3Game:
             self.logger.info(f"Removing {len(matches)} matches: {matches}")
 
             # スコア計算
-            match_count = len(matches)
             old_score = self.score
-            score_gained = 0
-
-            if match_count == 3:
-                score_gained = 100
-            elif match_count == 4:
-                score_gained = 200
-            elif match_count == 5:
-                score_gained = 500
-            else:
-                score_gained = 100 * match_count
-
-            self.score += score_gained
+            score_gained = self.board.score_matches(matches)
 
             self.logger.info(f"Score updated: {old_score} -> {self.score} (+{score_gained})")
 
@@ -904,32 +759,22 @@ class Match3Game:
                 f"Created score popup: +{score_gained} at ({screen_x}, {screen_y}), total popups: {len(self.score_popups)}"
             )
 
-            # 安全にブロックを削除
-            removed_count = 0
-            for row, col in matches:
-                if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
-                    if self.grid[row][col]:
-                        self.logger.debug(f"Removing block at ({row}, {col})")
-
-                        # より派手なパーティクル効果を生成
-                        try:
-                            colors = self.grid[row][col].get_colors()
-                            if colors and len(colors) > 0:
-                                # パーティクル数を増やす
-                                self.create_particles(col, row, colors, count=15)
-                                self.logger.debug(f"Created particles for block at ({row}, {col})")
-                        except Exception as e:
-                            self.logger.warning(f"Particle creation failed for ({row}, {col}): {e}")
-
-                        # ブロックを削除
-                        self.grid[row][col] = None
-                        removed_count += 1
-                    else:
-                        self.logger.warning(f"No block found at ({row}, {col})")
-                else:
-                    self.logger.error(f"Invalid coordinates ({row}, {col})")
+            # 安全にブロックを削除（範囲外・空セルは盤面エンジンがスキップ）
+            removed = self.board.clear_cells(matches)
+            for row, col, block in removed:
+                # より派手なパーティクル効果を生成
+                try:
+                    colors = block.get_colors()
+                    if colors and len(colors) > 0:
+                        # パーティクル数を増やす
+                        self.create_particles(col, row, colors, count=15)
+                except Exception as e:
+                    self.logger.warning(f"Particle creation failed for ({row}, {col}): {e}")
+
+            if len(removed) != len(matches):
+                self.logger.warning(f"{len(matches) - len(removed)} match positions had no block")
 
-            self.logger.info(f"Successfully removed {removed_count} blocks")
+            self.logger.info(f"Successfully removed {len(removed)} blocks")
 
             # ブロック削除後、0.5秒待機してから落下開始
             self.drop_delay_timer = 0.5
@@ -942,63 +787,27 @@ class Match3Game:
             self.logger.error(f"Error in remove_matches: {e}", exc_info=True)
             return False
 
+    @traced()
     def drop_blocks(self, animate=True):
         """ブロックを落下させる（アニメーション対応版）"""
-        moved = False
-
-        self.logger.debug("Starting block drop process")
-
-        for col in range(GRID_SIZE):
-            # 下から上に向かってチェック
-            write_pos = GRID_SIZE - 1
-            moves_in_column = 0
-
-            for read_pos in range(GRID_SIZE - 1, -1, -1):
-                if self.grid[read_pos][col] is not None:
-                    if write_pos != read_pos:
-                        # ブロックを移動
-                        block = self.grid[read_pos][col]
-                        block_type = block.type
-                        self.logger.debug(
-                            f"Moving block {block_type.name} from ({read_pos}, {col}) to ({write_pos}, {col})"
-                        )
+        moves = self.board.drop_blocks()
 
-                        self.grid[write_pos][col] = block
-                        self.grid[read_pos][col] = None
-
-                        # グリッド座標を更新
-                        block.grid_y = write_pos
-
-                        if animate:
-                            # 落下アニメーションを開始
-                            block.start_animation(AnimationType.FALL, col, write_pos)
-                        else:
-                            # 即座に位置を更新
-                            block.draw_y = write_pos * CELL_SIZE
-
-                        moved = True
-                        moves_in_column += 1
-                    write_pos -= 1
-
-            if moves_in_column > 0:
-                self.logger.debug(f"Column {col}: moved {moves_in_column} blocks")
+        for block, _from_row, to_row, col in moves:
+            if animate:
+                # 落下アニメーションを開始
+                block.start_animation(AnimationType.FALL, col, to_row)
+            else:
+                # 即座に位置を更新
+                block.draw_y = to_row * CELL_SIZE
 
-        self.logger.debug(f"Block drop completed. Any moves: {moved}")
-        return moved
+        self.logger.debug(f"Block drop completed. Moved blocks: {len(moves)}")
+        return bool(moves)
 
+    @traced()
     def fill_empty_spaces(self, animate=True):
         """空いたスペースに新しいブロックを生成（アニメーション対応版）"""
-        filled_count = 0
-
-        self.logger.debug("Starting to fill empty spaces")
-
-        for col in range(GRID_SIZE):
-            for row in range(GRID_SIZE):
-                if self.grid[row][col] is None:
-                    block_type = random.choice(list(BlockType))
-                    self.grid[row][col] = Block(block_type, col, row, animate_spawn=animate)
-                    filled_count += 1
-                    self.logger.debug(f"Created new {block_type.name} block at ({row}, {col})")
+        filled = self.board.fill_empty_spaces(partial(Block, animate_spawn=animate))
+        filled_count = len(filled)
 
         self.logger.debug(f"Filled {filled_count} empty spaces")
 
@@ -1110,38 +919,13 @@ class Match3Game:
         try:
             self.logger.info(f"Removing {len(matches)} matches immediately: {matches}")
 
-            # スコア計算
-            match_count = len(matches)
+            # スコア計算と削除は盤面エンジンに委譲
             old_score = self.score
-            score_gained = 0
-
-            if match_count == 3:
-                score_gained = 100
-            elif match_count == 4:
-                score_gained = 200
-            elif match_count == 5:
-                score_gained = 500
-            else:
-                score_gained = 100 * match_count
-
-            self.score += score_gained
+            score_gained = self.board.score_matches(matches)
+            removed = self.board.clear_cells(matches)
 
             self.logger.info(f"Score updated: {old_score} -> {self.score} (+{score_gained})")
-
-            # 安全にブロックを削除
-            removed_count = 0
-            for row, col in matches:
-                if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
-                    if self.grid[row][col]:
-                        self.logger.debug(f"Removing block at ({row}, {col})")
-                        self.grid[row][col] = None
-                        removed_count += 1
-                    else:
-                        self.logger.warning(f"No block found at ({row}, {col})")
-                else:
-                    self.logger.error(f"Invalid coordinates ({row}, {col})")
-
-            self.logger.info(f"Successfully removed {removed_count} blocks immediately")
+            self.logger.info(f"Successfully removed {len(removed)} blocks immediately")
             return True
 
         except Exception as e:
@@ -1238,65 +1022,84 @@ class Match3Game:
 
         try:
             self.logger.info("Starting main game loop with menu system")
+            self.board_pool.start()
 
+            profiler = self.profiler
             while running:
                 frame_count += 1
-                dt = self.clock.tick(FPS) / 1000.0
-                self.dt = dt
-
-                # イベント処理
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.logger.info("Quit event received")
-                        running = False
-                    else:
-                        # メニューまたはゲームのイベント処理
-                        if self.menu.state == MenuState.PLAYING:
-                            # ゲーム中のイベント処理
-                            if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
-                                self.logger.debug(f"Game mouse click at {event.pos}")
-                                try:
-                                    self.handle_click(event.pos)
-                                except Exception as e:
-                                    self.logger.error(f"Error in handle_click: {e}", exc_info=True)
-                            elif event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_ESCAPE:
-                                    # ESCキーでメニューに戻る
-                                    self.logger.info("ESC pressed, returning to main menu")
-                                    self.menu.set_state(MenuState.MAIN_MENU)
-                        else:
-                            # メニューのイベント処理
-                            action = self.menu.handle_event(event)
-                            if action:
-                                running = self._handle_menu_action(action)
-
-                # ゲーム更新（プレイ中のみ）
-                if self.menu.state == MenuState.PLAYING and not self.game_over:
-                    self._update_game(dt)
-
-                # パーティクル更新（常時）
-                self._update_particles(dt)
-
-                # 定期ログ（プレイ中のみ）
-                if self.menu.state == MenuState.PLAYING:
-                    current_time = pygame.time.get_ticks() / 1000.0
-                    if current_time - last_log_time > 5:
-                        elapsed_time = current_time - start_time
-                        self.logger.info(
-                            f"Game status - Frame: {frame_count}, Score: {self.score}, "
-                            f"Time left: {self.time_left:.1f}s, Elapsed: {elapsed_time:.1f}s, "
-                            f"Particles: {len(self.particles)}, Game over: {self.game_over}"
-                        )
-                        last_log_time = current_time
+                with self.tracer.span("frame", frame=frame_count):
+                    profiler.begin_frame()
+                    with profiler.phase("wait"):
+                        dt, events = self.frame_pacer.next_frame(self.pace_mode())
+                    self.dt = dt
+
+                    # イベント処理
+                    with profiler.phase("events"):
+                        for event in events:
+                            if event.type == pygame.QUIT:
+                                self.logger.info("Quit event received")
+                                running = False
+                            elif event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+                                self.toggle_profiler()
+                            elif event.type == pygame.KEYDOWN and event.key == TRACE_KEY:
+                                self.toggle_trace()
+                            else:
+                                # メニューまたはゲームのイベント処理
+                                if self.menu.state == MenuState.PLAYING:
+                                    # ゲーム中のイベント処理
+                                    if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+                                        self.logger.debug(f"Game mouse click at {event.pos}")
+                                        try:
+                                            self.handle_click(event.pos)
+                                        except Exception as e:
+                                            self.logger.error(
+                                                f"Error in handle_click: {e}", exc_info=True
+                                            )
+                                    elif event.type == pygame.KEYDOWN:
+                                        if event.key == pygame.K_ESCAPE:
+                                            # ESCキーでメニューに戻る
+                                            self.logger.info("ESC pressed, returning to main menu")
+                                            self.menu.set_state(MenuState.MAIN_MENU)
+                                else:
+                                    # メニューのイベント処理
+                                    action = self.menu.handle_event(event)
+                                    if action:
+                                        running = self._handle_menu_action(action)
+
+                    # メニュー表示中は盤面プールを補充
+                    self.board_pool.set_idle(self.menu.state != MenuState.PLAYING)
+
+                    # 経過時間を固定刻みのステップに分けてシミュレーションを進める
+                    with profiler.phase("update"):
+                        for _ in range(self.timestep.advance(dt)):
+                            self.step_simulation(self.timestep.step)
+                    self.render_alpha = self.timestep.alpha
+
+                    # 定期ログ（プレイ中のみ）
+                    if self.menu.state == MenuState.PLAYING:
+                        current_time = pygame.time.get_ticks() / 1000.0
+                        if current_time - last_log_time > 5:
+                            elapsed_time = current_time - start_time
+                            self.logger.info(
+                                f"Game status - Frame: {frame_count}, Score: {self.score}, "
+                                f"Time left: {self.time_left:.1f}s, Elapsed: {elapsed_time:.1f}s, "
+                                f"Particles: {len(self.particles)}, Game over: {self.game_over}, "
+                                f"HUD renders: {self.hud.renders} (skipped {self.hud.skipped})"
+                            )
+                            last_log_time = current_time
 
-                # 描画
-                self._draw_game()
-                pygame.display.flip()
+                    # 描画
+                    with profiler.phase("render"):
+                        self.render_frame()
+                    profiler.end_frame(len(self.particles), len(self.score_popups))
 
             total_elapsed = (pygame.time.get_ticks() / 1000.0) - start_time
             self.logger.info(
                 f"Game loop ended normally after {frame_count} frames ({total_elapsed:.1f}s elapsed)"
             )
+            self.logger.info(f"Frame pacing: {self.frame_pacer.summary()}")
+            if profiler.frames:
+                self.logger.info(f"Frame profile: {profiler.summary()}")
 
         except Exception as e:
             self.logger.critical(
@@ -1304,9 +1107,84 @@ class Match3Game:
             )
         finally:
             self.logger.info("Cleaning up and exiting...")
+            self.board_pool.stop()
+            self.stop_trace()
             pygame.quit()
             sys.exit()
 
+    @traced()
+    def step_simulation(self, step: float):
+        """シミュレーションを1ステップ（step 秒）進める"""
+        # 描画の補間用に、ステップ前の位置を記録
+        for line in self.grid:
+            for block in line:
+                if block is not None:
+                    block.save_position()
+
+        # ゲーム更新（プレイ中のみ）
+        if self.menu.state == MenuState.PLAYING and not self.game_over:
+            self._update_game(step)
+
+        # パーティクル更新（常時）
+        self._update_particles(step)
+
+    def simulate(
+        self,
+        seconds: float,
+        autoplay: bool = False,
+        seed=None,
+        record_highscore: bool = False,
+    ) -> int:
+        """
+        描画せずに、実時間を待たずにシミュレーションを進める（自動実行・検証用）
+
+        Args:
+            seconds: 進めるゲーム内の時間（秒）
+            autoplay: True なら盤面が落ち着くたびにランダムな合法手を入力する
+            seed: autoplay の手の選び方の乱数シード
+            record_highscore: 時間切れになったときにスコアをハイスコアに記録するか
+
+        Returns:
+            int: 進めたステップ数
+        """
+        rng = random.Random(seed)
+        self.menu.state = MenuState.PLAYING
+        steps = round(seconds / self.timestep.step)
+        saved_record, self.record_highscore = self.record_highscore, record_highscore
+        try:
+            for count in range(steps):
+                if self.game_over:
+                    return count
+                if autoplay and self.pace_mode() is PaceMode.TIMER:
+                    moves = self.legal_moves()
+                    if moves:
+                        # マウス操作と同じ経路で、セルの中心を順にクリックする
+                        for row, col in rng.choice(moves):
+                            x = GRID_OFFSET_X + col * CELL_SIZE + CELL_SIZE // 2
+                            y = GRID_OFFSET_Y + row * CELL_SIZE + CELL_SIZE // 2
+                            self.handle_click((x, y))
+                self.step_simulation(self.timestep.step)
+        finally:
+            self.record_highscore = saved_record
+            self.render_alpha = 1.0
+        return steps
+
+    def pace_mode(self) -> PaceMode:
+        """次のフレームの進め方（入力と時間経過以外に画面が変わる要因がなければ待機）"""
+        if self.menu.state != MenuState.PLAYING or self.game_over:
+            return PaceMode.IDLE
+        if (
+            self.animating
+            or self.is_highlighting
+            or self.is_waiting_for_drop
+            or getattr(self, "pending_cascade_check", False)
+            or self.pending_match_check
+            or len(self.particles)
+            or self.score_popups
+        ):
+            return PaceMode.ACTIVE
+        return PaceMode.TIMER
+
     def _handle_menu_action(self, action: str) -> bool:
         """メニューアクションを処理"""
         if action == "quit":
@@ -1314,7 +1192,6 @@ class Match3Game:
         if action == "start_game":
             time_limit = self.menu.get_selected_time()
             self.reset_game(time_limit)
-            self.initialize_grid()
             self.menu.set_state(MenuState.PLAYING)
             self.game_started = True
             self.logger.info(f"Starting new game with {time_limit}s time limit")
@@ -1336,7 +1213,7 @@ class Match3Game:
                 self.game_over = True
                 self.logger.info(f"Game over due to time limit - Final score: {self.score}")
                 # ゲームオーバー画面に移行
-                self.menu.set_game_over(self.score, self.time_limit)
+                self.menu.set_game_over(self.score, self.time_limit, record=self.record_highscore)
 
             # 時間の大幅な変化をログ
             if abs(old_time - self.time_left) > 1.0:
@@ -1345,10 +1222,10 @@ class Match3Game:
                 )
 
         # アニメーション更新
-        self._update_animations(dt)
+        with self.profiler.phase("animations"):
+            self._update_animations(dt)
 
-        # エフェクトの更新（ゲームオーバー後も継続）
-        self._update_particles(dt)
+        # スコアポップアップの更新（パーティクルは step_simulation で1ステップに1回だけ更新する）
         self._update_score_popups(dt)
 
         # 定期的なマッチチェック（フォールバック）
@@ -1395,6 +1272,10 @@ class Match3Game:
 
     def _start_cascade_processing(self):
         """連鎖処理を開始"""
+        # ここですぐに落下させるので、remove_matches が設定した落下待機は不要になる
+        self.is_waiting_for_drop = False
+        self.pending_drop = False
+
         # ブロックを落下させる
         if self.drop_blocks(animate=True):
             # 空いたスペースを埋める
@@ -1427,7 +1308,8 @@ class Match3Game:
         """強制マッチチェック（フォールバック機能）"""
         # アニメーション検出に失敗した場合の保険として、
         # 定期的にマッチをチェックして処理する
-        matches = self.find_matches()
+        # （変更記録の漏れも拾えるように、差分ではなく盤面全体を走査する）
+        matches = self.board.find_matches()
         if matches:
             self.logger.warning(f"Found {len(matches)} unprocessed matches - forcing processing")
             self.remove_matches(matches)
@@ -1445,7 +1327,8 @@ class Match3Game:
         # 2秒ごとにマッチチェックを実行（フォールバック）
         if self._last_match_check_time >= 2.0:
             self._last_match_check_time = 0
-            matches = self.find_matches()
+            # 変更記録の漏れも拾えるように盤面全体を走査する
+            matches = self.board.find_matches()
             if matches:
                 self.logger.warning(f"Periodic check found {len(matches)} unprocessed matches")
                 self.remove_matches(matches)
@@ -1461,15 +1344,15 @@ class Match3Game:
         try:
             old_count = len(self.score_popups)
             if old_count > 0:
-                self.logger.info(f"Updating {old_count} score popups with dt={dt:.3f}")
+                self.frame_logger.info("Updating %d score popups with dt=%.3f", old_count, dt)
 
             # 各ポップアップを更新し、生きているものだけを残す
             updated_popups = []
             for i, popup in enumerate(self.score_popups):
                 old_life = popup.life
                 still_alive = popup.update(dt)
-                self.logger.info(
-                    f"Popup {i}: life {old_life:.3f} -> {popup.life:.3f}, alive: {still_alive}"
+                self.frame_logger.info(
+                    "Popup %d: life %.3f -> %.3f, alive: %s", i, old_life, popup.life, still_alive
                 )
                 if still_alive:
                     updated_popups.append(popup)
@@ -1487,28 +1370,26 @@ class Match3Game:
         """パーティクルを更新"""
         try:
             old_particle_count = len(self.particles)
-            self.particles = [p for p in self.particles if p.update(dt)]
+            with self.profiler.phase("particles"):
+                self.particles.update(dt)
             if old_particle_count != len(self.particles) and old_particle_count > 0:
                 self.logger.debug(
                     f"Particles updated: {old_particle_count} -> {len(self.particles)}"
                 )
         except Exception as e:
             self.logger.warning(f"Error updating particles: {e}")
-            self.particles = []
+            self.particles.clear()
 
     def _draw_game(self):
         """ゲーム画面を描画"""
         try:
-            self.logger.info(
-                f"Drawing game, menu state: {self.menu.state}, game_over: {self.game_over}"
+            self.frame_logger.info(
+                "Drawing game, menu state: %s, game_over: %s", self.menu.state, self.game_over
             )
 
             if self.menu.state == MenuState.PLAYING:
-                self.logger.info("Drawing PLAYING screen")
-                # ゲーム画面を描画
-                self.screen.fill(UI_COLORS["BLACK"])
-
-                # 1. グリッドとブロックを描画
+                self.frame_logger.info("Drawing PLAYING screen")
+                # 1. 背景・グリッドとブロックを描画
                 self.draw_grid()
 
                 # 2. UIを描画
@@ -1516,15 +1397,14 @@ class Match3Game:
 
                 # ゲームオーバー表示
                 if self.game_over:
-                    self.logger.info("Game is over but still in PLAYING state")
+                    self.frame_logger.info("Game is over but still in PLAYING state")
                     # ゲームオーバー時でもUIを表示し続ける
                     # メニューシステムがゲームオーバー画面を処理
             elif self.menu.state == MenuState.GAME_OVER:
                 # ゲームオーバー画面でも基本UIを表示
-                self.logger.info("Drawing GAME_OVER screen with UI")
-                self.screen.fill(UI_COLORS["BLACK"])
+                self.frame_logger.info("Drawing GAME_OVER screen with UI")
 
-                # グリッドとブロックを薄く表示
+                # 背景・グリッドとブロックを薄く表示
                 self.draw_grid()
 
                 # UIを表示（時間は0:00で固定）
@@ -1533,13 +1413,220 @@ class Match3Game:
                 # メニューシステムがゲームオーバー画面を上に描画
                 self.menu.draw()
             else:
-                self.logger.info(f"Drawing menu screen for state: {self.menu.state}")
+                self.frame_logger.info("Drawing menu screen for state: %s", self.menu.state)
                 # メニュー画面を描画
                 self.menu.draw()
 
         except Exception as e:
             self.logger.error(f"Error in drawing: {e}", exc_info=True)
 
+    @traced()
+    def render_frame(self):
+        """1フレーム描画して画面に反映（差分描画モードでは変化した領域だけ更新）"""
+        if self.dirty_rect_rendering and self.menu.state != MenuState.PLAYING:
+            # メニュー画面は画面全体を覆うので、盤面は描画せずメニューの変化分だけ更新する
+            self.last_dirty_rects = self._present(self.menu.draw(full=not self._menu_on_screen))
+            self._menu_on_screen = True
+            self._drawn_elements = None
+            return
+
+        self._menu_on_screen = False
+        if self.dirty_rect_rendering and self.menu.state == MenuState.PLAYING:
+            if self._drawn_elements is not None and self._background_key == self._layout_key():
+                self.last_dirty_rects = self._present(self._draw_dirty_regions())
+                return
+
+            # 初回・レイアウト変更時は全体を描画し、要素の状態を記録する
+            self._draw_game()
+            self._present()
+            self._drawn_elements = {
+                key: (state, rect) for key, state, rect, _draw in self._collect_elements()
+            }
+            self.last_dirty_rects = [self.screen.get_rect()]
+            return
+
+        self._draw_game()
+        self._present()
+        self._drawn_elements = None
+        self.last_dirty_rects = [self.screen.get_rect()]
+
+    def _present(self, rects=None):
+        """
+        描画結果を画面に反映（rects が None なら画面全体）
+
+        プロファイラのオーバーレイは最後に重ねて描画し、差分描画ではその領域も更新する。
+
+        Returns:
+            list: 更新した領域（rects が None なら None）
+        """
+        if self.profiler_overlay is not None:
+            overlay_rect = self.profiler_overlay.draw(self.screen)
+            if rects is not None:
+                rects = [*rects, overlay_rect]
+
+        with self.profiler.phase("flip"), self.tracer.span("flip"):
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+        return rects
+
+    def toggle_profiler(self) -> bool:
+        """フレームプロファイラとオーバーレイの表示を切り替え、切り替え後の状態を返す"""
+        enabled = self.profiler.toggle()
+        if enabled:
+            self.profiler_overlay = ProfilerOverlay(
+                self.profiler, pygame.font.SysFont(PROFILER_FONT, 14)
+            )
+        else:
+            self.profiler_overlay = None
+            # オーバーレイを消すために次のフレームは全体を描画し直す
+            self._drawn_elements = None
+            self._menu_on_screen = False
+        self.logger.info(f"Frame profiler {'enabled' if enabled else 'disabled'}")
+        return enabled
+
+    def start_trace(self, path=None):
+        """処理区間のトレースの記録を開始（省略時は TRACE_DIR に日時のファイル名で保存）"""
+        if path is None:
+            path = TRACE_DIR / f"match3-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        self.tracer.start(path)
+        return self.tracer.path
+
+    def stop_trace(self):
+        """トレースの記録を終了し、書き出したファイルのパスを返す（記録中でなければ None）"""
+        return self.tracer.stop()
+
+    def toggle_trace(self) -> bool:
+        """トレースの記録を切り替え、切り替え後の状態を返す"""
+        if self.tracer.enabled:
+            self.stop_trace()
+        else:
+            self.start_trace()
+        return self.tracer.enabled
+
+    def _layout_key(self):
+        """背景キャッシュのキー（レイアウト定数の組）"""
+        return (self.screen.get_size(), GRID_SIZE, CELL_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y)
+
+    def _ui_state(self):
+        """UIパネルの表示内容（変化したときだけ再描画する）"""
+        display_time = max(0, self.time_left) if not self.game_over else 0
+        progress_ratio = self.time_left / self.time_limit if not self.game_over else 0
+        blink = int(time.time() * 2) % 2 if display_time <= 10 and not self.game_over else 0
+        return (
+            self.score,
+            int(display_time),
+            blink,
+            int(180 * progress_ratio),
+            progress_ratio > 0.5,
+            progress_ratio > 0.25,
+            self.game_over,
+            self.time_limit,
+            self.highscore_manager.get_best_score(self.time_limit),
+        )
+
+    def _collect_elements(self):
+        """
+        画面上の動的な要素を描画順に列挙
+
+        Returns:
+            list: (要素キー, 表示状態, 描画範囲, 描画関数) のリスト
+        """
+        elements = []
+        margin = CELL_SIZE // 2 + 8  # 選択・連鎖ハイライトのリングを含む半径
+
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                block = self.grid[row][col]
+                if block is None:
+                    continue
+                block_x, block_y = block.render_position(self.render_alpha)
+                center_x = int(GRID_OFFSET_X + block_x + CELL_SIZE // 2)
+                center_y = int(GRID_OFFSET_Y + block_y + CELL_SIZE // 2)
+                highlighted = self.is_highlighting and (row, col) in self.highlighted_matches
+                state = (
+                    block.type,
+                    center_x,
+                    center_y,
+                    quantize_alpha(block.alpha),
+                    self.selected_block == (row, col),
+                    self.match_highlight_timer if highlighted else None,
+                )
+                rect = pygame.Rect(center_x - margin, center_y - margin, margin * 2, margin * 2)
+                draw = partial(self._draw_block, row, col, block)
+                elements.append((("block", id(block)), state, rect, draw))
+
+        # パーティクルはまとめて1つの要素として扱う（更新のたびに version が変わる）
+        particle_rect = self.particles.bounds()
+        if particle_rect is not None:
+            draw = partial(self.particles.draw, self.screen, self.render_alpha)
+            state = (self.particles.version, self.render_alpha)
+            elements.append((("particles", 0), state, particle_rect, draw))
+
+        font_to_use = getattr(self, "score_font", self.small_font)
+        for popup in self.score_popups:
+            state = (popup.x, popup.y, popup.life)
+            draw = partial(popup.draw, self.screen, font_to_use)
+            elements.append((("popup", id(popup)), state, popup.get_rect(), draw))
+
+        # UIパネル（右上）と操作説明（左下）
+        panel = pygame.Rect(WINDOW_WIDTH - 210, 10, 210, 145)
+        help_area = pygame.Rect(10, WINDOW_HEIGHT - 65, 300, 55)
+        elements.append((("ui", "panel"), self._ui_state(), panel, self.draw_ui))
+        elements.append((("ui", "help"), None, help_area, self.draw_ui))
+        return elements
+
+    def _draw_dirty_regions(self):
+        """
+        前フレームから変化した要素の範囲だけを背景から描き直す
+
+        Returns:
+            list: 更新した画面上の矩形
+        """
+        elements = self._collect_elements()
+        previous = self._drawn_elements
+        dirty = []
+        seen = set()
+
+        for key, state, rect, _draw in elements:
+            seen.add(key)
+            drawn = previous.get(key)
+            if drawn is None:
+                dirty.append(rect)
+            elif drawn[0] != state:
+                dirty.append(drawn[1])
+                dirty.append(rect)
+        # 消えた要素の跡
+        dirty.extend(rect for key, (_state, rect) in previous.items() if key not in seen)
+
+        self._drawn_elements = {key: (state, rect) for key, state, rect, _draw in elements}
+        if not dirty:
+            return []
+
+        # 重なる矩形をまとめる
+        screen_rect = self.screen.get_rect()
+        merged = []
+        for rect in dirty:
+            rect = rect.clip(screen_rect)
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            if rect.width and rect.height:
+                merged.append(rect)
+
+        # 矩形ごとにクリップして、背景と重なる要素を描画順に描き直す
+        background = self.get_background()
+        for rect in merged:
+            self.screen.set_clip(rect)
+            self.screen.blit(background, rect, rect)
+            for _key, _state, element_rect, draw in elements:
+                if element_rect.colliderect(rect):
+                    draw()
+        self.screen.set_clip(None)
+        return merged
+
     def update_animations(self, dt):
         """アニメーションを更新"""
         any_animating = False
@@ -1577,6 +1664,34 @@ class Match3Game:
         # フォールバック: 強制マッチチェック（アニメーション検出失敗時の保険）
         self._force_match_check_if_needed()
 
+        # 盤面が落ち着いた時点で合法手がなければ再配置
+        self._resolve_deadlock_if_needed()
+
+    def _resolve_deadlock_if_needed(self):
+        """合法手がなくなった盤面のブロックを再配置（デッドロック対策）"""
+        # 連鎖処理の途中や空セルがある間は判定しない
+        if self.animating or getattr(self, "pending_cascade_check", False):
+            return False
+        if self.is_waiting_for_drop or self.is_highlighting:
+            return False
+        if any(block is None for line in self.grid for block in line):
+            return False
+        if self.board.has_moves():
+            return False
+
+        self.logger.warning("No legal moves left - reshuffling board")
+        if not self.board.reshuffle():
+            self.logger.error("Reshuffle failed, regenerating grid")
+            self.initialize_grid()
+            return True
+
+        # 新しい位置へ移動するアニメーションを開始
+        for line in self.grid:
+            for block in line:
+                block.start_animation(AnimationType.SWAP, block.grid_x, block.grid_y)
+        return True
+
+    @traced()
     def create_particles(self, x, y, colors, count=PARTICLE_COUNT):
         """パーティクルを生成（ログ対応版）"""
         try:
@@ -1592,15 +1707,7 @@ class Match3Game:
             else:
                 particle_color = (255, 255, 255)  # デフォルト色
 
-            created_count = 0
-            for _ in range(count):
-                try:
-                    particle = Particle(screen_x, screen_y, particle_color)
-                    self.particles.append(particle)
-                    created_count += 1
-                except Exception as e:
-                    self.logger.warning(f"Failed to create individual particle: {e}")
-
+            created_count = self.particles.emit(screen_x, screen_y, particle_color, count)
             self.logger.debug(f"Created {created_count}/{count} particles at ({x}, {y})")
 
         except Exception as e:
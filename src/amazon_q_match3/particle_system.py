@@ -0,0 +1,194 @@
+"""
+Amazon Q Match3 パーティクルシステム
+
+位置・速度・寿命・サイズ・回転を連続した NumPy 配列（構造体の配列ではなく配列の構造体）で保持し、
+生存中の全パーティクルを1回のベクトル演算で更新する。
+消滅したパーティクルは配列の先頭側に詰め直し、新しいリストは作らない。
+描画は StarAtlas の事前描画済みフレームを Surface.blits でまとめて転送する。
+"""
+
+import logging
+
+import numpy as np
+import pygame
+from sprite_cache import BRIGHTNESS_LEVELS, STAR_SYMMETRY, StarAtlas
+
+# 同時に存在できるパーティクル数の上限
+DEFAULT_CAPACITY = 2048
+
+# 物理パラメータ
+GRAVITY = 200.0
+FRICTION = 0.98
+
+
+class ParticleSystem:
+    """配列で管理する星形パーティクル"""
+
+    # 個々のパーティクルが持つ float 配列
+    FIELDS = (
+        "x",
+        "y",
+        "prev_x",
+        "prev_y",
+        "vx",
+        "vy",
+        "life",
+        "max_life",
+        "size",
+        "rotation",
+        "rotation_speed",
+    )
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, seed=None, atlas=None):
+        """
+        Args:
+            capacity: 同時に存在できるパーティクル数の上限（超えた分は生成しない）
+            seed: 初速度などの乱数シード
+            atlas: 描画に使う StarAtlas（省略時は新しく作成）
+        """
+        self.logger = logging.getLogger("ParticleSystem")
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.atlas = atlas if atlas is not None else StarAtlas()
+
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+        # 統計（上限のため生成できなかった数）と、変更のたびに増える版番号（差分描画用）
+        self.dropped = 0
+        self.version = 0
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x: float, y: float, color, count: int) -> int:
+        """
+        1点から count 個のパーティクルを放出
+
+        Returns:
+            int: 実際に生成した数（上限に達した分は生成しない）
+        """
+        created = min(count, self.capacity - self.count)
+        if created < count:
+            self.dropped += count - created
+        if created <= 0:
+            return 0
+
+        rng = self.rng
+        start, end = self.count, self.count + created
+        angle = rng.uniform(0, 2 * np.pi, created)
+        speed = rng.uniform(50, 150, created)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.prev_x[start:end] = x
+        self.prev_y[start:end] = y
+        self.vx[start:end] = np.cos(angle) * speed
+        self.vy[start:end] = np.sin(angle) * speed - rng.uniform(20, 60, created)  # 上向きの初速度
+        self.life[start:end] = rng.uniform(1.0, 2.0, created)
+        self.max_life[start:end] = self.life[start:end]
+        self.size[start:end] = rng.uniform(3, 8, created)
+        self.rotation[start:end] = 0.0
+        self.rotation_speed[start:end] = rng.uniform(-360, 360, created)
+        self.color[start:end] = color[:3]
+
+        self.count = end
+        self.version += 1
+        return created
+
+    def update(self, dt: float):
+        """全パーティクルを更新し、寿命が尽きたものを詰め直す"""
+        n = self.count
+        if n == 0:
+            return
+
+        # 描画の補間用に更新前の位置を記録
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+        vx, vy = self.vx[:n], self.vy[:n]
+        vx *= FRICTION
+        vy += GRAVITY * dt
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+        self.rotation[:n] += self.rotation_speed[:n] * dt
+        self.life[:n] -= dt
+
+        alive = self.life[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            remaining = len(keep)
+            for name in self.FIELDS:
+                values = getattr(self, name)
+                values[:remaining] = values[keep]
+            self.color[:remaining] = self.color[keep]
+            self.count = remaining
+        self.version += 1
+
+    def clear(self):
+        """全パーティクルを削除"""
+        if self.count:
+            self.count = 0
+            self.version += 1
+
+    def draw(self, screen, alpha: float = 1.0):
+        """
+        星形パーティクルを描画
+
+        サイズ・回転角・明るさを配列演算でアトラスのフレームに対応付け、
+        Surface.blits で1回にまとめて描画する。
+
+        Args:
+            alpha: 直前の更新前（0）と現在（1）の位置の補間の割合
+        """
+        n = self.count
+        if n == 0:
+            return
+        atlas = self.atlas
+        ratio = self.life[:n] / self.max_life[:n]
+        sizes = np.trunc(self.size[:n] * (0.5 + 0.5 * ratio)).astype(np.int32)
+        np.clip(sizes, 0, atlas.max_size, out=sizes)
+        steps = np.rint(
+            np.mod(self.rotation[:n], STAR_SYMMETRY) * (atlas.angle_steps / STAR_SYMMETRY)
+        )
+        steps = steps.astype(np.int32) % atlas.angle_steps
+        levels = np.rint(ratio * (BRIGHTNESS_LEVELS - 1)).astype(np.int32)
+        np.clip(levels, 0, BRIGHTNESS_LEVELS - 1, out=levels)
+        # int() と同じく0方向に切り捨てた中心から、フレームの左上を求める
+        xs, ys = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            xs = self.prev_x[:n] + (xs - self.prev_x[:n]) * alpha
+            ys = self.prev_y[:n] + (ys - self.prev_y[:n]) * alpha
+        lefts = np.trunc(xs).astype(np.int32) - sizes
+        tops = np.trunc(ys).astype(np.int32) - sizes
+
+        frames = atlas.frames
+        sequence = [
+            (frames(color, level)[size][step], (left, top))
+            for color, level, size, step, left, top in zip(
+                map(tuple, self.color[:n].tolist()),
+                levels.tolist(),
+                sizes.tolist(),
+                steps.tolist(),
+                lefts.tolist(),
+                tops.tolist(),
+                strict=True,
+            )
+        ]
+        screen.blits(sequence, doreturn=False)
+
+    def bounds(self):
+        """全パーティクルを含む矩形（補間した位置も含む。パーティクルがなければ None）"""
+        n = self.count
+        if n == 0:
+            return None
+        reach = self.size[:n] + 2
+        xs = (self.x[:n], self.prev_x[:n])
+        ys = (self.y[:n], self.prev_y[:n])
+        left = int(np.floor(min((x - reach).min() for x in xs)))
+        top = int(np.floor(min((y - reach).min() for y in ys)))
+        right = int(np.ceil(max((x + reach).max() for x in xs)))
+        bottom = int(np.ceil(max((y + reach).max() for y in ys)))
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
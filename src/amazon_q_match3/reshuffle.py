@@ -0,0 +1,176 @@
+"""
+Amazon Q Match3 盤面の再配置
+
+合法手がなくなった盤面のブロックを並べ替え、
+「マッチがなく、少なくとも1つ合法手がある」配置を有限時間で作る。
+ランダムなシャッフルを繰り返す代わりに、制約を満たす色を選びながら1セルずつ配置する。
+
+1. 最も多い色 X で「X X _ X」の並びを先に置く（右端の X を左に交換すると3連になる）
+2. 残りのセルを行優先で埋める。各セルでは3連にならない色から残り個数に比例して選ぶ
+   （残りの色をランダムな順に並べた袋の末尾から、置ける最初の色を取り出す）
+3. 置ける色が残っていない場合は、配置済みのセルと色を入れ替えて修復する
+"""
+
+import random
+from collections import Counter
+
+from numpy.random import default_rng
+
+# 未配置セルを表すコード
+UNPLACED = -1
+
+# 修復時に探索する配置済みセルの最大数
+MAX_REPAIR_SCAN = 4096
+
+
+def _forms_run(codes: list[int], size: int, index: int) -> bool:
+    """セル index の色が縦横いずれかで3つ以上並ぶか（未配置セルは空として扱う）"""
+    color = codes[index]
+    row, col = divmod(index, size)
+
+    # 横方向（各方向2つまで数えれば十分）
+    count = 1
+    if col >= 1 and codes[index - 1] == color:
+        count += 1
+        if col >= 2 and codes[index - 2] == color:
+            count += 1
+    if col + 1 < size and codes[index + 1] == color:
+        count += 1
+        if col + 2 < size and codes[index + 2] == color:
+            count += 1
+    if count >= 3:
+        return True
+
+    # 縦方向
+    count = 1
+    if row >= 1 and codes[index - size] == color:
+        count += 1
+        if row >= 2 and codes[index - 2 * size] == color:
+            count += 1
+    if row + 1 < size and codes[index + size] == color:
+        count += 1
+        if row + 2 < size and codes[index + 2 * size] == color:
+            count += 1
+    return count >= 3
+
+
+def _plant_move(codes: list[int], size: int, counts: dict[int, int], rng) -> set[int] | None:
+    """「X X _ X」の並びを置き、使用したセルを返す（置けない場合は None）"""
+    color = max(counts, key=counts.get)
+    if size < 4 or counts[color] < 3:
+        return None
+
+    row = rng.randrange(size)
+    col = rng.randrange(size - 3)
+    start = row * size + col
+    planted = {start, start + 1, start + 3}
+    for index in planted:
+        codes[index] = color
+    counts[color] -= 3
+    return planted
+
+
+def _repair(codes: list[int], size: int, index: int, color: int, fixed: set[int], rng) -> bool:
+    """配置済みセルと色を入れ替えて、セル index に置ける状態にする"""
+    placed = index
+    if placed == 0:
+        return False
+    offset = rng.randrange(placed)
+    for step in range(min(placed, MAX_REPAIR_SCAN)):
+        other = (offset + step) % placed
+        other_color = codes[other]
+        if other in fixed or other_color in (color, UNPLACED):
+            continue
+        codes[index] = other_color
+        codes[other] = color
+        if not _forms_run(codes, size, index) and not _forms_run(codes, size, other):
+            return True
+        codes[other] = other_color
+    codes[index] = UNPLACED
+    return False
+
+
+def plan_reshuffle(codes: list[int], size: int, rng=random) -> list[int] | None:
+    """
+    色の個数を保ったまま、マッチがなく合法手が1つ以上ある配置を作る
+
+    残りのブロックの色をランダムな順に並べた袋を作り、各セルでは袋の末尾から
+    3連にならない最初の色を取り出す（残り個数に比例した確率で色を選ぶのと同じ分布になる）。
+    1セルあたりの処理は左・上の近傍と袋の末尾を見るだけなので、盤面サイズに対して線形時間で終わる。
+
+    Args:
+        codes: 行優先で並べた現在の色コード（長さ size * size、空セルなし）
+        size: グリッドの一辺のセル数
+        rng: random / randrange を持つ乱数生成器
+
+    Returns:
+        list: 新しい配置の色コード（条件を満たせない色の組み合わせなら None）
+    """
+    counts = Counter(codes)
+
+    result = [UNPLACED] * (size * size)
+    fixed = _plant_move(result, size, counts, rng)
+    if fixed is None:
+        return None
+
+    # 残りのブロックの色をランダムな順に並べた袋（末尾から取り出す）
+    # 並べ替えは NumPy で一度に行い、シードは rng から引くので同じ rng なら同じ配置になる
+    # （numpy.random はモジュールの読み込み時に import しておき、初回の再配置で待たせない）
+    bag = [code for code in sorted(counts) for _ in range(counts[code])]
+    bag = default_rng(rng.randrange(2**63)).permutation(bag).tolist()
+
+    # 「X X _ X」の行とその上の行だけは、右・下にも配置済みのセルがある
+    planted_row = min(fixed) // size
+    index = -1
+    for row in range(size):
+        near_planted = planted_row - 1 <= row <= planted_row
+        for col in range(size):
+            index += 1
+            if result[index] != UNPLACED:
+                continue
+
+            # 3連になる色をビットマスクで求める（左右・上下の配置済みセルから直接判定）
+            forbidden = 0
+            if not near_planted:
+                # 行優先で埋めるので、配置済みなのは左と上だけ
+                if col >= 2:
+                    left = result[index - 1]
+                    if left == result[index - 2]:
+                        forbidden = 1 << left
+                if row >= 2:
+                    up = result[index - size]
+                    if up == result[index - 2 * size]:
+                        forbidden |= 1 << up
+            else:
+                left = result[index - 1] if col >= 1 else UNPLACED
+                right = result[index + 1] if col + 1 < size else UNPLACED
+                if left != UNPLACED and ((col >= 2 and result[index - 2] == left) or right == left):
+                    forbidden |= 1 << left
+                if right != UNPLACED and col + 2 < size and result[index + 2] == right:
+                    forbidden |= 1 << right
+                up = result[index - size] if row >= 1 else UNPLACED
+                down = result[index + size] if row + 1 < size else UNPLACED
+                if up != UNPLACED and ((row >= 2 and result[index - 2 * size] == up) or down == up):
+                    forbidden |= 1 << up
+                if down != UNPLACED and row + 2 < size and result[index + 2 * size] == down:
+                    forbidden |= 1 << down
+
+            # 袋の末尾から、3連にならない最初の色を取り出す
+            # （ランダムな順の袋から取るので、残り個数に比例した確率で色を選ぶのと同じ）
+            if not forbidden >> bag[-1] & 1:
+                result[index] = bag.pop()
+                continue
+            pos = len(bag) - 2
+            while pos >= 0 and forbidden >> bag[pos] & 1:
+                pos -= 1
+            if pos >= 0:
+                result[index] = bag.pop(pos)
+                continue
+
+            # 置ける色が残っていない場合は、残りの多い色を配置済みセルと入れ替えて修復
+            color = max(set(bag), key=bag.count)
+            if not _repair(result, size, index, color, fixed, rng):
+                return None
+            bag.remove(color)
+
+    return result
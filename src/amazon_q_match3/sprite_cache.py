@@ -0,0 +1,193 @@
+"""
+Amazon Q Match3 ブロックスプライトキャッシュ
+
+ブロックの本体・内側のハイライト・光沢を、ブロックタイプと量子化した透明度ごとに
+一度だけ描画しておき、毎フレームのブロック描画を1回の blit にする。
+セルサイズが変わった場合はキャッシュを作り直す。
+パーティクルの星形も回転角・サイズ・明るさごとに事前描画しておく（StarAtlas）。
+"""
+
+import logging
+import math
+
+import pygame
+
+# 透明度の量子化段階数（0〜255 をこの段階数に丸める）
+ALPHA_LEVELS = 16
+
+# 不透明時の光沢の透明度
+GLOSS_ALPHA = 80
+
+# 星形の最大半径と頂点数（外側・内側を交互に8点）
+STAR_MAX_SIZE = 8
+STAR_POINTS = 8
+
+# 星は90度回すと同じ形になるので、0〜90度をこの段階数に分割して描画する
+STAR_SYMMETRY = 90
+STAR_ANGLE_STEPS = 16
+
+# フェードアウト時の明るさの段階数
+BRIGHTNESS_LEVELS = 16
+
+
+def quantize_alpha(alpha: int) -> int:
+    """透明度を ALPHA_LEVELS 段階に丸める（0 と 255 はそのまま）"""
+    step = 255 / (ALPHA_LEVELS - 1)
+    alpha = max(0, min(255, alpha))
+    return round(round(alpha / step) * step)
+
+
+def _blend_circle(surface, color, alpha, center, radius):
+    """半透明の円を surface にアルファブレンドで重ねる"""
+    if radius <= 0 or alpha <= 0:
+        return
+    layer = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(layer, (*color, alpha), (radius, radius), radius)
+    surface.blit(layer, (int(center[0] - radius), int(center[1] - radius)))
+
+
+class BlockSpriteCache:
+    """ブロックタイプ × 量子化透明度ごとの事前描画済みスプライト"""
+
+    def __init__(self, palette):
+        """
+        Args:
+            palette: BlockType → [メイン色, 影色] の辞書
+        """
+        self.logger = logging.getLogger("SpriteCache")
+        self.palette = palette
+        self.cell_size = None
+        self._sprites = {}
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    @staticmethod
+    def radius_for(cell_size: int) -> int:
+        """セルサイズからブロックの半径を計算"""
+        return cell_size // 2 - 4
+
+    def clear(self):
+        """キャッシュを破棄"""
+        self._sprites.clear()
+
+    def _render(self, block_type, alpha: int, radius: int):
+        """本体・ハイライト・光沢を重ねたスプライトを描画"""
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        main_color = self.palette[block_type][0]
+        opaque = alpha >= 255
+        center = (radius, radius)
+
+        # メインの円
+        _blend_circle(sprite, main_color, alpha, center, radius)
+
+        # 内側のハイライト
+        highlight_color = tuple(min(255, c + 50) for c in main_color)
+        _blend_circle(
+            sprite, highlight_color, 255 if opaque else alpha // 2, center, int(radius * 0.7)
+        )
+
+        # 光沢効果（左上にずらす）
+        gloss_center = (radius - radius * 0.3, radius - radius * 0.3)
+        gloss_alpha = GLOSS_ALPHA if opaque else alpha // 3
+        _blend_circle(sprite, (255, 255, 255), gloss_alpha, gloss_center, int(radius * 0.3))
+
+        # 画面と同じピクセル形式に変換（ディスプレイ未初期化時はそのまま）
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite
+
+    def get(self, block_type, alpha: int, cell_size: int):
+        """スプライトを取得（未作成なら描画してキャッシュ）"""
+        if cell_size != self.cell_size:
+            if self._sprites:
+                self.logger.info(f"Cell size changed to {cell_size}, clearing sprite cache")
+            self._sprites.clear()
+            self.cell_size = cell_size
+
+        key = (block_type, quantize_alpha(alpha))
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self._render(block_type, key[1], self.radius_for(cell_size))
+            self._sprites[key] = sprite
+        else:
+            self.hits += 1
+        return sprite
+
+    def draw(self, screen, block_type, alpha: int, cell_size: int, center):
+        """スプライトの中心が center に来るように描画"""
+        sprite = self.get(block_type, alpha, cell_size)
+        radius = sprite.get_width() // 2
+        screen.blit(sprite, (int(center[0] - radius), int(center[1] - radius)))
+
+
+class StarAtlas:
+    """回転角 × サイズ × 色・明るさごとに事前描画した星形スプライト"""
+
+    def __init__(self, max_size: int = STAR_MAX_SIZE, angle_steps: int = STAR_ANGLE_STEPS):
+        """
+        Args:
+            max_size: 描画できる最大半径（これより大きいサイズは max_size で描く）
+            angle_steps: 0〜90度の回転を分割する段階数
+        """
+        self.logger = logging.getLogger("StarAtlas")
+        self.max_size = max_size
+        self.angle_steps = angle_steps
+
+        # 白い星形のマスク [サイズ][回転段階]（色ごとのフレームはここから着色して作る）
+        self._masks = [
+            [self._render_mask(size, step) for step in range(angle_steps)]
+            for size in range(max_size + 1)
+        ]
+        self._frames = {}
+
+    def __len__(self):
+        return len(self._frames)
+
+    def _render_mask(self, size: int, step: int):
+        """中心 (size, size) に白い星形を描いたサーフェスを作る"""
+        surface = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+        if size <= 0:
+            return surface
+        base = math.radians(step * STAR_SYMMETRY / self.angle_steps)
+        points = []
+        for i in range(STAR_POINTS):
+            radius = size if i % 2 == 0 else size * 0.5
+            angle = base + i * math.pi / 4
+            points.append((size + math.cos(angle) * radius, size + math.sin(angle) * radius))
+        pygame.draw.polygon(surface, (255, 255, 255), points)
+        return surface
+
+    def frames(self, color, level: int):
+        """
+        色と明るさの段階に対応するフレーム表 [サイズ][回転段階] を取得
+
+        Args:
+            color: (r, g, b) の基本色
+            level: 明るさの段階（0 で黒、BRIGHTNESS_LEVELS - 1 で基本色そのもの）
+        """
+        key = (tuple(color), level)
+        frames = self._frames.get(key)
+        if frames is None:
+            scale = level / (BRIGHTNESS_LEVELS - 1)
+            tint = (*(int(c * scale) for c in key[0]), 255)
+            convert = pygame.display.get_surface() is not None
+            frames = []
+            for masks in self._masks:
+                row = []
+                for mask in masks:
+                    frame = mask.copy()
+                    frame.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+                    row.append(frame.convert_alpha() if convert else frame)
+                frames.append(row)
+            self._frames[key] = frames
+        return frames
+
+    def angle_step(self, degrees: float) -> int:
+        """回転角（度）を最も近い回転段階に変換"""
+        return round(degrees % STAR_SYMMETRY * self.angle_steps / STAR_SYMMETRY) % self.angle_steps
@@ -0,0 +1,120 @@
+"""
+Amazon Q Match3 テキスト描画キャッシュ
+
+font.render の結果を (フォント, テキスト, 色, アンチエイリアス) ごとにキャッシュする。
+ScorePopup・draw_ui・GameMenu で共有し、使用メモリが上限を超えたら
+最も長く使われていないものから破棄する（LRU）。
+フェードは透明度を段階に丸め、段階ごとのコピーもキャッシュする（再描画も毎フレームのコピーもしない）。
+"""
+
+import logging
+from collections import OrderedDict
+
+import pygame
+from sprite_cache import quantize_alpha
+
+# キャッシュするサーフェスの合計サイズの上限（バイト）
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+
+class TextCache:
+    """描画済みテキストサーフェスの LRU キャッシュ"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: キャッシュするサーフェスの合計サイズの上限（バイト）
+        """
+        self.logger = logging.getLogger("TextCache")
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._surfaces = OrderedDict()
+        self._fonts = {}
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+        self.fades = 0  # 透明度の段階ごとのコピーを作成した回数
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def get_font(self, name, size: int):
+        """pygame.font.Font(name, size) を一度だけ作成して使い回す"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, font, text: str, color, alpha: int = 255, antialias: bool = True):
+        """
+        テキストを描画したサーフェスを取得（キャッシュにあれば再利用）
+
+        返すサーフェスは共有されるので、呼び出し側で変更しないこと。
+        フェード中（alpha < 255）は alpha を ALPHA_LEVELS 段階に丸め、段階ごとに
+        不透明なサーフェスのコピーに透明度を設定したものを同じ LRU にキャッシュする。
+        不透明なサーフェス（HUD などが保持している）の透明度は変えない。
+
+        Args:
+            font: pygame のフォント
+            text: 描画するテキスト
+            color: 文字色（RGB）
+            alpha: サーフェス全体の透明度（フェード用）
+            antialias: アンチエイリアスの有無
+        """
+        key = (font, text, tuple(color[:3]), antialias)
+        surface = self._get(key)
+        if surface is None:
+            self.misses += 1
+            surface = font.render(text, antialias, key[2])
+            self._put(key, surface)
+
+        level = quantize_alpha(alpha)
+        if level >= 255:
+            return surface
+        faded_key = (*key, level)
+        faded = self._get(faded_key)
+        if faded is None:
+            self.fades += 1
+            faded = surface.copy()
+            faded.set_alpha(level)
+            self._put(faded_key, faded)
+        return faded
+
+    def _get(self, key):
+        """キャッシュから取得し、最近使ったものにする（なければ None）"""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def _put(self, key, surface):
+        """キャッシュに追加し、上限を超えた分を破棄"""
+        self._surfaces[key] = surface
+        self.bytes_used += self._size_of(surface)
+        self._evict()
+
+    def clear(self):
+        """キャッシュを破棄（フォントは保持）"""
+        self._surfaces.clear()
+        self.bytes_used = 0
+
+    @staticmethod
+    def _size_of(surface) -> int:
+        """サーフェスのピクセルデータのバイト数"""
+        return int(surface.get_width()) * int(surface.get_height()) * int(surface.get_bytesize())
+
+    def _evict(self):
+        """上限を超えた分を古いものから破棄（最後に追加したものは残す）"""
+        while self.bytes_used > self.max_bytes and len(self._surfaces) > 1:
+            _key, surface = self._surfaces.popitem(last=False)
+            self.bytes_used -= self._size_of(surface)
+            self.evictions += 1
+
+
+# ゲーム全体で共有するキャッシュ
+shared_cache = TextCache()
@@ -0,0 +1,212 @@
+"""
+Amazon Q Match3 トレースイベント出力
+
+ゲームループの処理（マッチ検出・削除・落下・補充・描画など）の区間を記録し、
+Chrome のトレースイベント形式（JSON Array Format）のファイルに書き出す。
+chrome://tracing や Perfetto で開くと、区間の入れ子と時刻を確認できる。
+
+区間はゲームスレッドではリストに追加するだけで、一定件数・一定時間ごとにまとめて
+書き込みスレッドに渡し、JSON への変換とファイルへの書き込みはそちらで行う。
+無効な間は span() が共有の何もしないコンテキストを返すだけなので、コストはほぼかからない。
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+# 書き込みスレッドに渡すまでに溜める区間の数
+DEFAULT_FLUSH_EVENTS = 4096
+
+# 書き込みスレッドに渡す間隔（秒）
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# トレースファイルの書き込みバッファのサイズ（バイト）
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# トレースビューアに表示するプロセス名
+PROCESS_NAME = "Amazon Q Match3"
+
+# 無効時に返す何もしないコンテキスト
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    """1つの区間の開始・終了時刻を記録するコンテキスト"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name: str, args: dict | None):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer._record(self.name, self.start, time.perf_counter_ns(), self.args)
+
+
+class Tracer:
+    """区間を記録して Chrome のトレースイベント形式で書き出す"""
+
+    _SENTINEL = object()
+
+    def __init__(
+        self,
+        flush_events: int = DEFAULT_FLUSH_EVENTS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        category: str = "game",
+    ):
+        """
+        Args:
+            flush_events: 書き込みスレッドに渡すまでに溜める区間の数
+            flush_interval: 書き込みスレッドに渡す間隔（秒）
+            category: イベントのカテゴリ
+        """
+        self.logger = logging.getLogger("Tracer")
+        self.enabled = False
+        self.flush_events = flush_events
+        self.flush_interval_ns = int(flush_interval * 1e9)
+        self.category = category
+        self.path = None
+
+        self._buffer = []
+        self._queue = queue.Queue()
+        self._thread = None
+        self._origin = 0
+        self._last_flush = 0
+        self._pid = os.getpid()
+        self._tid = 0
+
+        # 統計
+        self.events = 0
+        self.batches = 0
+
+    def start(self, path):
+        """トレースファイルへの記録を開始（記録中なら何もしない）"""
+        if self.enabled:
+            return
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.events = 0
+        self.batches = 0
+        self._buffer = []
+        self._queue = queue.Queue()
+        # 区間を記録するスレッド（開始したスレッド）をトレース上のスレッドとして扱う
+        self._tid = threading.get_native_id()
+        self._origin = time.perf_counter_ns()
+        self._last_flush = self._origin
+        self._thread = threading.Thread(
+            target=self._run, args=(self.path, self._queue), name="TraceWriter", daemon=True
+        )
+        self._thread.start()
+        self.enabled = True
+        self.logger.info(f"Tracing to {self.path}")
+
+    def stop(self, timeout: float | None = 10.0):
+        """記録を終了し、残りの区間を書き込んでファイルを閉じる。トレースファイルのパスを返す"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        self._flush()
+        self._queue.put(self._SENTINEL)
+        self._thread.join(timeout)
+        self._thread = None
+        self.logger.info(f"Trace written: {self.events} events in {self.batches} batches")
+        return self.path
+
+    def span(self, name: str, **args):
+        """区間を記録するコンテキストを返す（無効時は何もしない）"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def _record(self, name, start, end, args):
+        if not self.enabled:
+            return
+        self._buffer.append((name, start, end, args))
+        if (
+            len(self._buffer) >= self.flush_events
+            or end - self._last_flush >= self.flush_interval_ns
+        ):
+            self._last_flush = end
+            self._flush()
+
+    def _flush(self):
+        """溜めた区間を書き込みスレッドに渡す"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self.events += len(batch)
+        self.batches += 1
+        self._queue.put(batch)
+
+    def _metadata_events(self) -> list[dict]:
+        """プロセス名・スレッド名のメタデータ"""
+        return [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": PROCESS_NAME}},
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": self._tid,
+                "args": {"name": "Game loop"},
+            },
+        ]
+
+    def _to_event(self, name, start, end, args) -> dict:
+        """区間を完了イベント（ph: "X"、時刻はマイクロ秒）に変換"""
+        event = {
+            "name": name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self._pid,
+            "tid": self._tid,
+        }
+        if args:
+            event["args"] = args
+        return event
+
+    def _run(self, path, batches):
+        """書き込みスレッド: 受け取った区間を JSON に変換してファイルに追記"""
+        with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write("[\n")
+            f.write(",\n".join(json.dumps(event) for event in self._metadata_events()))
+            while True:
+                batch = batches.get()
+                if batch is self._SENTINEL:
+                    break
+                f.write(",\n")
+                f.write(",\n".join(json.dumps(self._to_event(*span)) for span in batch))
+                f.flush()
+            f.write("\n]\n")
+
+
+def traced(name: str | None = None):
+    """メソッド全体を self.tracer の区間として記録するデコレータ"""
+
+    def decorator(method):
+        span_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+            with tracer.span(span_name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
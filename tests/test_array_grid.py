@@ -0,0 +1,97 @@
+"""
+配列グリッドとベクトル化マッチ検出のテスト
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from array_grid import (  # noqa: E402
+    EMPTY,
+    array_to_types,
+    find_matches,
+    gravity,
+    grid_to_array,
+    match_mask,
+)
+from board_engine import BLOCK_TYPES, Board, Tile  # noqa: E402
+
+
+def random_board(size, colors=3, empty_rate=0.1):
+    """色数を絞ってマッチが起きやすいランダム盤面を作成"""
+    board = Board(size)
+    for row in range(size):
+        for col in range(size):
+            if random.random() >= empty_rate:
+                board.grid[row][col] = Tile(random.choice(BLOCK_TYPES[:colors]), col, row)
+    return board
+
+
+class TestArrayGrid(unittest.TestCase):
+    """配列グリッドのテスト"""
+
+    def test_grid_to_array_roundtrip(self):
+        """変換でタイプと空セルが保持されること"""
+        board = random_board(8)
+        codes = grid_to_array(board.grid)
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(codes.shape, (8, 8))
+        expected = [[cell.type if cell else None for cell in line] for line in board.grid]
+        self.assertEqual(array_to_types(codes), expected)
+
+    def test_find_matches_equals_board(self):
+        """Board.find_matches と同じ位置集合を返すこと"""
+        random.seed(1234)
+        for size in (3, 8, 13):
+            for _ in range(50):
+                board = random_board(size)
+                self.assertEqual(find_matches(grid_to_array(board.grid)), board.find_matches())
+
+    def test_empty_cells_never_match(self):
+        """空セルの並びはマッチしないこと"""
+        codes = np.full((8, 8), EMPTY, dtype=np.int8)
+        self.assertEqual(find_matches(codes), set())
+
+    def test_match_mask_batched(self):
+        """3次元配列（複数盤面）でも盤面ごとに検出できること"""
+        boards = [random_board(8) for _ in range(4)]
+        batch = np.stack([grid_to_array(board.grid) for board in boards])
+        mask = match_mask(batch)
+        for i, board in enumerate(boards):
+            positions = {(r, c) for r, c in np.argwhere(mask[i]).tolist()}
+            self.assertEqual(positions, board.find_matches())
+
+    def test_gravity_equals_drop_blocks(self):
+        """列の詰め直しと落下距離が Board.drop_blocks と一致すること"""
+        random.seed(99)
+        for size in (4, 8, 11):
+            board = random_board(size, empty_rate=0.3)
+            compacted, fall = gravity(grid_to_array(board.grid))
+            moves = board.drop_blocks()
+            self.assertEqual(array_to_types(compacted), array_to_types(grid_to_array(board.grid)))
+
+            expected = np.zeros((size, size), dtype=np.int16)
+            for _block, from_row, to_row, col in moves:
+                expected[to_row, col] = to_row - from_row
+            np.testing.assert_array_equal(fall, expected)
+
+    def test_gravity_batched(self):
+        """複数盤面をまとめて詰め直せること"""
+        column = np.array([[1], [EMPTY], [2], [EMPTY]], dtype=np.int8)
+        batch = np.stack([column, column[::-1]])
+        compacted, fall = gravity(batch)
+        self.assertEqual(compacted[0].ravel().tolist(), [EMPTY, EMPTY, 1, 2])
+        self.assertEqual(fall[0].ravel().tolist(), [0, 0, 2, 1])
+        self.assertEqual(compacted[1].ravel().tolist(), [EMPTY, EMPTY, 2, 1])
+        self.assertEqual(fall[1].ravel().tolist(), [0, 0, 1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
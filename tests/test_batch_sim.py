@@ -0,0 +1,88 @@
+"""
+バッチ連鎖シミュレータのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from array_grid import EMPTY, array_to_types, find_matches, match_mask  # noqa: E402
+from batch_sim import (  # noqa: E402
+    compact_columns,
+    random_boards,
+    score_for_counts,
+    simulate_cascades,
+)
+from board_engine import Board, Tile, calculate_score  # noqa: E402
+
+
+def board_from_codes(codes):
+    """タイプコード配列から Board を作成"""
+    board = Board(codes.shape[0])
+    for row, line in enumerate(array_to_types(codes)):
+        for col, block_type in enumerate(line):
+            if block_type is not None:
+                board.grid[row][col] = Tile(block_type, col, row)
+    return board
+
+
+class TestBatchSim(unittest.TestCase):
+    """バッチシミュレータのテスト"""
+
+    def test_score_for_counts(self):
+        """スコア計算が calculate_score と一致すること"""
+        counts = np.arange(12)
+        expected = [calculate_score(n) if n else 0 for n in range(12)]
+        self.assertEqual(score_for_counts(counts).tolist(), expected)
+
+    def test_compact_columns_equals_drop_blocks(self):
+        """列の詰め直しが Board.drop_blocks と一致すること"""
+        rng = np.random.default_rng(0)
+        boards = random_boards(20, seed=1)
+        boards[rng.random(boards.shape) < 0.3] = EMPTY
+        compacted = compact_columns(boards)
+        for i in range(len(boards)):
+            board = board_from_codes(boards[i])
+            board.drop_blocks()
+            expected = [[cell.type if cell else None for cell in line] for line in board.grid]
+            self.assertEqual(array_to_types(compacted[i]), expected)
+
+    def test_first_iteration_matches_board(self):
+        """1回目の連鎖のスコアが Board と一致すること"""
+        boards = random_boards(50, seed=3)
+        scores, depths, _ = simulate_cascades(boards, seed=4, max_iterations=1)
+        for i in range(len(boards)):
+            matches = find_matches(boards[i])
+            expected = calculate_score(len(matches)) if matches else 0
+            self.assertEqual(scores[i], expected)
+            self.assertEqual(depths[i], 1 if matches else 0)
+
+    def test_final_boards_are_settled(self):
+        """最大連鎖数に達していない盤面は空セルもマッチもないこと"""
+        boards = random_boards(500, seed=5)
+        scores, depths, final = simulate_cascades(boards, seed=6)
+        self.assertEqual(final.shape, boards.shape)
+        self.assertFalse((final == EMPTY).any())
+        settled = depths < 10
+        self.assertFalse(match_mask(final[settled]).any())
+        self.assertTrue((scores[depths == 0] == 0).all())
+
+    def test_seed_is_reproducible(self):
+        """同じシードなら同じ結果になり、入力は変更されないこと"""
+        boards = random_boards(100, seed=7)
+        original = boards.copy()
+        first = simulate_cascades(boards, seed=8)
+        second = simulate_cascades(boards, seed=8)
+        for a, b in zip(first, second, strict=True):
+            np.testing.assert_array_equal(a, b)
+        np.testing.assert_array_equal(boards, original)
+
+
+if __name__ == "__main__":
+    unittest.main()
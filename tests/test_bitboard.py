@@ -0,0 +1,114 @@
+"""
+ビットボードエンジンのテスト
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from bitboard import BitBoard  # noqa: E402
+from board_engine import BLOCK_TYPES, Board, Tile, create_board  # noqa: E402
+
+
+def random_board(size=8, colors=4, empty_rate=0.0):
+    """色数を絞ってマッチが起きやすいランダム盤面を作成"""
+    board = Board(size)
+    for row in range(size):
+        for col in range(size):
+            if random.random() >= empty_rate:
+                board.grid[row][col] = Tile(random.choice(BLOCK_TYPES[:colors]), col, row)
+    return board
+
+
+def types_of(board):
+    """Board のグリッドを BlockType のグリッドに変換"""
+    return [[cell.type if cell else None for cell in line] for line in board.grid]
+
+
+class TestBitBoard(unittest.TestCase):
+    """ビットボードのテスト"""
+
+    def setUp(self):
+        random.seed(2024)
+
+    def test_create_board_backend(self):
+        """バックエンドを選択して盤面を作成できること"""
+        self.assertIsInstance(create_board("list"), Board)
+        self.assertIsInstance(create_board("bitboard"), BitBoard)
+        with self.assertRaises(ValueError):
+            create_board("unknown")
+        with self.assertRaises(TypeError):
+            create_board("bitboard", block_factory=Tile)
+
+    def test_roundtrip(self):
+        """グリッドとの相互変換でタイプが保持されること"""
+        board = random_board(empty_rate=0.2)
+        self.assertEqual(BitBoard.from_grid(board.grid).to_types(), types_of(board))
+
+    def test_find_matches_equals_board(self):
+        """Board.find_matches と同じ結果になること"""
+        for size in (5, 8, 11):
+            for _ in range(50):
+                board = random_board(size, empty_rate=0.1)
+                bits = BitBoard.from_grid(board.grid)
+                self.assertEqual(bits.find_matches(), board.find_matches())
+
+    def test_drop_blocks_equals_board(self):
+        """列ごとの落下結果が Board.drop_blocks と一致すること"""
+        for _ in range(50):
+            board = random_board(empty_rate=0.3)
+            bits = BitBoard.from_grid(board.grid)
+            self.assertEqual(bits.drop_blocks(), bool(board.drop_blocks()))
+            self.assertEqual(bits.to_types(), types_of(board))
+
+    def test_remove_and_fill(self):
+        """削除でスコアが加算され、補充で盤面が埋まること"""
+        board = random_board()
+        bits = BitBoard.from_grid(board.grid)
+        matches = bits.find_matches()
+        bits.remove_matches(matches)
+        self.assertTrue(all(bits.get_type(row, col) is None for row, col in matches))
+        self.assertEqual(bits.fill_empty_spaces(), len(matches))
+        self.assertEqual(bits.occupied, bits.full_mask)
+
+    def test_legal_moves_equals_brute_force(self):
+        """合法手が総当たり（交換してマッチ判定）と一致すること"""
+        for _ in range(30):
+            # マッチのない盤面で比較する
+            board = Board()
+            board.initialize_grid()
+            bits = BitBoard.from_grid(board.grid)
+            expected = []
+            for row in range(8):
+                for col in range(8):
+                    for pos2 in ((row, col + 1), (row + 1, col)):
+                        if pos2[0] < 8 and pos2[1] < 8:
+                            # グリッドを直接入れ替えてマッチを判定する
+                            grid = board.grid
+                            cell1, cell2 = grid[row][col], grid[pos2[0]][pos2[1]]
+                            grid[row][col], grid[pos2[0]][pos2[1]] = cell2, cell1
+                            if board.find_matches():
+                                expected.append(((row, col), pos2))
+                            grid[row][col], grid[pos2[0]][pos2[1]] = cell1, cell2
+            self.assertEqual(sorted(bits.legal_moves()), sorted(expected))
+            self.assertEqual(bits.has_moves(), bool(expected))
+
+    def test_resolve_cascades(self):
+        """連鎖処理後にマッチが残らず盤面が埋まっていること"""
+        bits = create_board("bitboard")
+        bits.initialize_grid()
+        self.assertEqual(bits.find_matches(), set())
+        if bits.has_moves():
+            bits.swap_blocks(*bits.legal_moves()[0])
+        score, depth = bits.resolve_cascades()
+        self.assertEqual(bits.score, score)
+        self.assertEqual(bits.occupied, bits.full_mask)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+ブロック乱数ストリームのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from block_stream import BlockStream  # noqa: E402
+from board_engine import BLOCK_TYPES, Board  # noqa: E402
+
+
+def board_types(board):
+    """盤面のブロックタイプのグリッド"""
+    return [[block and block.type for block in line] for line in board.grid]
+
+
+class TestBlockStream(unittest.TestCase):
+    """ブロック乱数ストリームのテスト"""
+
+    def test_same_seed_same_sequence(self):
+        """同じシードなら同じ列、チャンクサイズや取り出し方に依存しないこと"""
+        expected = BlockStream(BLOCK_TYPES, seed=5).take(1000)
+        stream = BlockStream(BLOCK_TYPES, seed=5, chunk_size=7)
+        actual = stream.take(3) + [stream.next() for _ in range(10)] + stream.take(987)
+        self.assertEqual(actual, expected)
+        self.assertNotEqual(BlockStream(BLOCK_TYPES, seed=6).take(1000), expected)
+        self.assertEqual(set(expected), set(BLOCK_TYPES))
+
+    def test_choice_respects_options(self):
+        """choice は指定したタイプだけを返すこと"""
+        stream = BlockStream(BLOCK_TYPES, seed=1)
+        options = list(BLOCK_TYPES[:2])
+        picks = {stream.choice(options) for _ in range(200)}
+        self.assertEqual(picks, set(options))
+
+    def test_board_replay_from_seed(self):
+        """同じシードと同じ操作列なら盤面が一致すること"""
+        boards = [Board(8, seed=99), Board(8, seed=99)]
+        for board in boards:
+            board.initialize_grid()
+            for _ in range(5):
+                moves = sorted(board.legal_moves())
+                if moves:
+                    board.swap_blocks(*moves[0])
+                board.resolve_cascades()
+        self.assertEqual(board_types(boards[0]), board_types(boards[1]))
+        self.assertEqual(boards[0].score, boards[1].score)
+        self.assertEqual(boards[0].seed, 99)
+
+
+if __name__ == "__main__":
+    unittest.main()
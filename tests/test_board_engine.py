@@ -0,0 +1,202 @@
+"""
+ヘッドレス盤面エンジンのテスト
+"""
+
+import random
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from board_engine import BlockType, Board, Tile, calculate_score  # noqa: E402
+
+
+def make_board(rows):
+    """文字列の行リストから盤面を作成（'.' は空セル）"""
+    letters = {"R": BlockType.RED, "B": BlockType.BLUE, "G": BlockType.GREEN}
+    letters.update({"Y": BlockType.YELLOW, "P": BlockType.PURPLE, "O": BlockType.ORANGE})
+    board = Board(len(rows))
+    for row, line in enumerate(rows):
+        for col, ch in enumerate(line):
+            board.grid[row][col] = Tile(letters[ch], col, row) if ch != "." else None
+    return board
+
+
+class TestBoardEngine(unittest.TestCase):
+    """盤面エンジンのテスト"""
+
+    def test_import_without_pygame(self):
+        """pygameを読み込まずにインポートできること"""
+        code = (
+            f"import sys; sys.path.insert(0, {str(src_path)!r}); import board_engine; "
+            "assert 'pygame' not in sys.modules"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr.decode())
+
+    def test_initialize_grid_has_no_matches(self):
+        """初期化直後の盤面にマッチがないこと"""
+        for _ in range(20):
+            board = Board()
+            board.initialize_grid()
+            self.assertEqual(board.find_matches(), set())
+            self.assertTrue(all(cell is not None for line in board.grid for cell in line))
+
+    def test_find_matches(self):
+        """横・縦のマッチ検出"""
+        board = make_board(
+            [
+                "RRRB",
+                "GBYB",
+                "GYOB",
+                "G.PO",
+            ]
+        )
+        expected = {(0, 0), (0, 1), (0, 2), (0, 3), (1, 3), (2, 3)}
+        expected |= {(1, 0), (2, 0), (3, 0)}
+        self.assertEqual(board.find_matches(), expected)
+
+    def test_remove_matches_scores(self):
+        """削除とスコア加算"""
+        board = make_board(["RRRB", "GBYO", "YOGB", "BGOY"])
+        gained = board.remove_matches({(0, 0), (0, 1), (0, 2)})
+        self.assertEqual(gained, 100)
+        self.assertEqual(board.score, 100)
+        self.assertIsNone(board.grid[0][0])
+        self.assertEqual([calculate_score(n) for n in (3, 4, 5, 6)], [100, 200, 500, 600])
+
+    def test_drop_blocks_reports_moves(self):
+        """落下で移動したブロックが報告されること"""
+        board = make_board(["R", ".", "."])
+        moves = board.drop_blocks()
+        block = board.grid[2][0]
+        self.assertEqual(moves, [(block, 0, 2, 0)])
+        self.assertEqual(block.grid_y, 2)
+        self.assertIsNone(board.grid[0][0])
+
+    def test_fill_and_resolve_cascades(self):
+        """連鎖処理でスコアが加算され盤面が埋まること"""
+        board = make_board(["RGB", "RGB", "RBG"])
+        score, depth = board.resolve_cascades()
+        self.assertGreaterEqual(score, 100)
+        self.assertGreaterEqual(depth, 1)
+        self.assertTrue(all(cell is not None for line in board.grid for cell in line))
+
+    def test_swap_blocks(self):
+        """交換でグリッド座標が更新されること"""
+        board = make_board(["RB", "GY"])
+        red = board.grid[0][0]
+        self.assertTrue(board.swap_blocks((0, 0), (0, 1)))
+        self.assertIs(board.grid[0][1], red)
+        self.assertEqual((red.grid_x, red.grid_y), (1, 0))
+
+
+class TestIncrementalMatchDetection(unittest.TestCase):
+    """変更行・列に限定したマッチ検出のテスト"""
+
+    def test_only_dirty_lines_are_scanned(self):
+        """一度走査した後は変更された行・列だけを再走査すること"""
+        board = make_board(["RGBY", "GBYR", "BYRG", "YRGB"])
+        self.assertEqual(board.find_matches_incremental(), set())
+        self.assertEqual((board.dirty_rows, board.dirty_cols), (set(), set()))
+
+        # Board を経由しない変更は検出対象外（全体走査では見つかる）
+        board.grid[3][0] = Tile(BlockType.GREEN, 0, 3)
+        board.grid[3][1] = Tile(BlockType.GREEN, 1, 3)
+        self.assertEqual(board.find_matches_incremental(), set())
+        self.assertEqual(board.find_matches(), {(3, 0), (3, 1), (3, 2)})
+
+        # 交換は行・列を記録する
+        board.swap_blocks((0, 0), (0, 1))
+        self.assertEqual(board.dirty_rows, {0})
+        self.assertEqual(board.dirty_cols, {0, 1})
+        board.mark_dirty(3, 2)
+        self.assertEqual(board.find_matches_incremental(), {(3, 0), (3, 1), (3, 2)})
+
+    def test_lines_with_matches_stay_dirty(self):
+        """マッチが残っている行は削除されるまで記録されたままになること"""
+        board = make_board(["RRRB", "GBYO", "YOGB", "BGOY"])
+        board.find_matches_incremental()
+        self.assertEqual(board.dirty_rows, {0})
+        self.assertEqual(board.find_matches_incremental(), {(0, 0), (0, 1), (0, 2)})
+
+    def test_incremental_equals_full_scan(self):
+        """Board 経由の操作を続けても全体走査と同じ結果になること"""
+        random.seed(42)
+        board = Board(10)
+        board.initialize_grid()
+        for _ in range(300):
+            row, col = random.randrange(10), random.randrange(9)
+            board.swap_blocks((row, col), (row, col + 1))
+            self.assertEqual(board.find_matches_incremental(), board.find_matches())
+            matches = board.find_matches()
+            if matches:
+                board.remove_matches(matches)
+                board.drop_blocks()
+                self.assertEqual(board.find_matches_incremental(), board.find_matches())
+                board.fill_empty_spaces()
+                self.assertEqual(board.find_matches_incremental(), board.find_matches())
+
+
+class TestLegalMoveIndex(unittest.TestCase):
+    """合法手インデックスのテスト"""
+
+    def brute_force_moves(self, board):
+        """総当たり（交換してマッチ判定）で合法手を求める"""
+        moves = set()
+        size = board.size
+        reference = Board(size)
+        reference.grid = [line[:] for line in board.grid]
+        for row in range(size):
+            for col in range(size):
+                for pos2 in ((row, col + 1), (row + 1, col)):
+                    if pos2[0] < size and pos2[1] < size:
+                        cell1, cell2 = reference.grid[row][col], reference.grid[pos2[0]][pos2[1]]
+                        if cell1 and cell2 and cell1.type == cell2.type:
+                            continue
+                        if not (cell1 and cell2):
+                            continue
+                        # グリッドを直接入れ替えて、交換したセルを含むマッチが発生するか調べる
+                        grid = reference.grid
+                        grid[row][col], grid[pos2[0]][pos2[1]] = cell2, cell1
+                        if {(row, col), pos2} & reference.find_matches():
+                            moves.add(((row, col), pos2))
+                        grid[row][col], grid[pos2[0]][pos2[1]] = cell1, cell2
+        return moves
+
+    def test_index_after_initialize(self):
+        """初期化直後のインデックスが総当たりと一致すること"""
+        board = Board()
+        board.initialize_grid()
+        self.assertEqual(set(board.legal_moves()), self.brute_force_moves(board))
+        self.assertEqual(board.has_moves(), bool(board.legal_moves()))
+
+    def test_dead_board(self):
+        """合法手のない盤面を検出できること"""
+        board = make_board(["RGBY", "YRGB", "BYRG", "GBYR"])
+        self.assertFalse(board.has_moves())
+        self.assertEqual(board.legal_moves(), [])
+
+    def test_index_stays_consistent(self):
+        """交換・削除・落下・補充を繰り返してもインデックスが総当たりと一致すること"""
+        random.seed(7)
+        board = Board(9)
+        board.initialize_grid()
+        for _ in range(40):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.swap_blocks(*random.choice(moves))
+            while matches := board.find_matches_incremental():
+                board.remove_matches(matches)
+                board.drop_blocks()
+                board.fill_empty_spaces()
+                self.assertEqual(set(board.legal_moves()), self.brute_force_moves(board))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+盤面プールのテスト
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from board_engine import Board  # noqa: E402
+from board_pool import (  # noqa: E402
+    MAX_GENERATION_ATTEMPTS,
+    BoardPool,
+    RefillPolicy,
+    make_starting_board,
+)
+
+
+def wait_until(condition, timeout=5.0):
+    """条件が満たされるまで待つ（タイムアウトしたら False）"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestBoardPool(unittest.TestCase):
+    """盤面プールのテスト"""
+
+    def assert_starting_board(self, board, size):
+        self.assertEqual(board.size, size)
+        self.assertTrue(all(cell is not None for line in board.grid for cell in line))
+        self.assertEqual(board.find_matches(), set())
+        self.assertTrue(board.has_moves())
+        self.assertEqual(board.score, 0)
+
+    def test_make_starting_board(self):
+        """開始用盤面にマッチがなく合法手があること"""
+        for size in (4, 8, 12):
+            self.assert_starting_board(make_starting_board(size), size)
+
+    def test_make_starting_board_regenerates_when_reshuffle_fails(self):
+        """合法手がなく再配置もできない盤面は生成し直すこと"""
+        with (
+            patch.object(Board, "has_moves", side_effect=[False, True]),
+            patch.object(Board, "reshuffle", return_value=False),
+            patch.object(
+                Board, "initialize_grid", autospec=True, side_effect=Board.initialize_grid
+            ) as initialize_grid,
+        ):
+            board = make_starting_board(6, seed=3)
+        self.assertEqual(initialize_grid.call_count, 2)
+        self.assert_starting_board(board, 6)
+
+    def test_make_starting_board_gives_up(self):
+        """生成し直しても合法手のある盤面にならなければ例外を送出すること"""
+        with (
+            patch.object(Board, "has_moves", return_value=False),
+            patch.object(Board, "reshuffle", return_value=False),
+            patch.object(
+                Board, "initialize_grid", autospec=True, side_effect=Board.initialize_grid
+            ) as initialize_grid,
+            self.assertRaises(RuntimeError),
+        ):
+            make_starting_board(6, seed=3)
+        self.assertEqual(initialize_grid.call_count, MAX_GENERATION_ATTEMPTS)
+
+    def test_on_demand_generates_when_empty(self):
+        """空のプールからはその場で生成し、fill() 後はプールから渡すこと"""
+        pool = BoardPool(6, capacity=2, policy=RefillPolicy.ON_DEMAND, seed=1)
+        pool.start()
+        self.assert_starting_board(pool.take(), 6)
+        self.assertEqual((pool.hits, pool.misses), (0, 1))
+
+        pool.fill()
+        self.assertEqual(len(pool), 2)
+        first, second = pool.take(), pool.take()
+        self.assertIsNot(first, second)
+        self.assertEqual((pool.hits, pool.misses), (2, 1))
+        self.assertEqual(len(pool), 0)
+
+    def test_idle_policy_refills_only_while_idle(self):
+        """IDLE ポリシーではアイドル中だけバックグラウンドで補充すること"""
+        pool = BoardPool(8, capacity=3, policy=RefillPolicy.IDLE, seed=2)
+        pool.start()
+        try:
+            time.sleep(0.05)
+            self.assertEqual(len(pool), 0)
+
+            pool.set_idle(True)
+            self.assertTrue(wait_until(lambda: len(pool) == 3))
+            self.assert_starting_board(pool.take(), 8)
+            self.assertTrue(wait_until(lambda: len(pool) == 3))
+
+            # プレイ中は補充しない
+            pool.set_idle(False)
+            pool.take()
+            time.sleep(0.05)
+            self.assertEqual(len(pool), 2)
+        finally:
+            pool.stop()
+
+    def test_always_policy_refills(self):
+        """ALWAYS ポリシーでは取り出した分をすぐに補充すること"""
+        pool = BoardPool(8, capacity=2, policy=RefillPolicy.ALWAYS, seed=3)
+        pool.start()
+        try:
+            self.assertTrue(wait_until(lambda: len(pool) == 2))
+            pool.take()
+            self.assertTrue(wait_until(lambda: len(pool) == 2))
+            self.assertEqual(pool.misses, 0)
+        finally:
+            pool.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,9 +32,9 @@ class TestCascadeDetection(unittest.TestCase):
 
         # 特定の配置でマッチが発生するように設定
         # 横一列に同じ色のブロックを配置（意図的にマッチを作る）
-        with patch("random.choice") as mock_choice:
+        with patch.object(self.game.board.rng, "take") as mock_take:
             # 最初の3つは赤、残りは他の色
-            mock_choice.side_effect = [
+            sequence = [
                 BlockType.RED,
                 BlockType.RED,
                 BlockType.RED,  # 横マッチ
@@ -44,6 +44,7 @@ class TestCascadeDetection(unittest.TestCase):
                 BlockType.PURPLE,
                 BlockType.ORANGE,
             ] * 10  # 十分な数を用意
+            mock_take.side_effect = lambda count: sequence[:count]
 
             initial_score = self.game.score
 
@@ -205,8 +206,8 @@ class TestCascadeDetection(unittest.TestCase):
             self.game.grid[7][col] = None
 
         # 新しいブロックが同じ色になるように制御
-        with patch("random.choice") as mock_choice:
-            mock_choice.return_value = BlockType.PURPLE
+        with patch.object(self.game.board.rng, "take") as mock_take:
+            mock_take.side_effect = lambda count: [BlockType.PURPLE] * count
 
             initial_score = self.game.score
 
@@ -0,0 +1,50 @@
+"""
+固定タイムステップのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from fixed_timestep import FixedTimestep  # noqa: E402
+
+
+class TestFixedTimestep(unittest.TestCase):
+    """固定タイムステップのテスト"""
+
+    def test_remainder_carries_over(self):
+        """刻み幅に満たない時間は次のフレームに持ち越されること"""
+        timestep = FixedTimestep(step=0.01)
+        self.assertEqual(timestep.advance(0.025), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(0.006), 1)
+        self.assertAlmostEqual(timestep.accumulator, 0.001)
+        self.assertEqual(timestep.steps, 3)
+
+    def test_variable_frames_give_same_total_steps(self):
+        """フレーム間隔がばらついても、合計時間が同じなら同じステップ数になること"""
+        smooth, hitchy = FixedTimestep(step=0.01), FixedTimestep(step=0.01)
+        smooth_steps = sum(smooth.advance(0.0125) for _ in range(8))
+        hitchy_steps = sum(hitchy.advance(dt) for dt in (0.001, 0.002, 0.097))
+        self.assertEqual(smooth_steps, hitchy_steps)
+
+    def test_long_frame_is_clamped(self):
+        """上限を超えたフレーム時間は切り捨てられ、記録されること"""
+        timestep = FixedTimestep(step=0.01, max_frame_time=0.1)
+        self.assertEqual(timestep.advance(1.0), 10)
+        self.assertAlmostEqual(timestep.dropped_seconds, 0.9)
+
+    def test_reset(self):
+        """reset で持ち越した端数が消えること"""
+        timestep = FixedTimestep(step=0.01)
+        timestep.advance(0.005)
+        timestep.reset()
+        self.assertEqual(timestep.alpha, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
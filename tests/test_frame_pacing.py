@@ -0,0 +1,74 @@
+"""
+フレームペーシングのテスト
+"""
+
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from frame_pacing import FramePacer, PaceMode  # noqa: E402
+
+
+class TestFramePacer(unittest.TestCase):
+    """フレームペーシングのテスト"""
+
+    @classmethod
+    def setUpClass(cls):
+        # イベントキューを使うためにダミーのビデオドライバで初期化
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        pygame.event.clear()
+        self.pacer = FramePacer(pygame.time.Clock(), fps=60, timer_fps=20, idle_timeout_ms=1000)
+
+    def test_input_wakes_idle_wait(self):
+        """待機中でも入力があればすぐに戻ること"""
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT, code=1))
+        start = time.perf_counter()
+        _dt, events = self.pacer.next_frame(PaceMode.IDLE)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual([event.type for event in events], [pygame.USEREVENT])
+
+    def test_timer_mode_waits_for_timeout(self):
+        """タイマー状態では入力がなければ低いフレームレートの間隔で戻ること"""
+        self.pacer.next_frame(PaceMode.ACTIVE)
+        dt, events = self.pacer.next_frame(PaceMode.TIMER)
+        self.assertEqual(events, [])
+        self.assertGreaterEqual(dt, 0.045)
+
+    def test_non_adaptive_always_ticks(self):
+        """adaptive=False なら常に通常のフレームレートで進むこと"""
+        pacer = FramePacer(pygame.time.Clock(), adaptive=False)
+        for _ in range(3):
+            pacer.next_frame(PaceMode.IDLE)
+        self.assertEqual(pacer.frames[PaceMode.ACTIVE], 3)
+        self.assertEqual(pacer.frames[PaceMode.IDLE], 0)
+
+    def test_stats_report_idle_savings(self):
+        """待機した時間と推定の CPU 節約量が集計されること"""
+        for mode in (PaceMode.ACTIVE, PaceMode.ACTIVE, PaceMode.TIMER, PaceMode.TIMER):
+            self.pacer.next_frame(mode)
+        self.pacer.next_frame(PaceMode.ACTIVE)
+        stats = self.pacer.stats()
+        self.assertEqual(stats["frames"], {"active": 3, "timer": 2, "idle": 0})
+        self.assertGreater(stats["idle_seconds"], 0.09)
+        self.assertGreater(stats["idle_frames_skipped"], 0)
+        self.assertGreaterEqual(stats["idle_cpu_seconds_saved"], 0.0)
+        self.assertIn("CPU saved", self.pacer.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+フレームプロファイラのテスト
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from frame_profiler import PHASES, FrameProfiler, ProfilerOverlay  # noqa: E402
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """フレームプロファイラのテスト"""
+
+    def record_frame(self, profiler, wait=0.0, work=0.0, particles=0, popups=0):
+        """入力待ちと処理に指定秒数かかる1フレームを記録"""
+        profiler.begin_frame()
+        with profiler.phase("wait"):
+            time.sleep(wait)
+        with profiler.phase("update"), profiler.phase("particles"):
+            time.sleep(work)
+        profiler.end_frame(particles, popups)
+
+    def test_disabled_profiler_records_nothing(self):
+        """無効な間は何も記録せず、同じ何もしないコンテキストを返すこと"""
+        profiler = FrameProfiler()
+        self.assertIs(profiler.phase("update"), profiler.phase("render"))
+        self.record_frame(profiler)
+        self.assertEqual(profiler.frames, 0)
+        self.assertEqual(profiler.percentiles(), {})
+
+    def test_records_phases_in_ring_buffer(self):
+        """フェーズごとの時間をリングバッファに記録し、古いフレームから上書きすること"""
+        profiler = FrameProfiler(capacity=4)
+        profiler.toggle()
+        for i in range(6):
+            self.record_frame(profiler, work=0.001, particles=i, popups=1)
+
+        self.assertEqual(profiler.frames, 6)
+        self.assertEqual(profiler.filled, 4)
+        self.assertEqual(sorted(profiler.particle_counts.tolist()), [2, 3, 4, 5])
+
+        stats = profiler.percentiles()
+        self.assertEqual(set(stats), {*PHASES, "total"})
+        p50, p95, p99 = stats["update"]
+        self.assertGreaterEqual(p50, 1.0)
+        self.assertLessEqual(p50, p95)
+        self.assertLessEqual(p95, p99)
+        self.assertEqual(stats["render"], (0.0, 0.0, 0.0))
+
+    def test_dropped_frames_exclude_wait(self):
+        """入力待ちを除いた処理時間が予算を超えたフレームだけを落ちたフレームとして数えること"""
+        profiler = FrameProfiler(fps=1000)
+        profiler.toggle()
+        self.record_frame(profiler, wait=0.005)
+        self.record_frame(profiler, work=0.005)
+        self.assertEqual(profiler.dropped, 1)
+
+    def test_toggle_resets_records(self):
+        """有効にし直すと記録が消えること"""
+        profiler = FrameProfiler()
+        profiler.toggle()
+        self.record_frame(profiler)
+        self.assertFalse(profiler.toggle())
+        self.assertTrue(profiler.toggle())
+        self.assertEqual(profiler.frames, 0)
+
+    def test_report_lines(self):
+        """パーセンタイル・パーティクル数・ポップアップ数・落ちたフレーム数を表示すること"""
+        profiler = FrameProfiler()
+        profiler.toggle()
+        self.record_frame(profiler, particles=12, popups=3)
+        lines = profiler.report_lines()
+        self.assertIn("p99", lines[1])
+        self.assertTrue(any(line.strip().startswith("particles") for line in lines))
+        self.assertIn("Particles: 12  Popups: 3", lines)
+        self.assertTrue(lines[-1].startswith("Dropped: "))
+
+
+class TestProfilerOverlay(unittest.TestCase):
+    """プロファイラのオーバーレイのテスト"""
+
+    def setUp(self):
+        pygame.font.init()
+        self.now = 0.0
+        self.profiler = FrameProfiler()
+        self.profiler.toggle()
+        self.overlay = ProfilerOverlay(
+            self.profiler, pygame.font.Font(None, 16), position=(5, 5), clock=lambda: self.now
+        )
+        self.screen = pygame.Surface((400, 300))
+
+    def test_draw_returns_panel_rect(self):
+        """パネルを描画して描画した領域を返すこと"""
+        rect = self.overlay.draw(self.screen)
+        self.assertEqual(rect.topleft, (5, 5))
+        self.assertEqual(rect.size, self.overlay.panel.get_size())
+
+    def test_panel_refreshes_at_interval(self):
+        """パネルの内容は更新間隔ごとに作り直されること"""
+        self.overlay.draw(self.screen)
+        panel = self.overlay.panel
+        self.overlay.draw(self.screen)
+        self.assertIs(self.overlay.panel, panel)
+
+        self.now += 1.0
+        self.overlay.draw(self.screen)
+        self.assertIsNot(self.overlay.panel, panel)
+        self.assertGreaterEqual(self.overlay.panel.get_width(), panel.get_width())
+
+
+if __name__ == "__main__":
+    unittest.main()
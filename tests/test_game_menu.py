@@ -0,0 +1,116 @@
+"""
+ゲームメニューのテスト
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from game_menu import COLORS, GameMenu, MenuState  # noqa: E402
+from highscore_manager import HighScoreManager  # noqa: E402
+
+
+class TestRetainedMenu(unittest.TestCase):
+    """描画済みメニュー画面のテスト"""
+
+    def setUp(self):
+        pygame.font.init()
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")  # noqa: SIM115
+        self.temp_file.close()
+        self.manager = HighScoreManager(self.temp_file.name)
+        self.screen = pygame.Surface((800, 600))
+        self.menu = GameMenu(self.screen, self.manager)
+
+    def tearDown(self):
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+
+    def move_mouse(self, pos):
+        """マウス移動イベントを送る"""
+        self.menu.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pos))
+
+    def full_redraw(self):
+        """同じ状態で全体を描き直した画面のバイト列"""
+        screen = pygame.Surface(self.screen.get_size())
+        self.menu.screen = screen
+        self.menu.draw()
+        self.menu.screen = self.screen
+        return pygame.image.tobytes(screen, "RGB")
+
+    def test_screen_is_composed_once(self):
+        """状態・データが変わらなければ画面を作り直さず、変化もないこと"""
+        self.assertEqual(self.menu.draw(), [self.screen.get_rect()])
+        self.assertEqual(self.menu.draw(full=False), [])
+        self.assertEqual(self.menu.compositions, 1)
+
+    def test_highscore_or_state_change_recomposes(self):
+        """ハイスコアの追加や画面の切り替えで作り直されること"""
+        self.menu.draw()
+        self.manager.add_score(60, 1200)
+        self.assertEqual(self.menu.draw(full=False), [self.screen.get_rect()])
+        self.menu.state = MenuState.HIGHSCORE
+        self.menu.draw(full=False)
+        self.assertEqual(self.menu.compositions, 3)
+
+    def test_only_hovered_button_is_redrawn(self):
+        """マウスが乗ったボタンだけが描き直され、離れると元に戻ること"""
+        self.menu.draw()
+        before = pygame.image.tobytes(self.screen, "RGB")
+        start = self.menu.buttons["start"]
+
+        self.move_mouse(start.center)
+        self.assertEqual(self.menu.draw(full=False), [start])
+        inside = (start.left + 5, start.top + 5)
+        self.assertNotEqual(self.screen.get_at(inside)[:3], COLORS["DARK_GREEN"])
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_redraw())
+
+        self.menu.handle_event(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=start.center, button=1))
+        self.assertEqual(self.menu.draw(full=False), [])
+
+        self.move_mouse((5, 5))
+        self.assertEqual(self.menu.draw(full=False), [start])
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), before)
+
+    def test_state_change_from_game_resets_mouse(self):
+        """ゲームから戻ったとき、ゲーム開始時のクリック位置のボタンを押下表示しないこと"""
+        self.menu.state = MenuState.TIME_SELECT
+        time_button = self.menu.buttons["time_60"]
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=time_button.center, button=1)
+        self.assertEqual(self.menu.handle_event(event), "start_game")
+        self.assertTrue(self.menu.buttons["start"].collidepoint(time_button.center))
+
+        # ボタンを離すイベントはゲーム側で処理される
+        self.menu.set_state(MenuState.PLAYING)
+        self.menu.set_state(MenuState.MAIN_MENU)
+        self.menu.draw()
+        self.assertIsNone(self.menu._drawn_button)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_redraw())
+
+        # ゲーム中のクリック位置にゲームオーバー画面のボタンがあっても押下表示しない
+        self.menu.set_state(MenuState.PLAYING)
+        play_again = self.menu.buttons["play_again"]
+        self.menu.handle_event(
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=play_again.center, button=1)
+        )
+        self.menu.set_game_over(300, 60)
+        self.menu.draw()
+        self.assertIsNone(self.menu._drawn_button)
+
+    def test_clicks_still_change_state(self):
+        """クリックで画面が切り替わること"""
+        start = self.menu.buttons["start"]
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=start.center, button=1)
+        self.assertEqual(self.menu.handle_event(event), "time_select")
+        self.assertEqual(self.menu.state, MenuState.TIME_SELECT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+HUD ウィジェットのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from hud import HudLayer  # noqa: E402
+
+
+class TestHudLayer(unittest.TestCase):
+    """保持型 HUD のテスト"""
+
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 24)
+        self.hud = HudLayer()
+        self.hud.add("score", "Score: {}", (10, 20))
+        self.hud.add("time", "Time: {:02d}:{:02d}", (10, 60))
+
+    def test_same_value_skips_rerender(self):
+        """表示値が同じなら同じサーフェスを返し、省略回数が増えること"""
+        first = self.hud.render("score", self.font, (255, 255, 255), 100)
+        second = self.hud.render("score", self.font, (255, 255, 255), 100)
+        self.assertIs(first, second)
+        self.assertEqual((self.hud.renders, self.hud.skipped), (1, 1))
+
+    def test_value_or_color_change_rerenders(self):
+        """表示値・色が変わると再描画されること"""
+        white = self.hud.render("time", self.font, (255, 255, 255), 1, 5)
+        red = self.hud.render("time", self.font, (255, 0, 0), 1, 5)
+        later = self.hud.render("time", self.font, (255, 0, 0), 1, 4)
+        self.assertIsNot(white, red)
+        self.assertIsNot(red, later)
+        self.assertEqual((self.hud.renders, self.hud.skipped), (3, 0))
+
+    def test_draw_blits_at_position(self):
+        """登録した位置に描画されること"""
+        screen = pygame.Surface((200, 100))
+        surface = self.hud.draw(screen, "score", self.font, (255, 255, 255), 7)
+        drawn = pygame.Rect((10, 20), surface.get_size())
+        pixels = [
+            screen.get_at((x, y))[:3]
+            for x in range(drawn.left, drawn.right)
+            for y in range(drawn.top, drawn.bottom)
+        ]
+        self.assertIn((255, 255, 255), pixels)
+        self.assertEqual(tuple(screen.get_at((0, 0)))[:3], (0, 0, 0))
+
+    def test_invalidate_forces_rerender(self):
+        """invalidate 後は同じ値でも再描画されること"""
+        self.hud.render("score", self.font, (255, 255, 255), 1)
+        self.hud.invalidate()
+        self.hud.render("score", self.font, (255, 255, 255), 1)
+        self.assertEqual(self.hud.renders, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,318 @@
+"""
+ログ設定のテスト
+"""
+
+import gzip
+import logging
+import queue
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from logging_config import (  # noqa: E402
+    BatchFileHandler,
+    BatchingQueueListener,
+    BoundedQueueHandler,
+    OverflowPolicy,
+    RateLimitedLogger,
+    RotatingCompressedFileHandler,
+    get_logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def make_record(message, level=logging.INFO):
+    """テスト用のログレコードを作成"""
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+class RecordingHandler(logging.Handler):
+    """受け取ったメッセージと処理したスレッド名を記録するハンドラー"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+class TestQueueLogging(unittest.TestCase):
+    """キュー方式のログのテスト"""
+
+    def setUp(self):
+        # 他のテストが設定したルートロガーの状態を退避
+        self.root = logging.getLogger()
+        self.saved_handlers = self.root.handlers[:]
+        self.saved_level = self.root.level
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "game.log"
+
+    def tearDown(self):
+        shutdown_logging()
+        for handler in self.root.handlers[:]:
+            self.root.removeHandler(handler)
+        for handler in self.saved_handlers:
+            self.root.addHandler(handler)
+        self.root.setLevel(self.saved_level)
+        self.temp_dir.cleanup()
+
+    def test_setup_logging_writes_through_listener(self):
+        """ルートロガーにはキューハンドラーだけが付き、停止時にすべて書き込まれること"""
+        setup_logging(log_to_console=False, log_file=self.log_file)
+        self.assertEqual([type(h) for h in self.root.handlers], [BoundedQueueHandler])
+
+        logger = logging.getLogger("QueueTest")
+        for i in range(100):
+            logger.info("message %d", i)
+        shutdown_logging()
+
+        lines = self.log_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[-1].endswith("QueueTest - INFO - message 99"))
+
+    def test_synchronous_mode(self):
+        """use_queue=False でも切り替え付きのハンドラーでレコードごとに書き込むこと"""
+        setup_logging(log_to_console=False, use_queue=False, log_file=self.log_file, max_bytes=1000)
+        self.assertEqual([type(h) for h in self.root.handlers], [RotatingCompressedFileHandler])
+        self.assertEqual(get_logging_stats(), {})
+
+        handler = self.root.handlers[0]
+        logger = logging.getLogger("SyncTest")
+        logger.info("first")
+        self.assertGreater(self.log_file.stat().st_size, 0)
+        for i in range(50):
+            logger.info("message %d %s", i, "x" * 40)
+        self.assertGreater(handler.rollovers, 0)
+
+        shutdown_logging()
+        self.assertEqual(self.root.handlers, [])
+        self.assertTrue(all(path.suffix == ".gz" for path in handler.compressor.archives()))
+
+    def test_handlers_run_on_listener_thread(self):
+        """書き込みはリスナースレッドで行われること"""
+        log_queue = queue.Queue()
+        recorder = RecordingHandler()
+        listener = BatchingQueueListener(log_queue, [recorder], flush_interval=0.05)
+        listener.start()
+        handler = BoundedQueueHandler(log_queue)
+        for i in range(10):
+            handler.handle(make_record(f"record {i}"))
+        listener.stop()
+
+        self.assertEqual(recorder.messages, [f"record {i}" for i in range(10)])
+        self.assertEqual(recorder.threads, {"LogListener"})
+        self.assertGreaterEqual(listener.batches, 1)
+
+    def test_overflow_policies(self):
+        """キューが一杯のときに新しい・古いレコードを捨てること"""
+        for policy, expected in (
+            (OverflowPolicy.DROP_NEW, ["a", "b"]),
+            (OverflowPolicy.DROP_OLDEST, ["b", "c"]),
+        ):
+            log_queue = queue.Queue(maxsize=2)
+            handler = BoundedQueueHandler(log_queue, policy)
+            for message in ("a", "b", "c"):
+                handler.handle(make_record(message))
+            self.assertEqual(handler.dropped, 1)
+            self.assertEqual([log_queue.get_nowait().msg for _ in range(2)], expected)
+
+    def test_dropped_records_are_reported(self):
+        """捨てたレコード数が警告として書き込まれること"""
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue)
+        for message in ("kept", "lost", "lost"):
+            handler.handle(make_record(message))
+        recorder = RecordingHandler()
+        listener = BatchingQueueListener(log_queue, [recorder], queue_handler=handler)
+        listener.start()
+        listener.stop()
+        self.assertEqual(recorder.messages, ["kept", "Log queue full: dropped 2 records"])
+
+    def test_file_is_flushed_in_batches(self):
+        """ファイルへの反映はレコードごとではなく flush_batch でまとめて行うこと"""
+        handler = BatchFileHandler(self.log_file, encoding="utf-8")
+        handler.handle(make_record("buffered"))
+        self.assertEqual(self.log_file.stat().st_size, 0)
+        handler.flush_batch()
+        self.assertGreater(self.log_file.stat().st_size, 0)
+        handler.close()
+
+
+class TestRotatingLogFiles(unittest.TestCase):
+    """ログファイルの切り替えと圧縮のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "game.log"
+        self.now = 1_700_000_000.0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_handler(self, **kwargs):
+        kwargs.setdefault("max_age", 0)
+        handler = RotatingCompressedFileHandler(self.log_file, clock=lambda: self.now, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def read_all_lines(self, handler):
+        """切り替え済みファイル（古い順）と現在のファイルの行をつなげて返す"""
+        lines = []
+        for archive in handler.compressor.archives():
+            opener = gzip.open if archive.suffix == ".gz" else open
+            with opener(archive, "rt", encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        lines.extend(self.log_file.read_text(encoding="utf-8").splitlines())
+        return lines
+
+    def test_rolls_over_by_size_and_compresses(self):
+        """サイズを超えたら切り替え、切り替えたファイルが gzip 圧縮されること"""
+        handler = self.make_handler(max_bytes=1000, retention_bytes=0)
+        messages = [f"record {i:04d} " + "x" * 40 for i in range(100)]
+        for i, message in enumerate(messages):
+            self.now += 1  # 切り替え済みファイル名を区別する
+            handler.handle(make_record(message))
+            if i % 10 == 0:
+                handler.flush_batch()
+        handler.close()
+
+        archives = handler.compressor.archives()
+        self.assertGreaterEqual(handler.rollovers, 4)
+        self.assertEqual(len(archives), handler.rollovers)
+        self.assertTrue(all(path.suffix == ".gz" for path in archives))
+        self.assertEqual(self.read_all_lines(handler), messages)
+
+    def test_size_is_counted_in_bytes(self):
+        """マルチバイト文字のレコードでもファイルのバイト数で切り替えること"""
+        handler = self.make_handler(max_bytes=1000, retention_bytes=0, compress=False)
+        # 1レコード 41 文字・121 バイトなので、9 レコード（1089 バイト）で上限を超える
+        for _ in range(10):
+            handler.handle(make_record("ログ" * 20))
+        handler.close()
+        self.assertEqual(handler.rollovers, 1)
+        self.assertEqual(handler.compressor.archives()[0].stat().st_size, 9 * 121)
+        self.assertEqual(self.log_file.stat().st_size, 121)
+
+    def test_rolls_over_by_age(self):
+        """開いてから max_age 秒経ったら切り替えること"""
+        handler = self.make_handler(max_bytes=0, max_age=60)
+        handler.handle(make_record("first"))
+        self.now += 30
+        handler.handle(make_record("second"))
+        self.assertEqual(handler.rollovers, 0)
+        self.now += 31
+        handler.handle(make_record("third"))
+        self.assertEqual(handler.rollovers, 1)
+        handler.close()
+        self.assertEqual(self.read_all_lines(handler), ["first", "second", "third"])
+
+    def test_retention_budget(self):
+        """合計サイズが上限を超えたら古い切り替え済みファイルから削除されること"""
+        handler = self.make_handler(max_bytes=2000, retention_bytes=6000, compress=False)
+        for i in range(500):
+            self.now += 1
+            handler.handle(make_record(f"record {i:04d} " + "x" * 40))
+        handler.close()
+
+        archives = handler.compressor.archives()
+        self.assertGreater(handler.compressor.deleted, 0)
+        self.assertLessEqual(sum(path.stat().st_size for path in archives), 6000)
+        # 最新の記録は残っている
+        self.assertTrue(self.read_all_lines(handler)[-1].endswith("record 0499 " + "x" * 40))
+
+    def test_leftover_rotated_files_are_compressed(self):
+        """前回の実行で圧縮されずに残ったファイルを起動時に圧縮すること"""
+        leftover = Path(f"{self.log_file}.20240101-000000")
+        leftover.write_text("old record\n", encoding="utf-8")
+        handler = self.make_handler()
+        handler.close()
+        self.assertFalse(leftover.exists())
+        with gzip.open(f"{leftover}.gz", "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old record\n")
+
+
+class LazyValue:
+    """書式化された回数を数える引数"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+class TestRateLimitedLogger(unittest.TestCase):
+    """件数制限付きロガーのテスト"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.recorder = RecordingHandler()
+        self.logger = logging.getLogger("RateLimitTest")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.recorder)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.recorder)
+
+    def make_limited(self, **kwargs):
+        return RateLimitedLogger(self.logger, clock=lambda: self.now, **kwargs)
+
+    def test_limits_each_message_per_second(self):
+        """メッセージごとに1秒あたりの件数が制限され、抑制件数が次の出力に付くこと"""
+        limited = self.make_limited(per_second=2)
+        for frame in range(60):
+            self.now = frame / 60
+            limited.info("Drawing frame %d", frame)
+            limited.info("Updating %d popups", 1)
+
+        self.assertEqual(len(self.recorder.messages), 4)
+        self.assertEqual(limited.suppressed, 116)
+
+        self.now = 1.0
+        limited.info("Drawing frame %d", 60)
+        self.assertEqual(
+            self.recorder.messages[-1], "Drawing frame 60 (58 similar records suppressed)"
+        )
+
+    def test_sampling(self):
+        """sample_every 回に1回だけ出力候補になること"""
+        limited = self.make_limited(per_second=100, sample_every=10)
+        for i in range(30):
+            limited.info("Popup %d", i)
+        self.assertEqual(self.recorder.messages[0], "Popup 0")
+        self.assertEqual(self.recorder.messages[1], "Popup 10 (9 similar records suppressed)")
+        self.assertEqual(len(self.recorder.messages), 3)
+
+    def test_arguments_are_formatted_lazily(self):
+        """抑制されたレコードや無効なレベルでは引数を書式化しないこと"""
+        limited = self.make_limited(per_second=1)
+        value = LazyValue()
+        for _ in range(100):
+            limited.info("Value: %s", value)
+            limited.debug("Debug value: %s", value)
+        self.assertEqual(value.formatted, 1)
+
+    def test_flush_writes_pending_summaries(self):
+        """flush で未出力の抑制件数が書き出されること"""
+        limited = self.make_limited(per_second=1)
+        for _ in range(5):
+            limited.info("Drawing UI")
+        limited.flush()
+        self.assertEqual(self.recorder.messages, ["Drawing UI", "Suppressed 4 records: Drawing UI"])
+        limited.flush()
+        self.assertEqual(len(self.recorder.messages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
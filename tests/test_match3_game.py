@@ -1,14 +1,42 @@
+import json
 import os
 import sys
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
+import pygame
+
 # テスト対象のモジュールをインポートするためのパス設定
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "amazon_q_match3"))
 
 # pygameの初期化をモック化してテスト環境で実行可能にする
 with patch("pygame.init"), patch("pygame.display.set_mode"), patch("pygame.font.Font"):
-    from match3_game import Block, BlockType, Match3Game
+    from frame_pacing import PaceMode
+    from highscore_manager import HighScoreManager
+    from match3_game import (
+        CELL_SIZE,
+        GRID_OFFSET_X,
+        GRID_OFFSET_Y,
+        AnimationType,
+        Block,
+        BlockType,
+        Match3Game,
+        MenuState,
+        ScorePopup,
+    )
+    from particle_system import FRICTION, GRAVITY
+
+
+def play_move(game, move, settle=5.0):
+    """マウス操作と同じ経路で合法手を入力し、settle 秒進めて盤面を落ち着かせる"""
+    for row, col in move:
+        x = GRID_OFFSET_X + col * CELL_SIZE + CELL_SIZE // 2
+        y = GRID_OFFSET_Y + row * CELL_SIZE + CELL_SIZE // 2
+        game.handle_click((x, y))
+    game.simulate(settle)
 
 
 class TestBlock(unittest.TestCase):
@@ -245,6 +273,22 @@ class TestMatch3Game(unittest.TestCase):
         self.assertEqual(self.game.grid[2][2].grid_x, 2)
         self.assertEqual(self.game.grid[2][2].grid_y, 2)
 
+    def test_periodic_check_finds_untracked_matches(self):
+        """Board を経由せずに変更されたマッチも定期チェックで見つかること"""
+        self.game.initialize_grid()
+        self.assertEqual(self.game.find_matches(), set())
+
+        # 変更記録を通さずにセルを書き換える
+        for col in range(3):
+            self.game.grid[0][col] = Block(BlockType.RED, col, 0)
+        self.assertEqual(self.game.find_matches(), set())
+
+        with patch.object(self.game, "remove_matches", wraps=self.game.remove_matches) as remove:
+            self.game._periodic_match_check(2.0)
+        remove.assert_called_once()
+        self.assertLessEqual({(0, 0), (0, 1), (0, 2)}, remove.call_args.args[0])
+        self.assertGreater(self.game.score, 0)
+
 
 class TestGameIntegration(unittest.TestCase):
     """統合テスト"""
@@ -286,6 +330,314 @@ class TestGameIntegration(unittest.TestCase):
                 self.assertIsNotNone(self.game.grid[row][col])
 
 
+class TestBackgroundLayer(unittest.TestCase):
+    """背景キャッシュのテスト"""
+
+    def setUp(self):
+        with (
+            patch("pygame.display.set_mode"),
+            patch("pygame.font.Font"),
+            patch("pygame.display.set_caption"),
+            patch("pygame.init"),
+        ):
+            self.game = Match3Game()
+        self.game.screen = pygame.Surface((800, 600))
+
+    def test_background_is_cached(self):
+        """背景は一度だけ描画され、グリッドの枠を含むこと"""
+        background = self.game.get_background()
+        self.assertIs(self.game.get_background(), background)
+        self.assertEqual(tuple(background.get_at((50, 50)))[:3], (128, 128, 128))
+        self.assertEqual(tuple(background.get_at((10, 10)))[:3], (0, 0, 0))
+
+        self.game.screen.fill((255, 0, 0))
+        self.game.draw_background()
+        self.assertEqual(tuple(self.game.screen.get_at((10, 10)))[:3], (0, 0, 0))
+
+    def test_background_rebuilt_on_layout_change(self):
+        """レイアウト定数が変わると作り直すこと"""
+        background = self.game.get_background()
+        with patch("match3_game.CELL_SIZE", 40):
+            rebuilt = self.game.get_background()
+        self.assertIsNot(rebuilt, background)
+        self.assertEqual(tuple(rebuilt.get_at((50 + 40, 50 + 10)))[:3], (128, 128, 128))
+
+
+class TestDirtyRectRendering(unittest.TestCase):
+    """差分描画のテスト"""
+
+    def setUp(self):
+        pygame.font.init()
+        with (
+            patch("pygame.display.set_mode"),
+            patch("pygame.font.Font"),
+            patch("pygame.display.set_caption"),
+            patch("pygame.init"),
+        ):
+            self.game = Match3Game()
+        self.game.screen = pygame.Surface((800, 600))
+        self.game.font = pygame.font.Font(None, 32)
+        self.game.small_font = pygame.font.Font(None, 18)
+        self.game.menu.state = MenuState.PLAYING
+
+    def render(self):
+        """差分描画で1フレーム描画し、更新した矩形を返す"""
+        with (
+            patch("pygame.display.update") as update,
+            patch("pygame.display.flip") as flip,
+        ):
+            self.game.render_frame()
+        return update, flip
+
+    def assert_matches_full_redraw(self):
+        """差分描画の結果が全体の再描画と一致すること"""
+        dirty_screen = self.game.screen
+        self.game.screen = pygame.Surface(dirty_screen.get_size())
+        self.game._draw_game()
+        expected = pygame.image.tobytes(self.game.screen, "RGB")
+        self.game.screen = dirty_screen
+        self.assertEqual(pygame.image.tobytes(dirty_screen, "RGB"), expected)
+
+    def test_hud_rerenders_only_changed_text(self):
+        """HUD は表示値が変わったテキストだけを再描画すること"""
+        hud = self.game.hud
+        self.game.draw_ui()
+        renders, skipped = hud.renders, hud.skipped
+        self.game.draw_ui()
+        self.assertEqual(hud.renders, renders)
+        self.assertGreater(hud.skipped, skipped)
+
+        self.game.board.score += 100
+        self.game.draw_ui()
+        self.assertEqual(hud.renders, renders + 1)
+
+    def test_idle_frame_updates_nothing(self):
+        """変化がなければ画面を更新しないこと"""
+        update, flip = self.render()
+        flip.assert_called_once()
+        update, flip = self.render()
+        update.assert_not_called()
+        flip.assert_not_called()
+        self.assertEqual(self.game.last_dirty_rects, [])
+
+    def test_only_changed_regions_are_redrawn(self):
+        """変化した要素の範囲だけを更新し、結果は全体描画と一致すること"""
+        self.render()
+
+        # ブロックの移動と選択
+        block = self.game.grid[3][3]
+        block.draw_y += 10
+        self.game.selected_block = (0, 0)
+        update, _flip = self.render()
+        update.assert_called_once()
+        area = sum(rect.width * rect.height for rect in self.game.last_dirty_rects)
+        self.assertLess(area, 800 * 600 // 4)
+        self.assert_matches_full_redraw()
+
+        # パーティクル・ポップアップの追加と消去、スコアの変化
+        self.game.create_particles(2, 2, block.get_colors(), count=5)
+        self.game.score_popups.append(ScorePopup(200, 200, 300))
+        self.game.score += 300
+        self.render()
+        self.assert_matches_full_redraw()
+
+        self.game.particles.clear()
+        self.game.score_popups.clear()
+        self.render()
+        self.assert_matches_full_redraw()
+
+    def test_profiler_overlay_is_updated_with_dirty_rects(self):
+        """オーバーレイ表示中はその領域も更新し、消したあとは全体を描画し直すこと"""
+        self.render()
+        self.assertTrue(self.game.toggle_profiler())
+        update, _flip = self.render()
+        update.assert_called_once()
+        self.assertEqual(len(self.game.last_dirty_rects), 1)
+
+        self.assertFalse(self.game.toggle_profiler())
+        update, flip = self.render()
+        flip.assert_called_once()
+        self.assert_matches_full_redraw()
+
+
+class TestPaceMode(unittest.TestCase):
+    """フレームの進め方の判定テスト"""
+
+    def setUp(self):
+        with (
+            patch("pygame.display.set_mode"),
+            patch("pygame.font.Font"),
+            patch("pygame.display.set_caption"),
+            patch("pygame.init"),
+        ):
+            self.game = Match3Game()
+
+    def test_menu_is_idle(self):
+        """メニュー表示中は入力を待つこと"""
+        self.game.menu.state = MenuState.MAIN_MENU
+        self.assertEqual(self.game.pace_mode(), PaceMode.IDLE)
+
+    def test_settled_board_only_runs_timer(self):
+        """落ち着いた盤面ではタイマーだけを進め、エフェクトがあれば通常に戻ること"""
+        self.game.menu.state = MenuState.PLAYING
+        self.assertEqual(self.game.pace_mode(), PaceMode.TIMER)
+
+        self.game.create_particles(2, 2, [(255, 0, 0)], count=3)
+        self.assertEqual(self.game.pace_mode(), PaceMode.ACTIVE)
+        self.game.particles.clear()
+
+        # 選択枠は静止しているので、選択中でも描き直す必要はない
+        self.game.selected_block = (0, 0)
+        self.assertEqual(self.game.pace_mode(), PaceMode.TIMER)
+
+    def test_returns_to_timer_after_match(self):
+        """実際にマッチさせた後も、盤面が落ち着けばタイマーだけを進める状態に戻ること"""
+        self.game.reset_game(60, seed=4)
+        self.game.menu.state = MenuState.PLAYING
+        play_move(self.game, self.game.legal_moves()[0], settle=0)
+        self.assertEqual(self.game.pace_mode(), PaceMode.ACTIVE)
+
+        self.game.simulate(5.0)
+        self.assertGreater(self.game.score, 0)
+        self.assertEqual(self.game.pace_mode(), PaceMode.TIMER)
+
+
+class TestFixedTimestepSimulation(unittest.TestCase):
+    """固定タイムステップでのシミュレーションのテスト"""
+
+    def setUp(self):
+        # 本来の highscores.json に触れないように、一時ファイルに記録する
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.scores_file = Path(self.temp_dir.name) / "highscores.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_game(self, seed, time_limit=60):
+        with (
+            patch("pygame.display.set_mode"),
+            patch("pygame.font.Font"),
+            patch("pygame.display.set_caption"),
+            patch("pygame.init"),
+        ):
+            game = Match3Game(highscore_manager=HighScoreManager(self.scores_file))
+        game.reset_game(time_limit, seed=seed)
+        return game
+
+    def test_simulation_does_not_record_highscore(self):
+        """時間切れまで進めても、record_highscore を指定しなければスコアを記録しないこと"""
+        game = self.make_game(seed=2, time_limit=5)
+        steps = game.simulate(10.0, autoplay=True, seed=2)
+        self.assertTrue(game.game_over)
+        self.assertLess(steps, round(10.0 / game.timestep.step))
+        self.assertEqual(game.menu.state, MenuState.GAME_OVER)
+        self.assertFalse(game.menu.is_new_highscore)
+        self.assertFalse(self.scores_file.exists())
+        self.assertTrue(game.record_highscore)
+
+        game.reset_game(5, seed=2)
+        game.simulate(10.0, autoplay=True, seed=2, record_highscore=True)
+        self.assertTrue(game.menu.is_new_highscore)
+        self.assertEqual(game.highscore_manager.get_best_score(5), game.score)
+        self.assertTrue(self.scores_file.exists())
+
+    def test_deadlock_is_resolved_after_match(self):
+        """マッチの後に合法手がなくなっても、盤面が落ち着いたら再配置されること"""
+        game = self.make_game(seed=3)
+        score = game.score
+        play_move(game, game.legal_moves()[0])
+        self.assertGreater(game.score, score)
+        self.assertFalse(game.is_waiting_for_drop)
+
+        # 斜めに色をずらして合法手のない盤面にし、ブロックが動いている最中の状態にする
+        for row, line in enumerate(game.grid):
+            for col, block in enumerate(line):
+                block.type = list(BlockType)[(col - row) % 4]
+                block.start_animation(AnimationType.SWAP, col, row)
+        game.board.mark_all_dirty()
+        self.assertFalse(game.board.has_moves())
+
+        game.simulate(1.0)
+        self.assertTrue(game.board.has_moves())
+        self.assertFalse(game.find_matches())
+
+    def test_block_position_is_interpolated(self):
+        """ステップ間の描画位置が直前と現在の位置の補間になること"""
+        block = Block(BlockType.RED, 0, 0)
+        block.start_animation(AnimationType.FALL, 0, 2)
+        block.save_position()
+        block.update_animation(0.05)
+        start_y, current_y = block.prev_y, block.draw_y
+        self.assertEqual(block.render_position(0.0)[1], start_y)
+        self.assertEqual(block.render_position(1.0)[1], current_y)
+        self.assertAlmostEqual(block.render_position(0.5)[1], (start_y + current_y) / 2)
+
+    def test_particles_advance_once_per_step(self):
+        """1ステップでパーティクルが1回だけ進み、直前の位置がステップ前の位置になること"""
+        game = self.make_game(seed=1)
+        game.menu.state = MenuState.PLAYING
+        game.create_particles(3, 3, [(255, 0, 0)], count=5)
+        particles = game.particles
+        n = particles.count
+        x, y = particles.x[:n].copy(), particles.y[:n].copy()
+        vx, vy = particles.vx[:n].copy(), particles.vy[:n].copy()
+
+        step = game.timestep.step
+        game.step_simulation(step)
+        np.testing.assert_array_equal(particles.prev_x[:n], x)
+        np.testing.assert_array_equal(particles.prev_y[:n], y)
+        np.testing.assert_allclose(particles.x[:n], x + vx * FRICTION * step)
+        np.testing.assert_allclose(particles.y[:n], y + (vy + GRAVITY * step) * step)
+
+    def test_simulate_advances_timer_at_fixed_rate(self):
+        """描画なしで、指定した時間だけタイマーが進むこと"""
+        game = self.make_game(seed=1)
+        steps = game.simulate(2.0)
+        self.assertEqual(steps, round(2.0 / game.timestep.step))
+        self.assertAlmostEqual(game.time_left, 58.0, places=6)
+
+    def test_autoplay_is_deterministic(self):
+        """同じシードなら自動プレイの結果が同じになること"""
+        first, second = self.make_game(seed=2), self.make_game(seed=2)
+        first.simulate(10.0, autoplay=True, seed=5)
+        second.simulate(10.0, autoplay=True, seed=5)
+        self.assertGreater(first.score, 0)
+        self.assertEqual(first.score, second.score)
+        self.assertEqual(
+            [[block.type for block in line] for line in first.grid],
+            [[block.type for block in line] for line in second.grid],
+        )
+
+    def test_trace_records_cascade_spans(self):
+        """トレース中は連鎖処理の区間が入れ子で記録され、結果は変わらないこと"""
+        traced_game, plain_game = self.make_game(seed=2), self.make_game(seed=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = traced_game.start_trace(Path(temp_dir) / "trace.json")
+            traced_game.simulate(10.0, autoplay=True, seed=5)
+            self.assertEqual(traced_game.stop_trace(), path)
+            events = json.loads(path.read_text(encoding="utf-8"))
+        plain_game.simulate(10.0, autoplay=True, seed=5)
+        self.assertEqual(traced_game.score, plain_game.score)
+
+        spans = [event for event in events if event["ph"] == "X"]
+        names = {span["name"] for span in spans}
+        for name in ("find_matches", "remove_matches", "drop_blocks", "fill_empty_spaces"):
+            self.assertIn(name, names)
+
+        # パーティクルの生成はマッチの削除の中で記録される
+        removals = [span for span in spans if span["name"] == "remove_matches"]
+        particles = [span for span in spans if span["name"] == "create_particles"]
+        self.assertTrue(particles)
+        for span in particles:
+            self.assertTrue(
+                any(
+                    removal["ts"] <= span["ts"]
+                    and span["ts"] + span["dur"] <= removal["ts"] + removal["dur"]
+                    for removal in removals
+                )
+            )
+
+
 if __name__ == "__main__":
     # テスト実行時にpygameの初期化エラーを回避
     with patch("pygame.mixer.pre_init"), patch("pygame.mixer.quit"), patch("pygame.quit"):
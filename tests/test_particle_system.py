@@ -0,0 +1,88 @@
+"""
+パーティクルシステムのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from particle_system import ParticleSystem  # noqa: E402
+
+
+class TestParticleSystem(unittest.TestCase):
+    """配列で管理するパーティクルのテスト"""
+
+    def test_emit_respects_capacity(self):
+        """上限を超えた分は生成されず、数が記録されること"""
+        particles = ParticleSystem(capacity=10, seed=1)
+        self.assertEqual(particles.emit(100, 100, (255, 0, 0), 6), 6)
+        self.assertEqual(particles.emit(100, 100, (255, 0, 0), 6), 4)
+        self.assertEqual(particles.emit(100, 100, (255, 0, 0), 3), 0)
+        self.assertEqual(len(particles), 10)
+        self.assertEqual(particles.dropped, 5)
+
+    def test_update_moves_and_expires(self):
+        """更新で移動し、寿命が尽きたものは削除されること"""
+        particles = ParticleSystem(seed=2)
+        particles.emit(100, 100, (0, 255, 0), 5)
+        particles.update(0.1)
+        self.assertEqual(len(particles), 5)
+        self.assertFalse(np.all(particles.x[:5] == 100))
+        particles.update(2.0)
+        self.assertEqual(len(particles), 0)
+
+    def test_compaction_keeps_survivors(self):
+        """消滅したパーティクルを詰め直しても生存分の値が保たれること"""
+        particles = ParticleSystem(seed=3)
+        particles.emit(0, 0, (255, 0, 0), 4)
+        particles.emit(50, 50, (0, 0, 255), 4)
+        # 先に作った4個だけ寿命を尽きさせる
+        particles.life[:4] = 0.01
+        particles.life[4:8] = 1.5
+        survivors = particles.rotation_speed[4:8].copy()
+        particles.update(0.05)
+        self.assertEqual(len(particles), 4)
+        np.testing.assert_array_equal(particles.rotation_speed[:4], survivors)
+        np.testing.assert_array_equal(particles.color[:4], [[0, 0, 255]] * 4)
+
+    def test_seed_is_deterministic(self):
+        """同じシードなら同じ軌跡になること"""
+        first, second = ParticleSystem(seed=4), ParticleSystem(seed=4)
+        for particles in (first, second):
+            particles.emit(10, 20, (255, 255, 0), 8)
+            particles.update(0.3)
+        np.testing.assert_array_equal(first.x[:8], second.x[:8])
+        np.testing.assert_array_equal(first.y[:8], second.y[:8])
+
+    def test_draw_stays_within_bounds(self):
+        """描画した画素が bounds() の矩形に収まること"""
+        particles = ParticleSystem(seed=5)
+        particles.emit(100, 100, (255, 255, 255), 20)
+        particles.update(0.2)
+        screen = pygame.Surface((200, 200), pygame.SRCALPHA)
+        particles.draw(screen)
+        bounds = particles.bounds()
+        drawn = screen.get_bounding_rect()
+        self.assertTrue(drawn.width > 0)
+        self.assertTrue(bounds.contains(drawn))
+
+    def test_clear(self):
+        """clear で全パーティクルが削除され、版番号が進むこと"""
+        particles = ParticleSystem(seed=6)
+        particles.emit(0, 0, (255, 0, 0), 3)
+        version = particles.version
+        particles.clear()
+        self.assertEqual(len(particles), 0)
+        self.assertIsNone(particles.bounds())
+        self.assertGreater(particles.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+盤面再配置のテスト
+"""
+
+import random
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from board_engine import BLOCK_TYPES, Board, Tile  # noqa: E402
+from reshuffle import plan_reshuffle  # noqa: E402
+
+
+def dead_board(size):
+    """斜めに色をずらした合法手のない盤面を作成"""
+    board = Board(size)
+    board.initialize_grid()
+    types = [block.type for line in board.grid for block in line]
+    palette = sorted(set(types), key=lambda block_type: block_type.value)[:4]
+    for row, line in enumerate(board.grid):
+        for col, block in enumerate(line):
+            block.type = palette[(col - row) % 4]
+    board.mark_all_dirty()
+    board.rebuild_move_index()
+    return board
+
+
+class TestReshuffle(unittest.TestCase):
+    """再配置のテスト"""
+
+    def test_plan_preserves_colors_and_has_move(self):
+        """色の個数を保ち、マッチがなく合法手がある配置になること"""
+        for size in (4, 8, 16):
+            for seed in range(30):
+                rng = random.Random(seed)
+                codes = [rng.randrange(6) for _ in range(size * size)]
+                plan = plan_reshuffle(codes, size, rng)
+                self.assertIsNotNone(plan)
+                self.assertEqual(Counter(plan), Counter(codes))
+
+                board = Board(size)
+                board.grid = [[None] * size for _ in range(size)]
+                for index, code in enumerate(plan):
+                    row, col = divmod(index, size)
+                    board.grid[row][col] = Tile(BLOCK_TYPES[code], col, row)
+                board.rebuild_move_index()
+                self.assertEqual(board.find_matches(), set())
+                self.assertTrue(board.has_moves())
+
+    def test_plan_is_reproducible(self):
+        """同じシードの乱数生成器からは同じ配置になること"""
+        codes = [block.type.value for line in dead_board(32).grid for block in line]
+        first = plan_reshuffle(codes, 32, random.Random(7))
+        self.assertEqual(plan_reshuffle(codes, 32, random.Random(7)), first)
+        self.assertNotEqual(plan_reshuffle(codes, 32, random.Random(8)), first)
+
+    def test_impossible_multiset(self):
+        """条件を満たせない色の組み合わせでは None を返すこと"""
+        self.assertIsNone(plan_reshuffle([0] * 16, 4))
+        self.assertIsNone(plan_reshuffle([0, 1, 2, 3, 4, 5, 0, 1, 2], 3))
+
+    def test_board_reshuffle_dead_board(self):
+        """合法手のない盤面を既存ブロックのまま並べ替えられること"""
+        for size in (8, 64):
+            board = dead_board(size)
+            self.assertFalse(board.has_moves())
+            blocks = {id(block) for line in board.grid for block in line}
+
+            self.assertTrue(board.reshuffle(random.Random(1)))
+            self.assertTrue(board.has_moves())
+            self.assertEqual(board.find_matches(), set())
+            self.assertEqual({id(block) for line in board.grid for block in line}, blocks)
+            for row, line in enumerate(board.grid):
+                for col, block in enumerate(line):
+                    self.assertEqual((block.grid_x, block.grid_y), (col, row))
+
+    def test_board_with_empty_cells_is_not_reshuffled(self):
+        """空セルがある盤面は再配置しないこと"""
+        board = dead_board(4)
+        board.grid[0][0] = None
+        self.assertFalse(board.reshuffle())
+
+
+if __name__ == "__main__":
+    unittest.main()
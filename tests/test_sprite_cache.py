@@ -0,0 +1,104 @@
+"""
+ブロックスプライトキャッシュのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from board_engine import BlockType  # noqa: E402
+from sprite_cache import BRIGHTNESS_LEVELS, BlockSpriteCache, StarAtlas, quantize_alpha  # noqa: E402
+
+PALETTE = {
+    BlockType.RED: [(255, 100, 100), (200, 50, 50)],
+    BlockType.BLUE: [(100, 150, 255), (50, 100, 200)],
+}
+
+
+class TestBlockSpriteCache(unittest.TestCase):
+    """スプライトキャッシュのテスト"""
+
+    def setUp(self):
+        self.cache = BlockSpriteCache(PALETTE)
+
+    def test_quantize_alpha(self):
+        """透明度が段階に丸められ、両端は保たれること"""
+        self.assertEqual(quantize_alpha(0), 0)
+        self.assertEqual(quantize_alpha(255), 255)
+        self.assertEqual(quantize_alpha(300), 255)
+        self.assertEqual(quantize_alpha(250), quantize_alpha(253))
+
+    def test_same_key_reuses_sprite(self):
+        """同じタイプ・近い透明度では同じスプライトを再利用すること"""
+        sprite = self.cache.get(BlockType.RED, 255, 60)
+        self.assertIs(self.cache.get(BlockType.RED, 254, 60), sprite)
+        self.assertIsNot(self.cache.get(BlockType.BLUE, 255, 60), sprite)
+        self.assertIsNot(self.cache.get(BlockType.RED, 100, 60), sprite)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_sprite_contents(self):
+        """不透明スプライトの中心はハイライト色で、角は透明であること"""
+        sprite = self.cache.get(BlockType.RED, 255, 60)
+        radius = BlockSpriteCache.radius_for(60)
+        self.assertEqual(sprite.get_size(), (radius * 2, radius * 2))
+        self.assertEqual(tuple(sprite.get_at((radius, radius))), (255, 150, 150, 255))
+        self.assertEqual(sprite.get_at((0, 0)).a, 0)
+
+        faded = self.cache.get(BlockType.RED, 128, 60)
+        self.assertLess(faded.get_at((radius, radius)).a, 255)
+
+    def test_cell_size_change_invalidates(self):
+        """セルサイズが変わるとキャッシュを作り直すこと"""
+        small = self.cache.get(BlockType.RED, 255, 60)
+        self.cache.get(BlockType.BLUE, 255, 60)
+        self.assertEqual(len(self.cache), 2)
+
+        large = self.cache.get(BlockType.RED, 255, 80)
+        self.assertEqual(len(self.cache), 1)
+        self.assertGreater(large.get_width(), small.get_width())
+
+    def test_draw_centers_sprite(self):
+        """指定した中心に描画されること"""
+        screen = pygame.Surface((100, 100))
+        self.cache.draw(screen, BlockType.BLUE, 255, 60, (50, 50))
+        self.assertEqual(tuple(screen.get_at((50, 50)))[:3], (150, 200, 255))
+        self.assertEqual(tuple(screen.get_at((0, 0)))[:3], (0, 0, 0))
+
+
+class TestStarAtlas(unittest.TestCase):
+    """星形アトラスのテスト"""
+
+    def setUp(self):
+        self.atlas = StarAtlas()
+
+    def test_angle_step_wraps_by_symmetry(self):
+        """90度ごとに同じ回転段階になり、負の角度も扱えること"""
+        self.assertEqual(self.atlas.angle_step(0), 0)
+        self.assertEqual(self.atlas.angle_step(90), 0)
+        self.assertEqual(self.atlas.angle_step(-90), 0)
+        self.assertEqual(self.atlas.angle_step(45), self.atlas.angle_steps // 2)
+
+    def test_frames_are_tinted_and_reused(self):
+        """フレームが色・明るさで着色され、同じ組み合わせでは再利用されること"""
+        full = self.atlas.frames((200, 100, 40), BRIGHTNESS_LEVELS - 1)
+        self.assertIs(self.atlas.frames([200, 100, 40], BRIGHTNESS_LEVELS - 1), full)
+        self.assertEqual(len(full), self.atlas.max_size + 1)
+        self.assertEqual(len(full[0]), self.atlas.angle_steps)
+
+        frame = full[8][0]
+        self.assertEqual(frame.get_size(), (17, 17))
+        self.assertEqual(tuple(frame.get_at((8, 8))), (200, 100, 40, 255))
+        self.assertEqual(frame.get_at((0, 0)).a, 0)
+
+        dark = self.atlas.frames((200, 100, 40), 0)[8][0]
+        self.assertEqual(tuple(dark.get_at((8, 8)))[:3], (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
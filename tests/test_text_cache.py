@@ -0,0 +1,84 @@
+"""
+テキスト描画キャッシュのテスト
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import pygame
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from sprite_cache import ALPHA_LEVELS, quantize_alpha  # noqa: E402
+from text_cache import TextCache  # noqa: E402
+
+
+class TestTextCache(unittest.TestCase):
+    """テキスト描画キャッシュのテスト"""
+
+    def setUp(self):
+        pygame.font.init()
+        self.cache = TextCache()
+        self.font = self.cache.get_font(None, 24)
+
+    def test_get_font_reuses_font(self):
+        """同じ名前・サイズのフォントは一度だけ作成すること"""
+        self.assertIs(self.cache.get_font(None, 24), self.font)
+        self.assertIsNot(self.cache.get_font(None, 36), self.font)
+
+    def test_render_is_cached(self):
+        """同じフォント・テキスト・色では同じサーフェスを返すこと"""
+        surface = self.cache.render(self.font, "Score: 100", (255, 255, 255))
+        self.assertIs(self.cache.render(self.font, "Score: 100", [255, 255, 255]), surface)
+        self.assertIsNot(self.cache.render(self.font, "Score: 100", (255, 0, 0)), surface)
+        self.assertIsNot(self.cache.render(self.font, "Score: 200", (255, 255, 255)), surface)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_alpha_is_applied_without_rerender(self):
+        """透明度は共有のサーフェスを変えずに、再描画なしでコピーに設定すること"""
+        opaque = self.cache.render(self.font, "+300", (255, 255, 0))
+        faded = self.cache.render(self.font, "+300", (255, 255, 0), alpha=102)
+        self.assertIsNot(faded, opaque)
+        self.assertEqual(faded.get_alpha(), quantize_alpha(102))
+        self.assertEqual(faded.get_size(), opaque.get_size())
+
+        # 共有のサーフェスを保持している側からは不透明のまま見える
+        self.assertEqual(opaque.get_alpha(), 255)
+        self.assertIs(self.cache.render(self.font, "+300", (255, 255, 0)), opaque)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_faded_variants_are_cached_per_level(self):
+        """同じ段階に丸められる透明度では、フェード用のコピーを使い回すこと"""
+        first = self.cache.render(self.font, "+300", (255, 255, 0), alpha=100)
+        self.assertIs(self.cache.render(self.font, "+300", (255, 255, 0), alpha=101), first)
+        self.assertIsNot(self.cache.render(self.font, "+300", (255, 255, 0), alpha=30), first)
+
+        # フェードアウトの間に作るコピーは段階の数まで
+        for alpha in range(255, -1, -1):
+            self.cache.render(self.font, "+300", (255, 255, 0), alpha=alpha)
+        self.assertEqual(self.cache.fades, ALPHA_LEVELS - 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_lru_eviction_under_memory_cap(self):
+        """上限を超えたら最も長く使われていないものから破棄すること"""
+        size = TextCache._size_of(self.cache.render(self.font, "0000", (255, 255, 255)))
+        cache = TextCache(max_bytes=size * 3)
+        for text in ("1111", "2222", "3333"):
+            cache.render(self.font, text, (255, 255, 255))
+        cache.render(self.font, "1111", (255, 255, 255))  # 最近使ったものにする
+        cache.render(self.font, "4444", (255, 255, 255))
+
+        self.assertLessEqual(cache.bytes_used, cache.max_bytes)
+        self.assertEqual(cache.evictions, 1)
+        misses = cache.misses
+        cache.render(self.font, "1111", (255, 255, 255))
+        self.assertEqual(cache.misses, misses)
+        cache.render(self.font, "2222", (255, 255, 255))
+        self.assertEqual(cache.misses, misses + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+トレースイベント出力のテスト
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# プロジェクトのsrcディレクトリをパスに追加
+src_path = Path(__file__).parent.parent / "src" / "amazon_q_match3"
+sys.path.insert(0, str(src_path))
+
+from trace_events import Tracer, traced  # noqa: E402
+
+
+class Worker:
+    """traced デコレータのテスト用クラス"""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    @traced()
+    def outer(self):
+        return self.inner() + 1
+
+    @traced("inner_step")
+    def inner(self):
+        return 1
+
+
+class TestTracer(unittest.TestCase):
+    """トレースイベント出力のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "traces" / "trace.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load_spans(self):
+        """トレースファイルから完了イベントを読み込む"""
+        events = json.loads(self.path.read_text(encoding="utf-8"))
+        return [event for event in events if event["ph"] == "X"]
+
+    def test_disabled_tracer_records_nothing(self):
+        """記録していない間は何もしない共有のコンテキストを返すこと"""
+        tracer = Tracer()
+        self.assertIs(tracer.span("a"), tracer.span("b"))
+        self.assertEqual(Worker(tracer).outer(), 2)
+        self.assertIsNone(tracer.stop())
+        self.assertEqual(tracer.events, 0)
+
+    def test_writes_nested_spans_as_trace_events(self):
+        """入れ子の区間が時刻と長さ付きの完了イベントとして書き出されること"""
+        tracer = Tracer()
+        tracer.start(self.path)
+        with tracer.span("frame", frame=1):
+            self.assertEqual(Worker(tracer).outer(), 2)
+        self.assertEqual(tracer.stop(), self.path)
+
+        spans = {event["name"]: event for event in self.load_spans()}
+        self.assertEqual(set(spans), {"frame", "outer", "inner_step"})
+        self.assertEqual(spans["frame"]["args"], {"frame": 1})
+
+        # 子の区間は親の区間に含まれる
+        for parent, child in (("frame", "outer"), ("outer", "inner_step")):
+            outer, inner = spans[parent], spans[child]
+            self.assertLessEqual(outer["ts"], inner["ts"])
+            self.assertLessEqual(inner["ts"] + inner["dur"], outer["ts"] + outer["dur"])
+            self.assertEqual(outer["tid"], inner["tid"])
+
+    def test_spans_are_flushed_in_batches(self):
+        """区間は一定件数ごとにまとめて書き込みスレッドに渡されること"""
+        tracer = Tracer(flush_events=10)
+        tracer.start(self.path)
+        for i in range(25):
+            with tracer.span("step", index=i):
+                pass
+        self.assertEqual(tracer.batches, 2)
+        tracer.stop()
+
+        self.assertEqual(tracer.batches, 3)
+        spans = self.load_spans()
+        self.assertEqual([span["args"]["index"] for span in spans], list(range(25)))
+
+    def test_restart_writes_new_file(self):
+        """停止後に別のファイルへ記録し直せること"""
+        tracer = Tracer()
+        tracer.start(self.path)
+        with tracer.span("first"):
+            pass
+        tracer.stop()
+
+        self.path = self.path.with_name("second.json")
+        tracer.start(self.path)
+        with tracer.span("second"):
+            pass
+        tracer.stop()
+        self.assertEqual([span["name"] for span in self.load_spans()], ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()